@@ -0,0 +1,104 @@
+"""Measures how decoded frames/s scale with the number of sensors when each sensor is decoded in its own worker process.
+
+Every simulated sensor replays a pre-built TI byte stream as fast as its worker can consume it, so the numbers are an upper bound
+on decode throughput rather than a model of a real serial link. The in-process column decodes the same streams sequentially in
+this interpreter, which is what :obj:`IWR6843AOP.start_sensor` does by default.
+
+Usage:
+    python benchmarks/multiprocess_scaling.py --max-sensors 8 --points 200 --seconds 3
+"""
+from argparse import ArgumentParser
+from multiprocessing.connection import wait
+from time import perf_counter
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from pymmWave.framing import FrameSynchronizer, detected_points, parse_header
+from pymmWave.multiprocess import DecodeWorker
+from pymmWave.simulator import FrameGenerator
+
+
+class LoopingSource(object):
+    """Replays a byte stream forever in fixed size reads.
+    """
+    def __init__(self, stream: bytes, chunk: int=4096):
+        self.stream = stream
+        self.chunk = chunk
+        self._pos = 0
+
+    def open(self) -> None:
+        self._pos = 0
+
+    def read(self) -> bytes:
+        data = self.stream[self._pos:self._pos + self.chunk]
+        self._pos += self.chunk
+        if self._pos >= len(self.stream):
+            self._pos = 0
+        return data
+
+    def close(self) -> None:
+        pass
+
+
+def in_process(stream: bytes, sensors: int, seconds: float) -> float:
+    syncs = [FrameSynchronizer() for _ in range(sensors)]
+    sources = [LoopingSource(stream) for _ in range(sensors)]
+    frames = 0
+    end = perf_counter() + seconds
+    start = perf_counter()
+    while perf_counter() < end:
+        for sync, src in zip(syncs, sources):
+            sync.feed(src.read())
+            for frame in sync.frames():
+                header = parse_header(frame)
+                points = detected_points(frame, header)
+                points[np.abs(points[:, 3]) > 0].astype(np.float32)
+                frames += 1
+    return frames / (perf_counter() - start)
+
+
+def multi_process(stream: bytes, sensors: int, seconds: float, max_points: int) -> tuple[float, int]:
+    workers = [DecodeWorker(LoopingSource(stream), max_points=max_points) for _ in range(sensors)]
+    for w in workers:
+        w.start()
+    frames = 0
+    dropped = 0
+    try:
+        # Let the workers get going before measuring
+        for w in workers:
+            w.poll(5)
+            w.drain()
+        end = perf_counter() + seconds
+        start = perf_counter()
+        while perf_counter() < end:
+            for w in wait(workers, timeout=0.1):  # type: ignore
+                frames += len(w.drain())  # type: ignore
+        elapsed = perf_counter() - start
+        dropped = sum(w.dropped for w in workers)
+    finally:
+        for w in workers:
+            w.stop()
+    return frames / elapsed, dropped
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--max-sensors', type=int, default=min(8, os.cpu_count() or 1))
+    parser.add_argument('--points', type=int, default=200)
+    parser.add_argument('--seconds', type=float, default=3.0)
+    args = parser.parse_args()
+
+    stream = FrameGenerator(args.points).frames(64)
+    print(f"{'sensors':>8} {'in-process fps':>15} {'multi-process fps':>18} {'ring drops':>11}")
+    for n in range(1, args.max_sensors + 1):
+        single = in_process(stream, n, args.seconds)
+        multi, dropped = multi_process(stream, n, args.seconds, max(args.points, 1))
+        print(f"{n:>8} {single:>15.0f} {multi:>18.0f} {dropped:>11}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,322 @@
+"""Benchmark suite for the parser, the data model and the algorithms, with JSON results and baseline comparison.
+
+Every case is timed with the best of several repeats, after an automatically sized number of loops. Frames are synthetic,
+from :obj:`pymmWave.simulator.FrameGenerator`, unless a capture recorded with `IWR6843AOP.start_recording` is given.
+
+Usage:
+    python benchmarks/suite.py --output results.json
+    python benchmarks/suite.py --output new.json --baseline results.json --threshold 0.15
+    python benchmarks/suite.py --filter decode --capture session.bin
+
+The exit status is 1 if any case is slower than the baseline by more than the threshold, or failed while it passed in the baseline.
+"""
+from argparse import ArgumentParser
+from asyncio import get_running_loop, run
+from datetime import datetime, timezone
+from statistics import median
+from tempfile import TemporaryDirectory
+from time import monotonic_ns, perf_counter
+from typing import Any, Callable, Iterator, NamedTuple, Optional
+import json
+import os
+import platform
+import subprocess
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from scipy.spatial.transform import Rotation
+
+from pymmWave.IWR6843AOP import IWR6843AOP
+from pymmWave.algos import CloudEstimatedIMU, EstimatedRelativePosition, IMUAdjustedPersistedData, SimpleMeanDistance
+from pymmWave.capture import CaptureWriter
+from pymmWave.data_model import DopplerPointCloud, ImuVelocityData, PointCloudBatch
+from pymmWave.delivery import DeliveryPolicy
+from pymmWave.replay import ReplaySensor
+from pymmWave.simulator import FrameGenerator
+from pymmWave.transform import RigidTransform
+
+POINT_COUNTS = (10, 100, 1000, 10000)
+SENSOR_COUNTS = (1, 4)
+# Frames per decode run, and bytes handed to the decoder per read, roughly a serial read at 921600 baud
+DECODE_FRAMES = 64
+READ_SIZE = 4096
+
+
+class Case(NamedTuple):
+    """A single benchmark. `setup` builds the state and returns the function to time, plus the number of frames and points it processes per call.
+    """
+    name: str
+    params: dict[str, Any]
+    setup: Callable[[], tuple[Callable[[], Any], int, int]]
+
+
+def _cloud(points: int, seed: int=0) -> DopplerPointCloud:
+    return DopplerPointCloud(FrameGenerator(seed=seed).points_for(points))
+
+
+def _reads(stream: bytes) -> list[bytes]:
+    return [stream[i:i + READ_SIZE] for i in range(0, len(stream), READ_SIZE)]
+
+
+def _decode_case(stream: bytes, frames: int, points: int, sensors: int) -> Callable[[], tuple[Callable[[], Any], int, int]]:
+    def setup() -> tuple[Callable[[], Any], int, int]:
+        chunks = _reads(stream)
+        devices = [IWR6843AOP(f"bench{i}") for i in range(sensors)]
+
+        def body() -> None:
+            # Reads from several sensors are interleaved, as on a shared event loop
+            for chunk in chunks:
+                for dev in devices:
+                    dev._decode(chunk, monotonic_ns())
+        return body, frames * sensors, points * sensors
+    return setup
+
+
+def _replay_case(stream: bytes, frames: int, points: int, workdir: str) -> Callable[[], tuple[Callable[[], Any], int, int]]:
+    def setup() -> tuple[Callable[[], Any], int, int]:
+        path = os.path.join(workdir, f"replay-{points}.bin")
+        with CaptureWriter(path) as capture:
+            for chunk in _reads(stream):
+                capture.write(chunk, 0)
+
+        async def drain() -> None:
+            sensor = ReplaySensor(path, speed=None)
+            sensor.configure_delivery(DeliveryPolicy.BLOCKING, 256)
+            task = get_running_loop().create_task(sensor.start_sensor())
+            received = 0
+            while received < frames:
+                received += len(await sensor.get_batch(frames - received))
+            await task
+            sensor.stop_sensor()
+
+        # Includes starting an event loop per run, which is small next to DECODE_FRAMES frames
+        return (lambda: run(drain())), frames, points
+    return setup
+
+
+def _translate_rotate_case(points: int) -> Callable[[], tuple[Callable[[], Any], int, int]]:
+    def setup() -> tuple[Callable[[], Any], int, int]:
+        cloud = _cloud(points)
+        rot = Rotation.from_euler('zyx', [0.01, 0.02, 0.03])
+        return (lambda: cloud.translate_rotate((0.1, 0.2, 0.3), rot)), 1, points
+    return setup
+
+
+def _transform_case(points: int) -> Callable[[], tuple[Callable[[], Any], int, int]]:
+    def setup() -> tuple[Callable[[], Any], int, int]:
+        cloud = _cloud(points)
+        transform = RigidTransform(Rotation.from_euler('zyx', [0.01, 0.02, 0.03]), (0.1, 0.2, 0.3))
+        return (lambda: cloud.transform(transform)), 1, points
+    return setup
+
+
+def _append_case(points: int) -> Callable[[], tuple[Callable[[], Any], int, int]]:
+    def setup() -> tuple[Callable[[], Any], int, int]:
+        base = _cloud(points).get()
+        other = _cloud(points, seed=1)
+
+        def body() -> None:
+            DopplerPointCloud(base.copy()).append(other)
+        return body, 1, points
+    return setup
+
+
+def _batch_append_case(points: int, frames: int) -> Callable[[], tuple[Callable[[], Any], int, int]]:
+    def setup() -> tuple[Callable[[], Any], int, int]:
+        clouds = [_cloud(points, seed=i) for i in range(frames)]
+
+        def body() -> None:
+            batch = PointCloudBatch.from_clouds([])
+            for cloud in clouds:
+                batch.append(cloud)
+        return body, frames, points * frames
+    return setup
+
+
+def _per_sensor_case(points: int, sensors: int, make: Callable[[], Callable[[DopplerPointCloud], Any]]) -> Callable[[], tuple[Callable[[], Any], int, int]]:
+    def setup() -> tuple[Callable[[], Any], int, int]:
+        clouds = [_cloud(points, seed=i) for i in range(sensors)]
+        fn = make()
+
+        def body() -> None:
+            for cloud in clouds:
+                fn(cloud)
+        return body, sensors, points * sensors
+    return setup
+
+
+def _imu_adjusted_case(points: int, steps: int) -> Callable[[], tuple[Callable[[], Any], int, int]]:
+    def setup() -> tuple[Callable[[], Any], int, int]:
+        algo = IMUAdjustedPersistedData(steps)
+        cloud = _cloud(points)
+        imu = ImuVelocityData((0.1, 0.0, 0.0), (0.0, 0.01, 0.0))
+        # Fill the persisted history first, so the timed calls do the steady state work
+        for _ in range(steps + 1):
+            algo.run(DopplerPointCloud(cloud.get().copy()), imu)
+        return (lambda: algo.run(DopplerPointCloud(cloud.get().copy()), imu)), 1, points * (steps + 1)
+    return setup
+
+
+def _relative_position_case() -> Callable[[], tuple[Callable[[], Any], int, int]]:
+    def setup() -> tuple[Callable[[], Any], int, int]:
+        algo = EstimatedRelativePosition()
+        imu = ImuVelocityData((0.1, 0.0, 0.0), (0.0, 0.01, 0.0))
+        return (lambda: algo.run(imu)), 1, 0
+    return setup
+
+
+def cases(capture: Optional[str], workdir: str) -> Iterator[Case]:
+    if capture is not None:
+        with open(capture, 'rb') as f:
+            recorded = f.read()
+        for sensors in SENSOR_COUNTS:
+            yield Case('decode', {'source': os.path.basename(capture), 'sensors': sensors}, _decode_case(recorded, len(IWR6843AOP('probe')._decode(recorded, 0)), 0, sensors))
+
+    for points in POINT_COUNTS:
+        stream = FrameGenerator(points, extra_tlvs=(6,)).frames(DECODE_FRAMES)
+        for sensors in SENSOR_COUNTS:
+            yield Case('decode', {'points': points, 'sensors': sensors}, _decode_case(stream, DECODE_FRAMES, points, sensors))
+        yield Case('replay', {'points': points}, _replay_case(stream, DECODE_FRAMES, points, workdir))
+
+    for points in POINT_COUNTS:
+        yield Case('DopplerPointCloud.translate_rotate', {'points': points}, _translate_rotate_case(points))
+        yield Case('DopplerPointCloud.transform', {'points': points}, _transform_case(points))
+        yield Case('DopplerPointCloud.append', {'points': points}, _append_case(points))
+        yield Case('PointCloudBatch.append', {'points': points, 'frames': 32}, _batch_append_case(points, 32))
+
+    for points in POINT_COUNTS:
+        for sensors in SENSOR_COUNTS:
+            yield Case('SimpleMeanDistance', {'points': points, 'sensors': sensors}, _per_sensor_case(points, sensors, lambda: SimpleMeanDistance().run))
+            yield Case('CloudEstimatedIMU', {'points': points, 'sensors': sensors}, _per_sensor_case(points, sensors, lambda: CloudEstimatedIMU().run))
+        yield Case('IMUAdjustedPersistedData', {'points': points, 'steps': 5}, _imu_adjusted_case(points, 5))
+    yield Case('EstimatedRelativePosition', {}, _relative_position_case())
+
+
+def key(name: str, params: dict[str, Any]) -> str:
+    return name + ''.join(f" {k}={v}" for k, v in sorted(params.items()))
+
+
+def measure(fn: Callable[[], Any], repeat: int, min_time: float) -> list[float]:
+    """Seconds per call, one sample per repeat. Each sample is averaged over enough calls to take at least `min_time`.
+    """
+    loops = 1
+    while True:
+        start = perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops = max(loops * 2, int(loops * min_time / max(elapsed, 1e-9)))
+
+    samples = [elapsed / loops]
+    for _ in range(repeat - 1):
+        start = perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append((perf_counter() - start) / loops)
+    return samples
+
+
+def run_case(case: Case, repeat: int, min_time: float) -> dict[str, Any]:
+    result: dict[str, Any] = {'name': case.name, 'params': case.params}
+    try:
+        fn, frames, points = case.setup()
+        samples = measure(fn, repeat, min_time)
+    except Exception as e:
+        result.update(status='error', error=f"{type(e).__name__}: {e}")
+        return result
+
+    best = min(samples)
+    result.update(status='ok', best_s=best, median_s=median(samples), samples=len(samples))
+    if frames:
+        result['frames_per_s'] = frames / best
+    if points:
+        result['us_per_point'] = best * 1e6 / points
+    return result
+
+
+def environment() -> dict[str, Any]:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'time': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def compare(results: dict[str, dict[str, Any]], baseline: dict[str, dict[str, Any]], threshold: float) -> bool:
+    """Prints the change of every case against the baseline.
+
+    Returns:
+        bool: True if nothing regressed beyond `threshold`.
+    """
+    ok = True
+    print(f"\n{'case':<60}{'baseline':>12}{'current':>12}{'change':>9}")
+    for k, res in results.items():
+        base = baseline.get(k)
+        if base is None:
+            continue
+        if res['status'] != 'ok' or base['status'] != 'ok':
+            if res['status'] != 'ok' and base['status'] == 'ok':
+                ok = False
+                print(f"{k:<60}{'ok':>12}{'error':>12}{'FAIL':>9}")
+            continue
+        change = res['best_s'] / base['best_s'] - 1
+        flag = ''
+        if change > threshold:
+            ok = False
+            flag = ' SLOWER'
+        print(f"{k:<60}{base['best_s'] * 1e6:>10.1f}us{res['best_s'] * 1e6:>10.1f}us{change:>+9.1%}{flag}")
+    return ok
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output', help="Write results to this JSON file.")
+    parser.add_argument('--baseline', help="Compare against results previously written with --output.")
+    parser.add_argument('--threshold', type=float, default=0.10, help="Allowed slowdown against the baseline, as a fraction. Defaults to 0.10.")
+    parser.add_argument('--filter', default='', help="Only run cases whose name contains this string.")
+    parser.add_argument('--capture', help="Also benchmark decoding of this recorded capture.")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.05, help="Seconds each sample runs for at least.")
+    args = parser.parse_args()
+
+    results: dict[str, dict[str, Any]] = {}
+    with TemporaryDirectory() as workdir:
+        for case in cases(args.capture, workdir):
+            if args.filter not in case.name:
+                continue
+            res = run_case(case, args.repeat, args.min_time)
+            k = key(case.name, case.params)
+            results[k] = res
+            if res['status'] == 'ok':
+                extra = ''.join([f"{res['frames_per_s']:>14.0f} fps" if 'frames_per_s' in res else '',
+                                 f"{res['us_per_point']:>10.4f} us/pt" if 'us_per_point' in res else ''])
+                print(f"{k:<60}{res['best_s'] * 1e6:>12.1f} us{extra}")
+            else:
+                print(f"{k:<60}  {res['error']}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'environment': environment(), 'results': results}, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        if not compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,17 +1,28 @@
 from dataclasses import dataclass
-from typing import Any, Optional
-from struct import unpack
+from typing import Any, Callable, Optional, Sequence, Union
+from struct import error as StructError
 
 from serial import Serial # type: ignore
-from asyncio import Queue, sleep
-from time import time
+from asyncio import AbstractEventLoop, Future, Protocol, gather, get_running_loop, wait_for, Event as AsyncEvent, Queue as AsyncQueue, TimeoutError as AsyncTimeoutError
+from collections import deque
+from functools import partial
+from threading import Event, Thread
+from time import monotonic, monotonic_ns, perf_counter_ns
 
 import numpy as np
 from serial.serialutil import SerialException
 
-from .data_model import DopplerPointCloud
+from .data_model import DopplerPointCloud, FrameMetadata, PointCloudBatch
 from .sensor import Sensor
-from .constants import TLV_type, BYTE_MULT, ASYNC_SLEEP, MAGIC_NUMBER
+from .constants import CLI_COMMAND_TIME, CLI_PROMPT, CLI_SLOW_COMMAND_TIME, CLI_VALID_REPLIES, TLV_type
+from .framing import DETECTED_POINT_DTYPE, FrameSynchronizer, parse_header, iter_tlvs
+from .transport import SerialReadTransport
+from .multiprocess import DecodeWorker, SerialByteSource
+from .delivery import DeliveryPolicy, FrameRing, Subscription
+from .instrumentation import InstrumentationSnapshot, PipelineInstrumentation, Stage
+from .stats import FrameNumberTracker, PipelineStatistics, SensorStatistics, transfer_time_ns
+from .capture import CaptureWriter
+from .pool import ArrayPool
 
 class IWR6843AOP(Sensor):
     """Abstract :obj:`Sensor<mmWave.sensor.Sensor>` class implementation for interfacing with the COTS TI IWR6843AOP evaluation board.
@@ -30,19 +41,38 @@ class IWR6843AOP(Sensor):
         self._ser_data: Optional[Serial] = None
         self._verbose = verbose
         self._doppler_filtering = 0
+        # Data type of decoded point clouds, the device sends float32
+        self._dtype: np.dtype = np.dtype(np.float32)
         self._config_sent = False
         self.name = name
         self._config_port_name: Optional[str] = None
         self._data_port_name: Optional[str] = None
         self._config_baud: Optional[int] = None
         self._data_baud: Optional[int] = None
-
-        # Why a queue? This is forward looking. asyncio defaults to single threaded behavior and therefore this should
-        #   be thread safe by default. The upside of a queue is if this changes to a multi-process system on some executor,
-        #   this code remains valid as this is a safe shared option.
-        self._active_data: Queue[DopplerPointCloud] = Queue(1)
-        self._freq: float = 10.0
-        self._last_t: float = 0.0
+        # Last configuration sent successfully, re-sent by reconnect()
+        self._last_config: Optional[list[str]] = None
+
+        # Point clouds are handed out through a preallocated ring, which get_data reads with its own subscription.
+        #   Only the event loop thread touches the ring, readers on other threads or processes hand data to the loop first.
+        self._active_data: FrameRing[DopplerPointCloud] = FrameRing(DeliveryPolicy.LATEST)
+        self._consumer: Optional[Subscription[DopplerPointCloud]] = None
+        self._reset_consumer()
+        # Point clouds refused by a full DeliveryPolicy.BLOCKING ring, while reading is paused
+        self._backlog: deque[DopplerPointCloud] = deque()
+        self._pause_reading: Callable[[], None] = self._noop
+        self._resume_reading: Callable[[], None] = self._noop
+        self._stats: PipelineStatistics = PipelineStatistics()
+        self._sync: FrameSynchronizer = FrameSynchronizer()
+        self._frame_numbers: FrameNumberTracker = FrameNumberTracker()
+        self._use_reader_thread: bool = False
+        self._process_decode: Optional[dict[str, int]] = None
+        # None when instrumentation is off, every stage then costs a single None check
+        self._instr: Optional[PipelineInstrumentation] = None
+        self._recorder: Optional[CaptureWriter] = None
+        # Recycled point buffers, and scratch space for doppler filtering, see configure_buffer_pool
+        self._pool: Optional[ArrayPool] = None
+        self._magnitude: np.ndarray = np.empty(0, dtype=np.float32)
+        self._valid: np.ndarray = np.empty(0, dtype=bool)
 
     @dataclass
     class _light_doppler_cloud:
@@ -50,6 +80,8 @@ class IWR6843AOP(Sensor):
         y_coord: np.ndarray
         z_coord: np.ndarray
         doppler: np.ndarray
+        # The same points as rows of an Nx4 float32 view
+        points: np.ndarray
 
 
 
@@ -71,34 +103,24 @@ class IWR6843AOP(Sensor):
         detectedPoints_byteVecIdx: int = -1
 
 
-    def _getXYZ_type2(self, vec: list[int], vecIdx: int, Params: _frame, num_detected_obj: int, sizeObj: int, raw_bv: Any):
-        num_detected_obj = int(num_detected_obj)
-        data = self._light_doppler_cloud(np.zeros(num_detected_obj), np.zeros(num_detected_obj), np.zeros(num_detected_obj), np.zeros(num_detected_obj))  #type: ignore
-        i: int
-        start_idx: int
+    def _getXYZ_type2(self, vec: memoryview, vecIdx: int, Params: _frame, num_detected_obj: int, sizeObj: int) -> _light_doppler_cloud:
+        """Reads the detected points straight out of the received buffer. No data is copied, the returned columns are views into `vec`.
+        If the buffer is shorter than advertised, only the complete points are returned.
+        """
+        num_detected_obj = min(int(num_detected_obj), max(len(vec) - vecIdx, 0) // sizeObj)
+        pts = np.frombuffer(vec, dtype=DETECTED_POINT_DTYPE, count=num_detected_obj, offset=vecIdx)
 
-        for i in range(num_detected_obj):  
-            # /*start index in bytevec for this detected obj*/
-            start_idx = vecIdx + i * sizeObj
-            try:
-                data.x_coord[i] = unpack('f',bytes(vec[start_idx+0:start_idx+4]))[0]
-                data.y_coord[i] = unpack('f',bytes(vec[start_idx+4:start_idx+8]))[0]
-                data.z_coord[i] = unpack('f',bytes(vec[start_idx+8:start_idx+12]))[0]
-                data.doppler[i] = unpack('f',bytes(vec[start_idx+12:start_idx+16]))[0]
-            except:
-                pass
+        return self._light_doppler_cloud(pts['x'], pts['y'], pts['z'], pts['doppler'], pts.view('<f4').reshape(-1, 4))
 
-        return data
 
-
-    def _processDetectedPoints(self, bv: list[int], idx: int, dt: _frame, raw_bv: Any) -> Optional[_light_doppler_cloud]:
+    def _processDetectedPoints(self, bv: memoryview, idx: int, dt: _frame) -> Optional[_light_doppler_cloud]:
         """Processes detected points from a byte vector, unpacks floats as well.
         This is some preset structure that we are breaking down
         """
         if (dt.numDetectedObj > 0):
-            sizeofObj: int = 16
-                    
-            return self._getXYZ_type2(bv, idx, dt, dt.numDetectedObj, sizeofObj, raw_bv)
+            sizeofObj: int = DETECTED_POINT_DTYPE.itemsize
+
+            return self._getXYZ_type2(bv, idx, dt, dt.numDetectedObj, sizeofObj)
 
         return None
 
@@ -218,6 +240,7 @@ class IWR6843AOP(Sensor):
         """Tried to send a TI config, with a simple retry mechanism.
         Configuration files can be created here: `https://dev.ti.com/gallery/view/mmwave/mmWave_Demo_Visualizer/ver/3.5.0/`. Future support may be built for creating configuration files.
         This can be setup to autoretry on connection failure. With single device setups, this may allow for automated search of devices by users.
+        Swapping costs a serial timeout per line and only works for one device, :obj:`discover<pymmWave.discovery.discover>` finds the ports of any number of boards up front.
         
         Args:
             config (list[str]): List of strings making up the config
@@ -230,7 +253,7 @@ class IWR6843AOP(Sensor):
         Raises:
             SerialException: If device is disconnected before completion, SerialExceptions may be raised.
         """
-        valid_replies = set(["Done", "Ignored: Sensor is already stopped"])
+        valid_replies = CLI_VALID_REPLIES
         if not self._is_alive:
             self._config_sent = False
             return False
@@ -269,6 +292,7 @@ class IWR6843AOP(Sensor):
 
             if not failed:
                 self._config_sent = True
+                self._last_config = list(config)
                 return True
         
         # There are various reasons for failure. One of the more common is due to swapping of cfg/data.
@@ -293,170 +317,584 @@ class IWR6843AOP(Sensor):
         self.log("Retrying configuration.")
         return self.send_config(config, max_retries, autoretry_cfg_data=False)
 
+    class _CliProtocol(Protocol):
+        """Protocol splitting the config port stream from a :obj:`SerialReadTransport<pymmWave.transport.SerialReadTransport>` into reply lines.
+        """
+        def __init__(self, lines: 'AsyncQueue[Optional[str]]'):
+            self._lines = lines
+            self._pending = b''
+
+        def data_received(self, data: bytes) -> None:
+            *lines, self._pending = (self._pending + data).split(b'\n')
+            for raw in lines:
+                try:
+                    line = raw.decode('utf-8').replace('\r', '').strip()
+                except UnicodeDecodeError:
+                    line = "error"
+                if line.startswith(CLI_PROMPT):
+                    line = line[len(CLI_PROMPT):].strip()
+                if line:
+                    self._lines.put_nowait(line)
+
+        def connection_lost(self, exc: Optional[Exception]) -> None:
+            self._lines.put_nowait(None)
+
+    def _command_timeout(self, command: str) -> float:
+        """Seconds to wait for the reply to a command: the command and its echo, a reply and a prompt crossing the port at its baud rate, plus the device's execution time.
+        """
+        name = command.split(' ', 1)[0]
+        wire_bytes = 2 * len(command) + len(CLI_PROMPT) + 48
+        return transfer_time_ns(wire_bytes, self._ser_config.baudrate) / 1e9 + CLI_SLOW_COMMAND_TIME.get(name, CLI_COMMAND_TIME)  # type: ignore
+
+    async def _send_command(self, command: str, lines: 'AsyncQueue[Optional[str]]') -> bool:
+        """Writes one command and waits for its echo followed by a valid reply, an error, or the command's timeout.
+        """
+        self._ser_config.write((command + '\n').encode())  # type: ignore
+        deadline = monotonic() + self._command_timeout(command)
+        echoed = False
+        while True:
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                self.log("timed out waiting for a reply to:", command)
+                return False
+            try:
+                line = await wait_for(lines.get(), remaining)
+            except AsyncTimeoutError:
+                continue
+            if line is None:
+                raise SerialException("Config port closed while configuring")
+
+            if not echoed:
+                # Anything before the echo belongs to an earlier command
+                echoed = line == command
+            elif line in CLI_VALID_REPLIES:
+                return True
+            elif line.startswith("Error"):
+                self.log("invalid reply:", line)
+                return False
+
+    async def send_config_async(self, config: list[str], max_retries: int=1) -> bool:
+        """Sends a TI config like :obj:`send_config`, without blocking the event loop.
+        Replies are read as they arrive and matched to their command by its echo, so every command completes as soon as the device answers "Done".
+        A command fails on an error reply, or when no reply arrived within the time it takes to cross the port at its baud rate plus the device's execution time.
+        Ports are never swapped, use :obj:`discover<pymmWave.discovery.discover>` to find them.
+
+        Commands are sent one at a time, the demo CLI drops input which arrives while it executes a command. Several sensors are configured concurrently with :obj:`send_configs<pymmWave.IWR6843AOP.send_configs>`.
+        Where the event loop cannot watch the port (e.g. the Windows proactor loop), :obj:`send_config` runs on the default executor instead.
+
+        Args:
+            config (list[str]): List of strings making up the config
+            max_retries (int, optional): Number of times to retry on failure. Defaults to 1.
+
+        Returns:
+            bool: If sending was successful
+
+        Raises:
+            SerialException: If device is disconnected before completion.
+        """
+        if not self._is_alive:
+            self._config_sent = False
+            return False
+
+        loop = get_running_loop()
+        lines: AsyncQueue[Optional[str]] = AsyncQueue()
+        try:
+            transport = SerialReadTransport(loop, self._ser_config, self._CliProtocol(lines))
+        except NotImplementedError:
+            return await loop.run_in_executor(None, partial(self.send_config, config, max_retries, False))
+
+        commands = [line.replace('\r', '').strip() for line in config if line[0] != '%' and line[0] != '\n']
+        try:
+            for _ in range(max_retries):
+                for command in commands:
+                    if not await self._send_command(command, lines):
+                        self.error("Sending configuration failed!")
+                        break
+                else:
+                    self._config_sent = True
+                    self._last_config = list(config)
+                    return True
+        finally:
+            transport.close()
+
+        return False
+
+    def reconnect(self) -> bool:
+        """Closes both ports and reopens them with the port names and baud rates in use, then re-sends the last configuration which was sent successfully.
+        Blocks for as long as opening the ports and configuring takes. The delivery ring and its subscriptions are kept, so consumers resume once :obj:`start_sensor` runs again.
+
+        Returns:
+            bool: True if the ports were reopened and configured.
+        """
+        # The port objects are authoritative, the stored names are not updated when send_config swaps ports
+        config_port = self._ser_config.port if self._ser_config is not None else self._config_port_name
+        data_port = self._ser_data.port if self._ser_data is not None else self._data_port_name
+        config_baud = self._ser_config.baudrate if self._ser_config is not None else self._config_baud
+        data_baud = self._ser_data.baudrate if self._ser_data is not None else self._data_baud
+        if config_port is None or data_port is None or config_baud is None or data_baud is None:
+            self.error("Cannot reconnect a sensor which was never connected.")
+            return False
+        if self._last_config is None:
+            self.error("Cannot reconnect a sensor which was never configured.")
+            return False
+
+        for ser in (self._ser_config, self._ser_data):
+            try:
+                if ser is not None:
+                    ser.close()
+            except (SerialException, OSError):
+                pass
+        self._is_alive = False
+        self._config_sent = False
+
+        if not (self.connect_config(config_port, config_baud) and self.connect_data(data_port, data_baud)):
+            return False
+        try:
+            return self.send_config(self._last_config, autoretry_cfg_data=False)
+        except (SerialException, OSError) as e:
+            self.error(f"Reconfiguration failed: {e}")
+            return False
+
+    @property
+    def last_config(self) -> Optional[tuple[str, ...]]:
+        """The configuration most recently sent successfully, which :obj:`reconnect` sends again. None if no configuration was sent yet.
+        """
+        return None if self._last_config is None else tuple(self._last_config)
+
+    def last_frame_ns(self) -> int:
+        """Host time.monotonic_ns() at which a frame was last decoded, or statistics were (re)started if none was since.
+        """
+        return self._stats.last_frame_ns
+
+    def record_recovery(self, duration_ns: int) -> None:
+        """Adds a recovery to the statistics, see :obj:`SensorSupervisor<pymmWave.supervisor.SensorSupervisor>`.
+
+        Args:
+            duration_ns (int): Time from detecting the failure until frames arrived again.
+        """
+        self._stats.add_recovery(duration_ns)
+
+    def _process_frame(self, frame: memoryview, timestamp_ns: int) -> Optional[DopplerPointCloud]:
+        """Decodes a single complete frame, as given out by the frame synchronizer, and applies doppler filtering.
+
+        Args:
+            frame (memoryview): Frame starting with the magic number.
+            timestamp_ns (int): Host monotonic time at which the frame was received.
+
+        Returns:
+            Optional[DopplerPointCloud]: The point cloud with its metadata, None if the frame carries no detected points.
+        """
+        instr = self._instr
+        if instr is not None:
+            t0 = perf_counter_ns()
+
+        header = parse_header(frame)
+
+        dt = self._frame()
+        # Version, uint32: MajorNum * 2^24 + MinorNum * 2^16 + BugfixNum * 2^8 + BuildNum
+        dt.tlv_version = header.version.to_bytes(4, 'little')
+        dt.tlv_version_uint16 = dt.tlv_version[2] + (dt.tlv_version[3] << 8)
+        #platform type, uint32: 0xA1643 or 0xA1443
+        dt.tlv_platform = header.platform
+        dt.frameNumber = header.frame_number
+        dt.numDetectedObj = header.num_detected_obj
+
+        tlv_types: list[int] = []
+        for tlv_type, byteVecIdx, _ in iter_tlvs(frame, header):
+            tlv_types.append(tlv_type)
+            # tlv payload
+            if (tlv_type == TLV_type.MMWDEMO_OUTPUT_MSG_DETECTED_POINTS.value):
+                # will not get this type if numDetectedObj == 0 even though gui monitor selects this type
+                dt.detectedPoints_byteVecIdx = byteVecIdx
+            # The remaining TLV types (range/noise profiles, heat maps, stats, side info, temperature) are not decoded yet.
+
+        metadata = FrameMetadata(header.frame_number, header.time_cpu_cycles, timestamp_ns, tuple(tlv_types), header.num_detected_obj, header.total_packet_len)
+        if instr is not None:
+            t1 = perf_counter_ns()
+            instr.record(Stage.HEADER_PARSE, t1 - t0)
+
+        if(dt.detectedPoints_byteVecIdx > -1):
+            detObjRes = self._processDetectedPoints(frame, dt.detectedPoints_byteVecIdx, dt)
+            if instr is not None:
+                t2 = perf_counter_ns()
+                instr.record(Stage.TLV_DECODE, t2 - t1)
+
+            if detObjRes is not None:
+                cloud = self._filter_points(detObjRes, metadata)
+                if instr is not None:
+                    instr.record(Stage.DOPPLER_FILTER, perf_counter_ns() - t2)
+                return cloud
+
+        return None
+
+    def _filter_points(self, detObjRes: _light_doppler_cloud, metadata: FrameMetadata) -> DopplerPointCloud:
+        """Copies the points passing doppler filtering out of the received buffer, into a single C-contiguous array of the configured type.
+        With a buffer pool, the array and the filter's temporaries come from preallocated buffers.
+        """
+        pool = self._pool
+        n = detObjRes.points.shape[0]
+        if pool is not None and n <= pool.max_points:
+            magnitude = np.abs(detObjRes.doppler, out=self._magnitude[:n])
+            valid_doppler = np.greater(magnitude, self._doppler_filtering, out=self._valid[:n])
+        else:
+            valid_doppler = np.greater(np.abs(detObjRes.doppler), self._doppler_filtering)
+
+        count = int(np.count_nonzero(valid_doppler))
+        obj_np = pool.acquire(count) if pool is not None else None
+        if obj_np is None:
+            pool = None
+            obj_np = np.empty((count, 4), dtype=self._dtype)
+
+        if count == n:
+            obj_np[:] = detObjRes.points
+        elif obj_np.dtype == detObjRes.points.dtype:
+            np.compress(valid_doppler, detObjRes.points, axis=0, out=obj_np)
+        else:
+            obj_np[:] = detObjRes.points[valid_doppler]
+
+        return DopplerPointCloud(obj_np, metadata, pool)
+
+    class _DataProtocol(Protocol):
+        """Protocol receiving the raw data port stream from a :obj:`SerialReadTransport<pymmWave.transport.SerialReadTransport>`.
+        """
+        def __init__(self, sensor: 'IWR6843AOP', done: 'Future[None]'):
+            self._sensor = sensor
+            self._done = done
+
+        def data_received(self, data: bytes) -> None:
+            self._sensor._on_data(data, monotonic_ns())
+
+        def connection_lost(self, exc: Optional[Exception]) -> None:
+            if self._done.done():
+                return
+            if exc is not None:
+                self._done.set_exception(SerialException(str(exc)))
+            else:
+                self._done.set_result(None)
+
+    def _decode(self, data: bytes, timestamp_ns: int, host_ns: Optional[int]=None) -> list[DopplerPointCloud]:
+        """Frames and decodes received bytes. Thread safe with respect to the event loop, as it does not touch the output queue.
+
+        Args:
+            data (bytes): Received bytes.
+            timestamp_ns (int): Host monotonic time at which they were received.
+            host_ns (Optional[int], optional): Time recorded in the frame metadata and in recordings, if it differs from `timestamp_ns`, as when replaying a capture. Defaults to None.
+
+        Returns:
+            list[DopplerPointCloud]: Every point cloud completed by these bytes, in order.
+        """
+        clouds: list[DopplerPointCloud] = []
+        if host_ns is None:
+            host_ns = timestamp_ns
+        recorder = self._recorder
+        if recorder is not None:
+            recorder.write(data, host_ns)
+
+        instr = self._instr
+        if instr is not None:
+            t0 = perf_counter_ns()
+
+        damaged = self._sync.corrupt_frames
+        self._sync.feed(data)
+        frames = list(self._sync.frames())
+        # Frames the synchronizer dropped are corrupt, and must not show up again as gaps in the frame counter
+        damaged = self._sync.corrupt_frames - damaged
+        self._frame_numbers.skip(damaged)
+
+        if instr is not None:
+            instr.record(Stage.MAGIC_SYNC, perf_counter_ns() - t0)
+            instr.count('bytes_received', len(data))
+            instr.count('frames_synced', len(frames))
+
+        resyncs = self._frame_numbers.resyncs
+        corrupt, gap, empty = damaged, 0, 0
+        for frame in frames:
+            try:
+                cloud = self._process_frame(frame, host_ns)
+            except (IndexError, ValueError, StructError) as _:
+                corrupt += 1
+                if instr is not None:
+                    instr.count('decode_errors')
+                try:
+                    # Still account for the frame number, so the frame is not counted again as a gap
+                    gap += self._frame_numbers.observe(parse_header(frame).frame_number)
+                except StructError:
+                    pass
+                continue
+            if cloud is None:
+                # Frames without detections are not delivered, but their frame number must not show up as a gap
+                empty += 1
+                gap += self._frame_numbers.observe(parse_header(frame).frame_number)
+                continue
+            gap += self._frame_numbers.observe(cloud.get_metadata().frame_number)  # type: ignore
+            clouds.append(cloud)
+        # Implausible frame numbers count as corrupt frames, not as gaps
+        corrupt += self._frame_numbers.resyncs - resyncs
+
+        self._stats.add_bytes(len(data), timestamp_ns)
+        self._stats.add_frames(len(clouds) + empty, corrupt, gap, timestamp_ns, empty)
+
+        return clouds
+
+    def _on_data(self, data: bytes, timestamp_ns: int, host_ns: Optional[int]=None) -> None:
+        """Frames and decodes received bytes, publishing every resulting point cloud. Arguments are as for :obj:`_decode`.
+        """
+        for obj in self._decode(data, timestamp_ns, host_ns):
+            self._publish(obj)
+
+    def _publish_many(self, clouds: list[DopplerPointCloud]) -> None:
+        for obj in clouds:
+            self._publish(obj)
+
+    def _publish(self, obj: DopplerPointCloud) -> None:
+        """Makes a point cloud available to consumers according to the delivery policy.
+        If the ring refuses it, reading from the device is paused until a consumer catches up.
+        """
+        if self._backlog or not self._active_data.put(obj):
+            self._backlog.append(obj)
+            if len(self._backlog) == 1:
+                self._pause_reading()
+                self._active_data.add_writable_callback(self._flush_backlog)
+
+    def _flush_backlog(self) -> None:
+        while self._backlog and self._active_data.put(self._backlog[0]):
+            self._backlog.popleft()
+
+        if self._backlog:
+            self._active_data.add_writable_callback(self._flush_backlog)
+        else:
+            self._resume_reading()
+
+    @staticmethod
+    def _noop() -> None:
+        pass
+
+    def _read_blocking(self) -> bytes:
+        """Waits for at least one byte, then reads whatever else is buffered. Meant to run off the event loop thread.
+        """
+        instr = self._instr
+        if instr is not None:
+            t0 = perf_counter_ns()
+        received: bytes = self._ser_data.read(max(1, self._ser_data.in_waiting))  # type: ignore
+        if instr is not None:
+            instr.record(Stage.SERIAL_READ, perf_counter_ns() - t0)
+        return received
+
+    def _reader_thread(self, loop: AbstractEventLoop, done: 'Future[None]', stop: Event, flow: Event) -> None:
+        """Body of the dedicated reader thread. Reads and decodes off the event loop, handing finished point clouds to the loop in one call per read.
+        Reading waits while `flow` is cleared. Once `stop` is set, nothing read is decoded or published any more.
+        """
+        try:
+            while not stop.is_set():
+                if not flow.wait(.1):
+                    continue
+                received = self._read_blocking()
+                # The sensor may have been stopped while the read blocked
+                if not received or stop.is_set():
+                    continue
+                clouds = self._decode(received, monotonic_ns())
+                if clouds and not stop.is_set():
+                    self._call_soon_threadsafe(loop, self._publish_many, clouds)
+        except Exception as e:
+            self._call_soon_threadsafe(loop, self._finish, done, e)
+        else:
+            self._call_soon_threadsafe(loop, self._finish, done, None)
+
+    @staticmethod
+    def _call_soon_threadsafe(loop: AbstractEventLoop, callback: Callable[..., None], *args: Any) -> None:
+        """Schedules a callback from another thread, unless the loop was closed in the meantime.
+        """
+        if loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            # Closed between the check and the call
+            pass
+
+    @staticmethod
+    def _finish(done: 'Future[None]', exc: Optional[BaseException]) -> None:
+        if done.done():
+            return
+        if exc is not None:
+            done.set_exception(exc)
+        else:
+            done.set_result(None)
+
+    async def _run_decode_worker(self, loop: AbstractEventLoop, done: 'Future[None]') -> None:
+        """Streams from a :obj:`DecodeWorker<pymmWave.multiprocess.DecodeWorker>` process until it fails or this coroutine is cancelled.
+        Point clouds are copied out of the worker's shared memory ring as they are published, since consumers and the backlog may hold them for longer than the ring does.
+        Under DeliveryPolicy.BLOCKING the worker waits for drained slots, so pausing here holds back the worker rather than letting it overwrite clouds.
+        """
+        # The port object is authoritative, the stored names are not updated when send_config swaps ports
+        source = SerialByteSource(self._ser_data.port, self._ser_data.baudrate, self._ser_data.timeout)  # type: ignore
+        blocking = self._active_data.policy == DeliveryPolicy.BLOCKING
+        worker = DecodeWorker(source, self._doppler_filtering, dtype=self._dtype, blocking=blocking, **self._process_decode)  # type: ignore
+        worker.start()
+        # Running totals of the worker, the statistics are fed with the difference at every drain
+        counters = (0, 0, 0, 0, 0)
+
+        def drain() -> None:
+            nonlocal counters
+            dropped = worker.dropped
+            pool = self._pool
+            try:
+                clouds = worker.drain(pool)
+            except EOFError:
+                self._finish(done, SerialException("Decode worker exited"))
+                return
+            except Exception as e:
+                self._finish(done, e)
+                return
+
+            now = monotonic_ns()
+            latest = worker.ring.counters
+            delta = [b - a for a, b in zip(counters, latest)]
+            counters = latest
+            self._stats.add_bytes(delta[0], now)
+            self._stats.add_frames(delta[1], delta[2], delta[3], now, delta[4])
+            self._stats.add_evicted(worker.dropped - dropped)
+            for points, metadata in clouds:
+                # Points larger than the pool's buffers were copied into a fresh array
+                self._publish(DopplerPointCloud(points, metadata, pool if points.base is not None else None))
+
+        try:
+            try:
+                loop.add_reader(worker.fileno(), drain)
+            except NotImplementedError:
+                flow = AsyncEvent()
+                flow.set()
+                self._pause_reading, self._resume_reading = flow.clear, flow.set
+                while not done.done():
+                    await flow.wait()
+                    if await loop.run_in_executor(None, worker.poll, 1):
+                        drain()
+            else:
+                # While paused nothing is drained, so a blocking worker stops once the shared ring is full
+                self._pause_reading = lambda: loop.remove_reader(worker.fileno())
+                self._resume_reading = lambda: loop.add_reader(worker.fileno(), drain)
+                try:
+                    await done
+                finally:
+                    loop.remove_reader(worker.fileno())
+        finally:
+            self._pause_reading = self._resume_reading = self._noop
+            worker.stop()
+
+        done.result()
+
     async def start_sensor(self) -> None:
         """Starts the sensor and will place data into a queue.
         The goal of this function is to manage the state of the entire application. Nothing will happen if this function is not run with asyncio.
-        This function attempts to read data from the sensor as quickly as it can, then extract positional+doppler data, and place data into an asyncio.Queue.
-        Since this relies on the asyncio Queue, limitations may stem from asyncio. These issues, mainly revolving around thread safety, can be dealt with at the application layer.
+        This function reads data from the sensor as it arrives, then extracts positional+doppler data, and publishes it according to the delivery policy set with :obj:`configure_delivery`.
+        Consumers are served on the event loop thread. Thread safety beyond that can be dealt with at the application layer.
 
-        This function also actively attempts to context switch between intervals to minimize overhead.
+        On POSIX the data port is watched through the event loop (:obj:`SerialReadTransport<pymmWave.transport.SerialReadTransport>`), so the loop only wakes when bytes arrive.
+        Where that is not supported (e.g. the Windows proactor loop), reads are made on the default executor instead. In neither case does a blocking read run on the event loop thread.
+        Received bytes are framed by a :obj:`FrameSynchronizer<pymmWave.framing.FrameSynchronizer>`, so partial frames are kept between reads and no bytes are dropped.
+
+        If a reader thread was requested with :obj:`configure_reader_thread`, reading and decoding run on that thread instead, and only finished point clouds are handed to the event loop.
+        The thread has exited by the time this coroutine returns or is cancelled.
+        If a decode process was requested with :obj:`configure_process_decode`, they run in a worker process instead, which takes precedence over the reader thread.
 
         Raises:
             Exception: If sensor has some failure, will throw a SerialException.
         """
-        self._last_t = time()
-
         if not self._is_alive:
             raise Exception("Disconnected sensor")
         
         if not self._config_sent:
             raise Exception("Config never sent to device")
-        a: Optional[bytes] = b''
-        while True:
-            # Allows for context switching
-            await sleep(ASYNC_SLEEP)
+
+        self._sync.reset()
+        self._frame_numbers.reset()
+        self._backlog.clear()
+        loop = get_running_loop()
+        done: Future[None] = loop.create_future()
+
+        if self._process_decode is not None:
+            await self._run_decode_worker(loop, done)
+            return
+
+        if self._use_reader_thread:
+            stop = Event()
+            flow = Event()
+            flow.set()
+            self._pause_reading, self._resume_reading = flow.clear, flow.set
+            reader = Thread(target=self._reader_thread, args=(loop, done, stop, flow), name=f"{self.model()}-{self.name}-reader", daemon=True)
+            reader.start()
             try:
-                chunks: list[bytes] = []
-                a += self._ser_data.read_all()  # type: ignore
-                if a is None:
-                    raise SerialException()
-                b = MAGIC_NUMBER
-                index = [x for x in range(len(a)) if a[x:x+len(b)] == b]
-                # print(len(a))
-                if len(index) > 0:
-
-                    dt = self._frame()
-                    # Header
-                    byteVecIdx = index[0]+8 # magic word (4 unit16)
-                    #numDetectedObj = 0
-                    # Version, uint32: MajorNum * 2^24 + MinorNum * 2^16 + BugfixNum * 2^8 + BuildNum
-                    dt.tlv_version = a[byteVecIdx:byteVecIdx + 4]
-                    dt.tlv_version_uint16 = dt.tlv_version[2] + (dt.tlv_version[3] << 8)
-                    byteVecIdx += 4
-
-                    bf = np.array([x for x in a[byteVecIdx:byteVecIdx + 4]])  # type: ignore
-                    b_m = np.array(BYTE_MULT)  # type: ignore
-                    # Total packet length including header in Bytes, uint32
-                    totalPacketLen = int(np.sum(np.dot(bf, b_m)))  # type: ignore
-                    byteVecIdx += 4
-                    chunks.append(a)
-                    chunks.append(self._ser_data.read(totalPacketLen-8))  # type: ignore
-                    bv = [x for x in b''.join(chunks)]
-                    raw_bv = b''.join(chunks)
-                    
-                    if (len(bv) >= totalPacketLen):
-                        # print("VALID", totalPacketLen, len(bv))
-
-                        #platform type, uint32: 0xA1643 or 0xA1443 
-                        dt.tlv_platform = np.sum(np.dot(bv[byteVecIdx:byteVecIdx + 4], BYTE_MULT))  # type: ignore
-                        byteVecIdx += 4
-
-                        # Frame number, uint32
-                        dt.frameNumber = np.sum(np.dot(bv[byteVecIdx:byteVecIdx + 4], BYTE_MULT))  # type: ignore
-                        byteVecIdx += 4
-
-                        # Time in CPU cycles when the message was created. For AR16xx: DSP CPU cycles
-                        # timeCpuCycles = np.sum(np.dot(bv[byteVecIdx:byteVecIdx + 4], BYTE_MULT))  # type: ignore
-                        byteVecIdx += 4
-
-                        # Number of detected objects, uint32
-                        dt.numDetectedObj = np.sum(np.dot(bv[byteVecIdx:byteVecIdx + 4], BYTE_MULT))  # type: ignore
-                        byteVecIdx += 4
-
-                        # Number of TLVs, uint32
-                        numTLVs = int(np.sum(np.dot(bv[byteVecIdx:byteVecIdx + 4], BYTE_MULT)))  # type: ignore
-                        byteVecIdx += 4
-
-                        # print("Objs:", dt.numDetectedObj, numTLVs)
-
-                        byteVecIdx += 4
-
-                        #  start_tlv_ticks: int
-                        for _ in range(numTLVs):
-                            if(byteVecIdx>len(bv)):
-                                break
-                            tlv_type = np.sum(np.dot(bv[byteVecIdx:byteVecIdx + 4], BYTE_MULT))  # type: ignore
-                            byteVecIdx += 4
-                            tlv_length = int(np.sum(np.dot(bv[byteVecIdx:byteVecIdx + 4], BYTE_MULT)))  # type: ignore
-                            byteVecIdx += 4
-                            # print(numTLVs, tlv_type, tlv_
-                            # length)
-
-                            # tlv payload
-                            if (TLV_type(tlv_type) == TLV_type.MMWDEMO_OUTPUT_MSG_DETECTED_POINTS):
-                                # will not get this type if numDetectedObj == 0 even though gui monitor selects this type
-                                dt.detectedPoints_byteVecIdx = byteVecIdx
-                            # elif (tlv_type == TLV_type.MMWDEMO_OUTPUT_MSG_RANGE_PROFILE):
-                            #     #Params.rangeProfile_byteVecIdx = byteVecIdx
-                            #     pass
-                            # elif (tlv_type == TLV_type.MMWDEMO_OUTPUT_MSG_NOISE_PROFILE):
-                            #     # processRangeNoiseProfile(bytevec, byteVecIdx, Params, false)
-                            #     # gatherParamStats(Params.plot.noiseStats, getTimeDiff(start_tlv_ticks))
-                            #     pass
-                            # elif (tlv_type == TLV_type.MMWDEMO_OUTPUT_MSG_AZIMUT_STATIC_HEAT_MAP):
-                            #     pass
-                            #     # processAzimuthHeatMap(bytevec, byteVecIdx, Params)
-                            #     # gatherParamStats(Params.plot.azimuthStats, getTimeDiff(start_tlv_ticks))
-                            # elif (tlv_type == TLV_type.MMWDEMO_OUTPUT_MSG_RANGE_DOPPLER_HEAT_MAP):
-                            #     pass
-                            #     # processRangeDopplerHeatMap(bytevec, byteVecIdx, Params)
-                            #     # gatherParamStats(Params.plot.dopplerStats, getTimeDiff(start_tlv_ticks))
-                            # elif (tlv_type == TLV_type.MMWDEMO_OUTPUT_MSG_STATS):
-                            #     pass
-                            #     # processStatistics(bytevec, byteVecIdx, Params)
-                            #     # gatherParamStats(Params.plot.cpuloadStats, getTimeDiff(start_tlv_ticks))
-                            # elif (tlv_type == TLV_type.MMWDEMO_OUTPUT_MSG_DETECTED_POINTS_SIDE_INFO):
-                            #     pass
-                            #     # Params.sideInfo_byteVecIdx = byteVecIdx
-                            # elif (tlv_type == TLV_type.MMWDEMO_OUTPUT_MSG_AZIMUT_ELEVATION_STATIC_HEAT_MAP):
-                            #     pass
-                            #     # processAzimuthElevHeatMap(bytevec, byteVecIdx, Params)
-                            #     # gatherParamStats(Params.plot.azimuthElevStats, getTimeDiff(start_tlv_ticks))
-                            # elif (tlv_type == TLV_type.MMWDEMO_OUTPUT_MSG_TEMPERATURE_STATS):
-                            #     pass
-                            #     # processTemperatureStatistics(bytevec, byteVecIdx, Params)
-                            #     # gatherParamStats(Params.plot.temperatureStats, getTimeDiff(start_tlv_ticks))
-                            
-
-                            byteVecIdx += tlv_length
-                        
-                        # print("TLV loop took {} seconds".format(time.time()-st_tlv))
-                        if(dt.detectedPoints_byteVecIdx > -1):
-                            detObjRes = self._processDetectedPoints(bv, dt.detectedPoints_byteVecIdx, dt, raw_bv)
-
-                            if detObjRes is not None:
-                                valid_doppler = np.greater(np.abs(detObjRes.doppler), self._doppler_filtering)
-
-                                obj_np = np.array([                                 # type: ignore
-                                        detObjRes.x_coord[valid_doppler],
-                                        detObjRes.y_coord[valid_doppler],
-                                        detObjRes.z_coord[valid_doppler],
-                                        detObjRes.doppler[valid_doppler]]).T 
-                                obj: DopplerPointCloud = DopplerPointCloud(obj_np)
-
-                                if self._active_data.full():
-                                    self._active_data.get_nowait()
-                                # print(self.name, obj.get())
-                                self._active_data.put_nowait(obj)
-                    a = b''
-                else:
+                await done
+            finally:
+                stop.set()
+                self._pause_reading = self._resume_reading = self._noop
+                # Wake a read in progress rather than waiting out the serial timeout. The thread must be gone before returning,
+                #   so it cannot decode into a restarted sensor or call back into a closed loop.
+                try:
+                    self._ser_data.cancel_read()  # type: ignore
+                except (AttributeError, SerialException, OSError):
                     pass
-                    # print("No data.")
-            except (IndexError, ValueError) as _:
-                pass
-        return None
+                await loop.run_in_executor(None, reader.join)
+            return
+
+        try:
+            read_timer = None if self._instr is None else partial(self._instr.record, Stage.SERIAL_READ)
+            transport = SerialReadTransport(loop, self._ser_data, self._DataProtocol(self, done), read_timer)
+        except NotImplementedError:
+            if self._verbose: self.log("Event driven serial reads unsupported, reading on the executor.")
+            async_flow = AsyncEvent()
+            async_flow.set()
+            self._pause_reading, self._resume_reading = async_flow.clear, async_flow.set
+            try:
+                while True:
+                    await async_flow.wait()
+                    received = await loop.run_in_executor(None, self._read_blocking)
+                    if received:
+                        self._on_data(received, monotonic_ns())
+            finally:
+                self._pause_reading = self._resume_reading = self._noop
+
+        self._pause_reading, self._resume_reading = transport.pause_reading, transport.resume_reading
+        try:
+            await done
+        finally:
+            transport.close()
+            self._pause_reading = self._resume_reading = self._noop
         
+    def _update_freq(self, count: int=1) -> None:
+        self._stats.add_delivered(count, monotonic_ns())
+
+    def _reset_consumer(self) -> None:
+        """Subscribes get_data to the delivery ring, so the newest point cloud is waiting for the first read just like with the old Queue(1).
+        Under DeliveryPolicy.BLOCKING the subscription is only made by the first read instead, so a reader which is never used does not hold the sensor back.
+        """
+        self._consumer = None if self._active_data.policy == DeliveryPolicy.BLOCKING else self._active_data.subscribe()
+
+    def _get_consumer(self) -> Subscription[DopplerPointCloud]:
+        if self._consumer is None:
+            self._consumer = self._active_data.subscribe()
+        return self._consumer
+
+    def _record_pickup(self, data: DopplerPointCloud) -> None:
+        """Records queue and end to end latency of the most recently retrieved point cloud.
+        """
+        now = monotonic_ns()
+        self._instr.record(Stage.QUEUE_WAIT, now - self._consumer.last_published_ns)  # type: ignore
+        metadata = data.get_metadata()
+        if metadata is not None:
+            self._instr.record(Stage.CONSUMER_PICKUP, now - metadata.host_timestamp_ns)  # type: ignore
+
     async def get_data(self) -> DopplerPointCloud:
         """Returns data when it is ready. This function also updates the frequency measurement of the sensor.
-        This function is blocking.
+        This function is blocking. Under DeliveryPolicy.BLOCKING, point clouds are only received from the first call of this function or :obj:`get_data_nowait`/:obj:`get_batch` on.
 
         Returns:
             DopplerPointCloud: [description]
         """
-        data = await self._active_data.get()
-        tt = time()
-        self._freq = (1/(tt-self._last_t))*.5 + self._freq*.5
-        self._last_t = tt
+        data = await self._get_consumer().get()
+        self._update_freq()
+        if self._instr is not None:
+            self._record_pickup(data)
         return data
         
 
@@ -466,13 +904,44 @@ class IWR6843AOP(Sensor):
         Returns:
             Optional[DopplerPointCloud]: Data if there is data available, otherwise returns None.
         """
-        if(self._active_data.full()):
-            tt = time()
-            self._freq = (1/(tt-self._last_t))*.5 + self._freq*.5
-            self._last_t = tt
-            return self._active_data.get_nowait()
-        
-        return None
+        data = self._get_consumer().get_nowait()
+        if data is not None:
+            self._update_freq()
+            if self._instr is not None:
+                self._record_pickup(data)
+
+        return data
+
+    async def get_batch(self, n: int, timeout: Optional[float]=None) -> PointCloudBatch:
+        """Collects up to `n` point clouds into a single :obj:`PointCloudBatch<pymmWave.data_model.PointCloudBatch>`.
+        Point clouds which are already buffered are taken in one step, which is cheaper than calling :obj:`get_data` for each. Only useful with a delivery policy buffering more than one point cloud, see :obj:`configure_delivery`.
+
+        Args:
+            n (int): Largest number of point clouds to collect.
+            timeout (Optional[float], optional): Seconds to wait at most, None waits for `n` point clouds. Defaults to None.
+
+        Returns:
+            PointCloudBatch: The collected point clouds, possibly none.
+        """
+        consumer = self._get_consumer()
+        clouds = consumer.get_many(n)
+        deadline = None if timeout is None else monotonic() + timeout
+        while len(clouds) < n:
+            remaining = None if deadline is None else deadline - monotonic()
+            if remaining is not None and remaining <= 0:
+                break
+            try:
+                clouds.append(await wait_for(consumer.get(), remaining))
+            except AsyncTimeoutError:
+                break
+            clouds += consumer.get_many(n - len(clouds))
+
+        if clouds:
+            self._update_freq(len(clouds))
+            if self._instr is not None:
+                self._record_pickup(clouds[-1])
+
+        return PointCloudBatch.from_clouds(clouds)
 
     def stop_sensor(self):
         """This function attempts to close all serial ports and update internal state booleans.
@@ -483,6 +952,222 @@ class IWR6843AOP(Sensor):
         except SerialException:
             pass
         self._update_alive()
+        self.stop_recording()
+
+    def configure_delivery(self, policy: DeliveryPolicy=DeliveryPolicy.LATEST, capacity: int=1) -> bool:
+        """Selects how point clouds are buffered for consumers. Must be called before the sensor is started, existing subscriptions are discarded.
+
+        * DeliveryPolicy.LATEST keeps only the newest point cloud, this is the default.
+        * DeliveryPolicy.RING keeps the newest `capacity` point clouds, dropping older ones. Drops are counted per subscription.
+        * DeliveryPolicy.BLOCKING keeps up to `capacity` point clouds, then stops reading from the device until the slowest consumer catches up.
+          With a decode process (:obj:`configure_process_decode`) the worker stops decoding as well, so no frame is overwritten in its shared memory ring.
+          In every mode, frames are only lost if the device outruns the buffering of the data port while reading is stopped.
+
+        Args:
+            policy (DeliveryPolicy, optional): Buffering policy. Defaults to DeliveryPolicy.LATEST.
+            capacity (int, optional): Number of point clouds buffered, ignored for DeliveryPolicy.LATEST. Defaults to 1.
+
+        Returns:
+            bool: success
+        """
+        self._active_data = FrameRing(policy, capacity)
+        self._active_data.track_publish_time(self._instr is not None)
+        self._reset_consumer()
+        self._backlog.clear()
+
+        return True
+
+    def subscribe(self) -> Subscription[DopplerPointCloud]:
+        """Adds an independent consumer of this sensor's point clouds, in addition to :obj:`get_data`.
+        Each subscription has its own cursor, so several consumers (e.g. a tracker and a recorder) can read the same stream without taking frames from one another.
+
+        Returns:
+            Subscription[DopplerPointCloud]: Read with `await sub.get()` or `sub.get_nowait()`. Close it when done, as under DeliveryPolicy.BLOCKING it holds the sensor back.
+
+        Example:
+            >>> recorder_feed = sensor.subscribe()
+            >>> cloud = await recorder_feed.get()
+        """
+        return self._active_data.subscribe()
+
+    def start_recording(self, path: str, max_pending: int=64 << 20) -> bool:
+        """Records the raw data port byte stream to `path`, and an index of every frame with its host timestamp to `path + '.idx'`.
+        Writing happens on a background thread, the event loop never waits on the disk. If the disk cannot keep up, data is dropped from the recording rather than from acquisition.
+        Recording taps the bytes in this process, so it is unavailable with :obj:`configure_process_decode`.
+
+        Args:
+            path (str): Capture file path, truncated if it exists.
+            max_pending (int, optional): Largest number of bytes buffered for the disk. Defaults to 64 MiB.
+
+        Returns:
+            bool: success
+
+        Example:
+            >>> sensor.start_recording('session.bin')
+            True
+        """
+        if self._process_decode is not None:
+            self.error("Recording is not supported with process decoding.")
+            return False
+
+        self.stop_recording()
+        try:
+            self._recorder = CaptureWriter(path, max_pending)
+        except OSError as e:
+            self.error(e)
+            return False
+
+        return True
+
+    def stop_recording(self) -> bool:
+        """Stops recording, once everything received so far is on disk.
+
+        Returns:
+            bool: True if a recording was stopped and written out without errors.
+        """
+        recorder, self._recorder = self._recorder, None
+        if recorder is None:
+            return False
+
+        try:
+            recorder.close()
+        except Exception as e:
+            self.error(e)
+            return False
+        if recorder.bytes_dropped:
+            self.error(f"Recording {recorder.path} dropped {recorder.bytes_dropped} bytes.")
+
+        return True
+
+    def configure_instrumentation(self, enabled: bool=True) -> bool:
+        """Turns per-stage latency histograms and counters on or off. Enabling resets them.
+        When off, which is the default, the pipeline does no timing work at all.
+
+        Stages decoded in a worker process (see :obj:`configure_process_decode`) are not recorded, only the queue and end to end latency are.
+
+        Args:
+            enabled (bool, optional): Collect instrumentation. Defaults to True.
+
+        Returns:
+            bool: success
+        """
+        self._instr = PipelineInstrumentation() if enabled else None
+        self._active_data.track_publish_time(enabled)
+
+        return True
+
+    def get_instrumentation(self) -> Optional[InstrumentationSnapshot]:
+        """Snapshot of the per-stage latency histograms and counters.
+
+        Returns:
+            Optional[InstrumentationSnapshot]: The snapshot, None if instrumentation is off.
+
+        Example:
+            >>> sensor.configure_instrumentation()
+            >>> print(sensor.get_instrumentation())
+        """
+        if self._instr is None:
+            return None
+
+        snap = self._instr.snapshot()
+        snap.counters['corrupt_headers'] = self._sync.corrupt_headers
+        snap.counters['truncated_frames'] = self._sync.truncated_frames
+        snap.counters['malformed_frames'] = self._sync.malformed_frames
+        snap.counters['bytes_discarded'] = self._sync.bytes_discarded
+        return snap
+
+    def configure_reader_thread(self, enabled: bool=True) -> bool:
+        """Selects whether :obj:`start_sensor` reads and decodes on a dedicated thread rather than on the event loop.
+        This is useful when the event loop is busy with other work. :obj:`get_data` and :obj:`get_data_nowait` behave the same either way.
+        Takes effect the next time the sensor is started.
+
+        Args:
+            enabled (bool, optional): Use a reader thread. Defaults to True.
+
+        Returns:
+            bool: success
+        """
+        self._use_reader_thread = enabled
+
+        return True
+
+    def configure_process_decode(self, enabled: bool=True, slots: int=64, max_points: int=1024) -> bool:
+        """Selects whether :obj:`start_sensor` runs framing and decoding in a separate worker process.
+        The worker opens the data port itself and publishes point clouds into a shared memory ring, from which this process copies them as they are published.
+        This lets rigs with many sensors spread decoding across cores. Requires an OS which allows the data port to be opened twice, e.g. Linux or MacOS.
+
+        If this process falls behind by more than `slots` frames, the worker overwrites the oldest ones, counted as evicted. Under DeliveryPolicy.BLOCKING it waits instead,
+        so delivery stays lossless up to the buffering of the data port itself.
+        Takes effect the next time the sensor is started.
+
+        Args:
+            enabled (bool, optional): Use a decode process. Defaults to True.
+            slots (int, optional): Number of point clouds held by the ring. Defaults to 64.
+            max_points (int, optional): Largest point cloud held by the ring, extra points are dropped. Defaults to 1024.
+
+        Returns:
+            bool: success
+        """
+        if enabled and self._recorder is not None:
+            self.error("Process decoding is not supported while recording.")
+            return False
+
+        self._process_decode = {'slots': slots, 'max_points': max_points} if enabled else None
+
+        return True
+
+    def configure_dtype(self, dtype: Union[np.dtype, Any]=np.float32) -> bool:
+        """Sets the data type of decoded point clouds. The device sends float32 values, which are kept as they are by default.
+        float64 doubles the memory of every cloud, and of everything which holds on to clouds, so it is only worth it for consumers which need it.
+        Takes effect for frames decoded from now on, or the next time the sensor is started when decoding in a separate process.
+
+        Args:
+            dtype (Union[np.dtype, Any], optional): np.float32 or np.float64. Defaults to np.float32.
+
+        Returns:
+            bool: success
+        """
+        dtype = np.dtype(dtype)
+        if dtype not in (np.float32, np.float64):
+            self.error(f"Unsupported point cloud data type {dtype}.")
+            return False
+
+        self._dtype = dtype
+        if self._pool is not None and self._pool.dtype != dtype:
+            self._pool = ArrayPool(self._pool.max_points, self._pool.buffers, dtype)
+
+        return True
+
+    def configure_buffer_pool(self, enabled: bool=True, max_points: int=1024, buffers: int=64) -> bool:
+        """Selects whether point clouds are decoded into recycled buffers from an :obj:`ArrayPool<pymmWave.pool.ArrayPool>`, instead of freshly allocated arrays.
+        This avoids allocating for every frame, which matters with several sensors on small devices.
+
+        Consumers hand buffers back with :obj:`DopplerPointCloud.release<pymmWave.data_model.DopplerPointCloud.release>`, or by using the point cloud as a context manager.
+        Point clouds which are not released are garbage collected as usual, and the pool allocates replacements. Point clouds larger than `max_points` are allocated normally.
+        When decoding in a separate process, point clouds are copied out of its shared memory ring into these buffers.
+
+        A point cloud must only be released once every consumer is done with it, including every :obj:`subscribe` subscription which may still read it.
+
+        Args:
+            enabled (bool, optional): Use a buffer pool. Defaults to True.
+            max_points (int, optional): Capacity of a buffer, should cover the largest frame configured on the device. Defaults to 1024.
+            buffers (int, optional): Number of preallocated buffers, should cover every point cloud held by consumers at once, plus the delivery buffer. Defaults to 64.
+
+        Returns:
+            bool: success
+        """
+        if not enabled:
+            self._pool = None
+            return True
+        if max_points <= 0 or buffers <= 0:
+            self.error("Buffer pool sizes must be positive.")
+            return False
+
+        self._pool = ArrayPool(max_points, buffers, self._dtype)
+        self._magnitude = np.empty(max_points, dtype=np.float32)
+        self._valid = np.empty(max_points, dtype=bool)
+
+        return True
 
     def configure_filtering(self, doppler_filtering: float=0) -> bool:
         """Sets basic doppler filtering to allow for static noise removal.
@@ -500,14 +1185,75 @@ class IWR6843AOP(Sensor):
 
     def get_update_freq(self) -> float:
         """Returns the frequency that the sensor is returning data at. This is not equivalent to the true capacity of the sensor, but rather the rate which the application is successfully getting data.
+        Measured over the statistics window, see :obj:`get_statistics`.
 
         Returns:
             float: Hz
         """
-        return self._freq
+        return self._stats.delivered_rate()
+
+    def get_statistics(self) -> SensorStatistics:
+        """Throughput and frame loss since the sensor object was created, with rates over a sliding window.
+        Drops are split into frames evicted by the delivery policy before :obj:`get_data` read them, frames which failed to decode, and gaps in the device frame counter.
+        Only drops affecting :obj:`get_data` are counted as evicted, subscriptions count their own in `Subscription.dropped`.
+
+        Returns:
+            SensorStatistics: Current statistics.
+
+        Example:
+            >>> stats = sensor.get_statistics()
+            >>> if stats.drop_rate > .01 or (stats.link_utilisation or 0) > .9:
+            ...     alert(stats)
+        """
+        baud_rate = self._ser_data.baudrate if self._ser_data is not None else self._data_baud
+        return self._stats.snapshot(baud_rate, self._consumer.dropped if self._consumer is not None else 0)
+
+    def transfer_delay_ns(self, metadata: FrameMetadata) -> int:
+        """Time the frame took to cross the data port at its baud rate, from the packet length. Subtracting it from the host timestamp
+        estimates when the device started sending the frame, which removes the bias between sensors running at different baud rates or frame sizes.
+
+        Args:
+            metadata (FrameMetadata): Frame information of a point cloud from this sensor.
+
+        Returns:
+            int: Nanoseconds, 0 if the packet length or baud rate is unknown.
+        """
+        baud_rate = self._ser_data.baudrate if self._ser_data is not None else self._data_baud
+        return transfer_time_ns(metadata.packet_len, baud_rate)
+
+    def configure_statistics(self, window_s: float=5.0) -> bool:
+        """Restarts statistics collection, measuring rates over a new window length.
+
+        Args:
+            window_s (float, optional): Window length in seconds. Defaults to 5.0.
+
+        Returns:
+            bool: success
+        """
+        self._stats = PipelineStatistics(window_s)
+
+        return True
 
     def __eq__(self, o: object) -> bool:
         return False
 
     def __repr__(self) -> str:
-        return f"{self.model()} is alive: {self._is_alive} at {self._freq}Hz."
\ No newline at end of file
+        return f"{self.model()} is alive: {self._is_alive} at {self.get_update_freq()}Hz."
+
+
+async def send_configs(sensors: Sequence[IWR6843AOP], config: list[str], max_retries: int=1) -> list[bool]:
+    """Configures several sensors concurrently with :obj:`send_config_async<pymmWave.IWR6843AOP.IWR6843AOP.send_config_async>`, so bringing up a rig takes as long as its slowest board.
+
+    Args:
+        sensors (Sequence[IWR6843AOP]): Connected sensors.
+        config (list[str]): List of strings making up the config, sent to every sensor.
+        max_retries (int, optional): Number of times to retry on failure. Defaults to 1.
+
+    Returns:
+        list[bool]: If sending was successful, per sensor.
+
+    Example:
+        >>> await send_configs(sensors, EXAMPLE_CONFIG)
+        [True, True, True]
+    """
+    return list(await gather(*(sensor.send_config_async(config, max_retries) for sensor in sensors)))
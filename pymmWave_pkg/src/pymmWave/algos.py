@@ -1,9 +1,8 @@
 from abc import ABC, abstractmethod
 from typing import Any, Optional
 import numpy as np
-from .data_model import DopplerPointCloud, ImuVelocityData, Pose
+from .data_model import DopplerPointCloud, ImuVelocityData, PointCloudBatch, Pose
 from time import time as t
-from collections import deque
 from scipy.spatial.transform.rotation import Rotation
 from math import atan, cos, sin
 from .logging import Logger, StdOutLogger
@@ -78,6 +77,23 @@ class SimpleMeanDistance(Algorithm):
 
         return mean_val
 
+    def run_batch(self, input: PointCloudBatch) -> np.ndarray:
+        """Computes the mean of every frame of a batch in one vectorized pass. Stateless.
+
+        Args:
+            input (PointCloudBatch): Input frames, ignores doppler data.
+
+        Returns:
+            np.ndarray: One mean per frame, 0 for frames without points.
+        """
+        inp = input.get()
+        sizes = input.sizes()
+        norms = np.sqrt(np.square(inp[:,:-1]).sum(axis=1))
+        frame_ids = np.repeat(np.arange(len(sizes)), sizes)
+        sums = np.bincount(frame_ids, weights=norms, minlength=len(sizes))
+
+        return np.divide(sums, sizes, out=np.zeros(len(sizes)), where=sizes > 0)
+
     def reset(self) -> None:
         """Reset the state of an algorithm.
         """
@@ -96,12 +112,13 @@ class IMUAdjustedPersistedData(Algorithm):
         assert steps_to_persist >= 0, "Cannot persist less than 0 states."
         self._steps: int = steps_to_persist
 
-        self._pts: deque[DopplerPointCloud] = deque()
+        # Persisted clouds, oldest first, in one batch so they are moved with a single vectorized transform
+        self._pts: PointCloudBatch = PointCloudBatch.from_clouds([])
 
     def reset(self) -> None:
         """Reset the state of this algorithm, reset the state of memory, and reset the time it was last called.
         """
-        self._pts = deque()
+        self._pts = PointCloudBatch.from_clouds([])
         self._last_called = t()
 
     def change_persisted_steps(self, new_steps: int) -> bool:
@@ -114,8 +131,8 @@ class IMUAdjustedPersistedData(Algorithm):
             bool: Boolean representing success
         """
         if new_steps < 0: return False
-        while len(self._pts) > new_steps:
-            self._pts.popleft()
+        self._pts.discard(len(self._pts) - new_steps)
+        self._steps = new_steps
 
         return True
 
@@ -136,15 +153,14 @@ class IMUAdjustedPersistedData(Algorithm):
 
         # Simple state estimation based on imu
         meters: tuple[float, float, float] = (mv[0]*t_delta, mv[1]*t_delta, mv[2]*t_delta)
-        rot: Rotation = Rotation.from_euler('zyx', [x*t_delta for x in imu_in.get_dyawdpitchdroll()]) # type: ignore
-        ret = DopplerPointCloud(input_cloud.get().copy())
-        for i in self._pts:
-            i.translate_rotate(meters, rot)
-            ret.append(i)
-        
+        rot: Rotation = Rotation.from_euler('zyx', [x*t_delta for x in imu_in.get_drolldpitchdyaw()]) # type: ignore
+        self._pts.translate_rotate(meters, rot)
+        ret = DopplerPointCloud(np.concatenate((input_cloud.get(), self._pts.get())))
+
         if len(self._pts) > self._steps:
-            self._pts.popleft()
+            self._pts.discard(1)
 
+        # Copied, so the caller's cloud is never moved
         self._pts.append(input_cloud)
 
         return ret
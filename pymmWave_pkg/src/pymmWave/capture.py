@@ -0,0 +1,180 @@
+from queue import Empty, SimpleQueue
+from threading import Lock, Thread
+from typing import Any, BinaryIO, Optional
+
+import numpy as np
+
+from .framing import FrameSynchronizer, parse_header
+
+# One record per frame in a capture index. `offset` and `length` locate the frame in the capture file,
+#   `host_ns` is the time.monotonic_ns() at which the read completing the frame returned.
+CAPTURE_INDEX_DTYPE = np.dtype([('frame_number', '<u4'), ('length', '<u4'), ('offset', '<u8'), ('host_ns', '<i8')])
+
+# Suffix of the index file written next to a capture.
+INDEX_SUFFIX: str = '.idx'
+
+
+def index_path(capture_path: str) -> str:
+    """Path of the sidecar index of a capture file.
+    """
+    return capture_path + INDEX_SUFFIX
+
+
+def load_index(capture_path: str) -> np.ndarray:
+    """Loads the sidecar index of a capture without reading the capture itself.
+
+    Args:
+        capture_path (str): Path of the capture file, not of the index.
+
+    Returns:
+        np.ndarray: Structured array of CAPTURE_INDEX_DTYPE, in stream order.
+
+    Raises:
+        FileNotFoundError: If the capture has no index.
+    """
+    return np.fromfile(index_path(capture_path), dtype=CAPTURE_INDEX_DTYPE)
+
+
+class CaptureWriter(object):
+    """Records a raw data port byte stream to a file, with a sidecar index of every frame in it.
+
+    The capture file holds the bytes exactly as received, so it includes TLVs this library does not decode and can be read by any TI tooling.
+    :obj:`write` only queues the bytes, a background thread does all file I/O and indexing, so the caller never blocks on the disk.
+    If the disk falls more than `max_pending` bytes behind, further data is dropped and counted in :obj:`bytes_dropped` rather than buffered without bound.
+
+    Example:
+        >>> with CaptureWriter('session.bin') as capture:
+        ...     capture.write(ser.read(4096), time.monotonic_ns())
+    """
+    def __init__(self, path: str, max_pending: int=64 << 20):
+        """Create the capture and index files, truncating existing ones, and start the writer thread.
+
+        Args:
+            path (str): Capture file path. The index is written to `path + '.idx'`.
+            max_pending (int, optional): Largest number of bytes queued for the writer thread. Defaults to 64 MiB.
+        """
+        self.path = path
+        self._max_pending = max_pending
+        self._pending: int = 0
+        self._lock = Lock()
+        self._queue: SimpleQueue[Optional[tuple[bytes, int]]] = SimpleQueue()
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self.bytes_written: int = 0
+        self.bytes_dropped: int = 0
+        self.frames_indexed: int = 0
+
+        self._data: BinaryIO = open(path, 'wb', buffering=1 << 20)
+        self._index: BinaryIO = open(index_path(path), 'wb')
+        self._thread = Thread(target=self._run, name=f"capture-{path}", daemon=True)
+        self._thread.start()
+
+    def write(self, data: bytes, timestamp_ns: int) -> bool:
+        """Queue received bytes for writing. Never blocks on I/O. Thread safe.
+
+        Args:
+            data (bytes): Bytes as read from the data port.
+            timestamp_ns (int): Host time.monotonic_ns() at which they were received.
+
+        Returns:
+            bool: False if the bytes were dropped, because the writer is too far behind, failed, or was closed.
+        """
+        with self._lock:
+            if self._closed or self._error is not None or self._pending + len(data) > self._max_pending:
+                self.bytes_dropped += len(data)
+                return False
+            self._pending += len(data)
+        self._queue.put((data, timestamp_ns))
+
+        return True
+
+    def _run(self) -> None:
+        sync = FrameSynchronizer()
+        record = np.zeros(1, dtype=CAPTURE_INDEX_DTYPE)
+        try:
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except Empty:
+                    # Idle, so push what we have to the OS before waiting
+                    self._data.flush()
+                    self._index.flush()
+                    item = self._queue.get()
+                if item is None:
+                    return
+
+                data, timestamp_ns = item
+                self._data.write(data)
+                self.bytes_written += len(data)
+                with self._lock:
+                    self._pending -= len(data)
+
+                sync.feed(data)
+                for frame in sync.frames():
+                    record['frame_number'] = parse_header(frame).frame_number
+                    record['length'] = len(frame)
+                    record['offset'] = sync.frame_offset
+                    record['host_ns'] = timestamp_ns
+                    self._index.write(record.tobytes())
+                    self.frames_indexed += 1
+        except BaseException as e:
+            self._error = e
+        finally:
+            self._data.close()
+            self._index.close()
+
+    def close(self, timeout: Optional[float]=None) -> None:
+        """Write out everything queued so far and close the files. Further writes are dropped.
+
+        Args:
+            timeout (Optional[float], optional): Seconds to wait for the writer thread, None waits until done. Defaults to None.
+
+        Raises:
+            Exception: Any error the writer thread hit, e.g. the disk filling up.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self) -> 'CaptureWriter':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+
+def build_index(capture_path: str, chunk_size: int=1 << 20) -> np.ndarray:
+    """Scans a capture for frames, for captures whose index was lost or never written. Host timestamps are unknown and set to 0.
+    The capture is read in chunks, never as a whole.
+
+    Args:
+        capture_path (str): Path of the capture file.
+        chunk_size (int, optional): Bytes read at a time. Defaults to 1 MiB.
+
+    Returns:
+        np.ndarray: Structured array of CAPTURE_INDEX_DTYPE, in stream order.
+    """
+    sync = FrameSynchronizer()
+    records: list[tuple[int, int, int, int]] = []
+    with open(capture_path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            sync.feed(chunk)
+            for frame in sync.frames():
+                records.append((parse_header(frame).frame_number, len(frame), sync.frame_offset, 0))
+
+    return np.array(records, dtype=CAPTURE_INDEX_DTYPE)
+
+
+def write_index(capture_path: str, index: np.ndarray) -> None:
+    """Writes the sidecar index of a capture, e.g. one produced by :obj:`build_index`.
+    """
+    np.asarray(index, dtype=CAPTURE_INDEX_DTYPE).tofile(index_path(capture_path))
@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, NamedTuple, Optional, Sequence, Union
 import numpy as np
 from scipy.spatial.transform.rotation import Rotation
 
+from .pool import ArrayPool
+from .transform import RigidTransform
+
 class DataModel(ABC):
     """
     Base Data Class
@@ -14,19 +17,40 @@ class DataModel(ABC):
         """
         pass
 
+class FrameMetadata(NamedTuple):
+    """Compact per-frame record attached to point clouds decoded from a device.
+    """
+    # Frame counter reported by the device. Gaps indicate frames lost before decoding.
+    frame_number: int
+    # Device CPU cycle counter at the time the frame was created.
+    time_cpu_cycles: int
+    # Host time.monotonic_ns() at which the last byte of the frame was received.
+    host_timestamp_ns: int
+    # Types of every TLV in the frame, in order.
+    tlv_types: tuple[int, ...]
+    # Number of points reported by the device, before any filtering.
+    num_points: int
+    # Length of the frame on the wire in bytes, 0 if unknown.
+    packet_len: int = 0
+
 class DopplerPointCloud(DataModel):
     """Fairly lightweight class for X, Y, Z, and doppler data.
     """
-    def __init__(self, data: np.ndarray): 
+    def __init__(self, data: np.ndarray, metadata: Optional[FrameMetadata]=None, pool: Optional[ArrayPool]=None): 
         """Initialize a DopplerPointCloud object and verify the input shape is valid.
+        The data type is kept as given, clouds decoded from a device are float32 unless configured otherwise.
 
         Args:
             data (np.ndarray): Nx4 size numpy.ndarray.
+            metadata (Optional[FrameMetadata], optional): Frame information, if this cloud was decoded from a device. Defaults to None.
+            pool (Optional[ArrayPool], optional): Pool which `data` was acquired from, it is returned there by :obj:`release`. Defaults to None.
         """
         assert len(data.shape) == 2
         assert data.shape[1] == 4
 
         self._data: np.ndarray = data
+        self._metadata: Optional[FrameMetadata] = metadata
+        self._pool: Optional[ArrayPool] = pool
 
     def get(self) -> np.ndarray:
         """Gets the underlying data container.
@@ -36,21 +60,84 @@ class DopplerPointCloud(DataModel):
         """
         return self._data
 
+    def get_metadata(self) -> Optional[FrameMetadata]:
+        """Gets the frame information of this cloud.
+
+        Returns:
+            Optional[FrameMetadata]: Frame number and timestamps, None if the cloud was not decoded from a device.
+        """
+        return self._metadata
+
+    @property
+    def dtype(self) -> np.dtype:
+        """Data type of the points.
+        """
+        return self._data.dtype
+
+    def astype(self, dtype: Union[np.dtype, Any]) -> 'DopplerPointCloud':
+        """Gets this cloud with points of another data type, e.g. np.float64 for consumers which need double precision.
+
+        Args:
+            dtype (Union[np.dtype, Any]): Data type of the points.
+
+        Returns:
+            DopplerPointCloud: This cloud if it already has that type, otherwise a converted copy with the same frame information.
+        """
+        if self._data.dtype == dtype:
+            return self
+        return DopplerPointCloud(self._data.astype(dtype), self._metadata)
+
+    def release(self) -> None:
+        """Hands the points back to the buffer pool they came from, see :obj:`IWR6843AOP.configure_buffer_pool<pymmWave.IWR6843AOP.IWR6843AOP.configure_buffer_pool>`.
+        The cloud is empty afterwards, and arrays previously returned by :obj:`get` must no longer be used. Does nothing for clouds which are not pooled.
+
+        Example:
+            >>> with await sensor.get_data() as cloud:
+            ...     process(cloud.get())
+        """
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            data, self._data = self._data, self._data[:0].copy()
+            pool.release(data)
+
+    def __enter__(self) -> 'DopplerPointCloud':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.release()
+
     def translate_rotate(self, location: tuple[float, float, float], pitch_rads: Rotation):
         """Translates and rotates the underlying object. This is done in-place, no further verification is done.
+        The data type of the points is kept. Prefer :obj:`transform`, which also supports rotating before translating.
 
         Args:
             location (Tuple[float, float, float]): Tuple of float values to shift the underlying data with: (x meters, y meters, z meters)
             pitch_rads (Rotation): Rotation matrix object from scipy.spatial.transform.rotation.Rotation
         """
         if self._data.shape[0]:
-            self._data[:,0] += location[0]
-            self._data[:,1] += location[1]
-            self._data[:,2] += location[2]
-            self._data[:,:3] = pitch_rads.apply(self._data[:,:3])  #type: ignore
+            if len(pitch_rads.as_quat().reshape(-1, 4)) == 1:  #type: ignore
+                RigidTransform.from_translate_rotate(location, pitch_rads).apply(self._data)
+            else:
+                self._data[:,0] += location[0]
+                self._data[:,1] += location[1]
+                self._data[:,2] += location[2]
+                self._data[:,:3] = pitch_rads.apply(self._data[:,:3])  #type: ignore
+
+    def transform(self, transform: RigidTransform) -> 'DopplerPointCloud':
+        """Applies a rigid transform to the points in-place, in a single matrix product. Doppler is unchanged.
+
+        Args:
+            transform (RigidTransform): The transform, e.g. a sensor's extrinsics from :obj:`SpatialSensor<pymmWave.sensor.SpatialSensor>`.
+
+        Returns:
+            DopplerPointCloud: This cloud.
+        """
+        transform.apply(self._data)
+        return self
 
     def append(self, other: 'DopplerPointCloud') -> bool:
-        """Append another DopplerPointCloud object to this one in-place
+        """Append another DopplerPointCloud object to this one in-place.
+        This copies both clouds, use a :obj:`PointCloudBatch<pymmWave.data_model.PointCloudBatch>` to accumulate many clouds.
 
         Args:
             other (DopplerPointCloud): Another object of the same type
@@ -58,7 +145,7 @@ class DopplerPointCloud(DataModel):
         Returns:
             bool: If success, true.
         """
-        self._data = np.concatenate(self._data, other._data)
+        self._data = np.concatenate((self._data, other._data))
 
         return True
 
@@ -68,6 +155,239 @@ class DopplerPointCloud(DataModel):
     def __repr__(self) -> str:
         return self._data.__repr__()
 
+def _reserve(buffer: np.ndarray, used: int, needed: int) -> np.ndarray:
+    """Returns `buffer`, or a copy of its first `used` rows with room for at least `needed` rows. Capacity at least doubles on every growth.
+    """
+    if needed <= buffer.shape[0]:
+        return buffer
+    grown = np.empty((max(needed, 2 * buffer.shape[0], 16),) + buffer.shape[1:], dtype=buffer.dtype)
+    grown[:used] = buffer[:used]
+    return grown
+
+class PointCloudBatch(DataModel):
+    """Several point clouds stacked into one Mx4 array, with per-frame offsets (a ragged batch).
+    Frame `i` is rows `offsets[i]:offsets[i+1]`. This allows algorithms to process several frames in one vectorized call.
+
+    Every frame is also tagged with the source it came from, e.g. the index of a sensor in a multi-sensor rig, see :obj:`sources`.
+    A batch can be grown one cloud at a time with :obj:`append`. Storage grows geometrically, so accumulating k clouds copies each point
+    a constant number of times on average, instead of once per appended cloud as with :obj:`DopplerPointCloud.append<pymmWave.data_model.DopplerPointCloud.append>`.
+    """
+    def __init__(self, data: np.ndarray, offsets: np.ndarray, metadata: Optional[list[Optional[FrameMetadata]]]=None, sources: Optional[np.ndarray]=None):
+        """Initialize a batch from already stacked data.
+
+        Args:
+            data (np.ndarray): Mx4 size numpy.ndarray.
+            offsets (np.ndarray): Integer array of length (frames + 1), starting at 0 and ending at M.
+            metadata (Optional[list[Optional[FrameMetadata]]], optional): Per-frame information. Defaults to None.
+            sources (Optional[np.ndarray], optional): Integer source of every frame. Defaults to source 0 for every frame.
+        """
+        assert len(data.shape) == 2
+        assert data.shape[1] == 4
+        assert offsets[0] == 0 and offsets[-1] == data.shape[0]
+
+        # The arrays in use are views of the first rows of storage with spare capacity, which append() grows
+        self._data: np.ndarray = data
+        self._offsets: np.ndarray = np.asarray(offsets, dtype=np.int64)
+        self._sources: np.ndarray = np.zeros(len(offsets) - 1, dtype=np.int32) if sources is None else np.asarray(sources, dtype=np.int32)
+        assert self._sources.shape[0] == len(offsets) - 1
+        self._data_buffer: np.ndarray = self._data
+        self._offset_buffer: np.ndarray = self._offsets
+        self._source_buffer: np.ndarray = self._sources
+        self._metadata: list[Optional[FrameMetadata]] = metadata if metadata is not None else [None] * (len(offsets) - 1)
+
+    @classmethod
+    def from_clouds(cls, clouds: Sequence[DopplerPointCloud], sources: Optional[Sequence[int]]=None) -> 'PointCloudBatch':
+        """Stack point clouds into a batch with a single allocation.
+
+        Args:
+            clouds (Sequence[DopplerPointCloud]): Point clouds, in order.
+            sources (Optional[Sequence[int]], optional): Source of every cloud. Defaults to source 0 for every cloud.
+
+        Returns:
+            PointCloudBatch: The batch.
+        """
+        offsets = np.zeros(len(clouds) + 1, dtype=np.int64)
+        np.cumsum([c.get().shape[0] for c in clouds], out=offsets[1:])
+        if clouds:
+            data = np.concatenate([c.get() for c in clouds])
+        else:
+            data = np.empty((0, 4), dtype=np.float32)
+
+        return cls(data, offsets, [c.get_metadata() for c in clouds], None if sources is None else np.asarray(sources, dtype=np.int32))
+
+    @classmethod
+    def concat(cls, batches: Sequence['PointCloudBatch']) -> 'PointCloudBatch':
+        """Joins batches, in order, into a new batch with a single allocation. Frames keep their sources.
+
+        Args:
+            batches (Sequence[PointCloudBatch]): Batches to join.
+
+        Returns:
+            PointCloudBatch: The joined batch.
+        """
+        if not batches:
+            return cls.from_clouds([])
+
+        data = np.concatenate([b.get() for b in batches])
+        offsets = np.zeros(sum(len(b) for b in batches) + 1, dtype=np.int64)
+        frame = rows = 0
+        metadata: list[Optional[FrameMetadata]] = []
+        for b in batches:
+            offsets[frame + 1:frame + len(b) + 1] = b.offsets()[1:] + rows
+            frame += len(b)
+            rows += b.get().shape[0]
+            metadata += b.get_metadata()
+
+        return cls(data, offsets, metadata, np.concatenate([b.sources() for b in batches]))
+
+    def append(self, cloud: DopplerPointCloud, source: int=0) -> None:
+        """Copies a point cloud onto the end of the batch, in amortized constant time per point.
+        Points are converted to the data type of the batch, an empty batch takes the data type of the first cloud appended.
+        Arrays previously returned by :obj:`get` and the other getters do not see appended frames.
+
+        Args:
+            cloud (DopplerPointCloud): The cloud, with its frame information if it has any.
+            source (int, optional): Source of the cloud. Defaults to 0.
+        """
+        points = cloud.get()
+        frames = len(self)
+        rows = self._data.shape[0]
+        n = points.shape[0]
+        if not frames and not self._data_buffer.shape[0]:
+            self._data_buffer = np.empty((0, 4), dtype=points.dtype)
+
+        self._data_buffer = _reserve(self._data_buffer, rows, rows + n)
+        self._data_buffer[rows:rows + n] = points
+        self._offset_buffer = _reserve(self._offset_buffer, frames + 1, frames + 2)
+        self._offset_buffer[frames + 1] = rows + n
+        self._source_buffer = _reserve(self._source_buffer, frames, frames + 1)
+        self._source_buffer[frames] = source
+        self._metadata.append(cloud.get_metadata())
+        self._resize(frames + 1, rows + n)
+
+    def discard(self, n: int) -> None:
+        """Removes the oldest `n` frames, moving the remaining points to the front of the storage in place.
+        Arrays previously returned by :obj:`get` and :obj:`frame` must no longer be used.
+
+        Args:
+            n (int): Number of frames to remove, at most every frame is removed.
+        """
+        n = min(n, len(self))
+        if n <= 0:
+            return
+
+        start = int(self._offsets[n])
+        rows = self._data.shape[0] - start
+        frames = len(self) - n
+        self._data_buffer[:rows] = self._data_buffer[start:start + rows]
+        self._offset_buffer[:frames + 1] = self._offsets[n:] - start
+        self._source_buffer[:frames] = self._sources[n:]
+        del self._metadata[:n]
+        self._resize(frames, rows)
+
+    def _resize(self, frames: int, rows: int) -> None:
+        self._data = self._data_buffer[:rows]
+        self._offsets = self._offset_buffer[:frames + 1]
+        self._sources = self._source_buffer[:frames]
+
+    def translate_rotate(self, location: tuple[float, float, float], pitch_rads: Rotation):
+        """Translates and rotates every frame in-place, see :obj:`DopplerPointCloud.translate_rotate<pymmWave.data_model.DopplerPointCloud.translate_rotate>`.
+
+        Args:
+            location (Tuple[float, float, float]): Tuple of float values to shift the underlying data with: (x meters, y meters, z meters)
+            pitch_rads (Rotation): Rotation matrix object from scipy.spatial.transform.rotation.Rotation
+        """
+        DopplerPointCloud(self._data).translate_rotate(location, pitch_rads)
+
+    def transform(self, transform: RigidTransform) -> 'PointCloudBatch':
+        """Applies one rigid transform to every frame in-place, in a single matrix product.
+
+        Args:
+            transform (RigidTransform): The transform.
+
+        Returns:
+            PointCloudBatch: This batch.
+        """
+        transform.apply(self._data)
+        return self
+
+    def get(self) -> np.ndarray:
+        """Gets the stacked points of every frame.
+
+        Returns:
+            np.ndarray: Mx4 matrix.
+        """
+        return self._data
+
+    def offsets(self) -> np.ndarray:
+        """Gets the frame offsets.
+
+        Returns:
+            np.ndarray: Array of length (frames + 1).
+        """
+        return self._offsets
+
+    def sources(self) -> np.ndarray:
+        """Gets the source of every frame.
+
+        Returns:
+            np.ndarray: Integer array of length frames.
+        """
+        return self._sources
+
+    def get_metadata(self) -> list[Optional[FrameMetadata]]:
+        """Gets the frame information of every frame.
+
+        Returns:
+            list[Optional[FrameMetadata]]: One entry per frame.
+        """
+        return self._metadata
+
+    def sizes(self) -> np.ndarray:
+        """Gets the number of points in each frame.
+
+        Returns:
+            np.ndarray: Array of length frames.
+        """
+        return np.diff(self._offsets)
+
+    def frame(self, idx: int) -> DopplerPointCloud:
+        """Gets a single frame as a view into the batch.
+
+        Args:
+            idx (int): Frame index.
+
+        Returns:
+            DopplerPointCloud: Point cloud sharing memory with the batch.
+        """
+        return DopplerPointCloud(self._data[self._offsets[idx]:self._offsets[idx + 1]], self._metadata[idx])
+
+    def by_source(self, source: int) -> 'PointCloudBatch':
+        """Copies the frames of one source into a new batch.
+
+        Args:
+            source (int): The source.
+
+        Returns:
+            PointCloudBatch: The frames of that source, in order.
+        """
+        frames = np.flatnonzero(self._sources == source)
+        sizes = self.sizes()[frames]
+        offsets = np.zeros(len(frames) + 1, dtype=np.int64)
+        np.cumsum(sizes, out=offsets[1:])
+        rows = np.repeat(self._offsets[frames] - offsets[:-1], sizes) + np.arange(offsets[-1])
+
+        return PointCloudBatch(self._data[rows], offsets, [self._metadata[i] for i in frames], self._sources[frames])
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __eq__(self, o: object) -> bool:
+        return False
+
+    def __repr__(self) -> str:
+        return f"PointCloudBatch({len(self)} frames, {self._data.shape[0]} points)"
+
 class ImuVelocityData(DataModel):
     """Class to represent a velocity data point from the IMU.
 
@@ -0,0 +1,185 @@
+from asyncio import Future, get_running_loop
+from enum import Enum
+from time import monotonic_ns
+from typing import Callable, Generic, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+class DeliveryPolicy(Enum):
+    """How a :obj:`FrameRing<pymmWave.delivery.FrameRing>` behaves when a subscriber falls behind.
+    """
+    # Only the newest frame is kept. Equivalent to a Queue(1) where the old frame is evicted.
+    LATEST = 1
+    # The newest `capacity` frames are kept, older frames are dropped and counted per subscriber.
+    RING = 2
+    # The newest `capacity` frames are kept, and the producer is refused new frames until the slowest subscriber catches up.
+    BLOCKING = 3
+
+
+class Subscription(Generic[T]):
+    """An independent read cursor on a :obj:`FrameRing<pymmWave.delivery.FrameRing>`.
+    Every subscription sees every frame published after it was created, unless it falls behind and the ring drops frames for it.
+    """
+    def __init__(self, ring: 'FrameRing[T]', cursor: int):
+        self._ring = ring
+        self._cursor = cursor
+        self._waiter: Optional[Future[None]] = None
+        self.dropped: int = 0
+        # Publication time of the last frame read, only tracked if the ring records publication times
+        self.last_published_ns: int = 0
+
+    def pending(self) -> int:
+        """Number of frames ready to be read.
+        """
+        return self._ring._head - self._cursor
+
+    def full(self) -> bool:
+        """True if the next published frame will evict or block on this subscription.
+        """
+        return self.pending() >= self._ring.capacity
+
+    def get_nowait(self) -> Optional[T]:
+        """Returns the oldest unread frame, or None if there is none.
+        """
+        if self._cursor >= self._ring._head:
+            return None
+        item = self._ring._slots[self._cursor % self._ring.capacity]
+        if self._ring._published_ns is not None:
+            self.last_published_ns = self._ring._published_ns[self._cursor % self._ring.capacity]
+        self._cursor += 1
+        self._ring._consumed()
+        return item
+
+    def get_many(self, n: int) -> list[T]:
+        """Returns up to `n` of the oldest unread frames, without waiting.
+        """
+        ring = self._ring
+        count = min(n, ring._head - self._cursor)
+        items = [ring._slots[(self._cursor + i) % ring.capacity] for i in range(count)]
+        if count and ring._published_ns is not None:
+            self.last_published_ns = ring._published_ns[(self._cursor + count - 1) % ring.capacity]
+        self._cursor += count
+        if count:
+            ring._consumed()
+        return items  # type: ignore
+
+    async def get(self) -> T:
+        """Waits for and returns the oldest unread frame.
+        """
+        while self._cursor >= self._ring._head:
+            self._waiter = get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        return self.get_nowait()  # type: ignore
+
+    def close(self) -> None:
+        """Stop receiving frames. A closed subscription never blocks the producer.
+        """
+        self._ring.unsubscribe(self)
+
+    def _wake(self) -> None:
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+
+class FrameRing(Generic[T]):
+    """Preallocated ring of frames shared by any number of subscribers, each with its own cursor.
+
+    Publishing is a slot assignment plus a cursor check per subscriber, there is no per frame queue operation.
+    All methods must be called from the event loop thread.
+    """
+    def __init__(self, policy: DeliveryPolicy=DeliveryPolicy.LATEST, capacity: int=1):
+        """Create the ring.
+
+        Args:
+            policy (DeliveryPolicy, optional): Behavior when a subscriber falls behind. Defaults to DeliveryPolicy.LATEST.
+            capacity (int, optional): Number of frames held. Forced to 1 for DeliveryPolicy.LATEST. Defaults to 1.
+        """
+        if policy == DeliveryPolicy.LATEST:
+            capacity = 1
+        assert capacity > 0, "Capacity must be positive."
+        self.policy = policy
+        self.capacity = capacity
+        self._slots: list[Optional[T]] = [None] * capacity
+        # Sequence number of the next frame to be written
+        self._head: int = 0
+        self._subscribers: list[Subscription[T]] = []
+        self._writable_callbacks: list[Callable[[], None]] = []
+        self._published_ns: Optional[list[int]] = None
+        self.published: int = 0
+
+    def track_publish_time(self, enabled: bool=True) -> None:
+        """Record the time.monotonic_ns() at which each frame is published, readable from :obj:`Subscription.last_published_ns` on retrieval.
+        """
+        self._published_ns = [0] * self.capacity if enabled else None
+
+    @property
+    def dropped(self) -> int:
+        """Total frames dropped across current subscribers.
+        """
+        return sum(sub.dropped for sub in self._subscribers)
+
+    def subscribe(self) -> Subscription[T]:
+        """Add a subscriber which receives every frame published from now on.
+        """
+        sub: Subscription[T] = Subscription(self, self._head)
+        self._subscribers.append(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription[T]) -> None:
+        if sub in self._subscribers:
+            self._subscribers.remove(sub)
+            self._consumed()
+
+    def writable(self) -> bool:
+        """Whether :obj:`put` will accept a frame. Always True unless the policy is DeliveryPolicy.BLOCKING.
+        """
+        if self.policy != DeliveryPolicy.BLOCKING:
+            return True
+        return all(sub._cursor > self._head - self.capacity for sub in self._subscribers)
+
+    def put(self, item: T) -> bool:
+        """Publish a frame to every subscriber.
+
+        Args:
+            item (T): The frame.
+
+        Returns:
+            bool: False if the frame was refused because a subscriber is full under DeliveryPolicy.BLOCKING.
+        """
+        if not self.writable():
+            return False
+
+        oldest = self._head - self.capacity + 1
+        for sub in self._subscribers:
+            if sub._cursor < oldest:
+                sub.dropped += oldest - sub._cursor
+                sub._cursor = oldest
+
+        self._slots[self._head % self.capacity] = item
+        if self._published_ns is not None:
+            self._published_ns[self._head % self.capacity] = monotonic_ns()
+        self._head += 1
+        self.published += 1
+        for sub in self._subscribers:
+            sub._wake()
+
+        return True
+
+    def add_writable_callback(self, callback: Callable[[], None]) -> None:
+        """Call `callback` once, as soon as the ring becomes writable again.
+        """
+        if self.writable():
+            callback()
+        else:
+            self._writable_callbacks.append(callback)
+
+    def _consumed(self) -> None:
+        if self._writable_callbacks and self.writable():
+            callbacks = self._writable_callbacks
+            self._writable_callbacks = []
+            for callback in callbacks:
+                callback()
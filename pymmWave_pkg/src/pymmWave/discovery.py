@@ -0,0 +1,151 @@
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from time import monotonic
+from typing import Callable, NamedTuple, Optional, Sequence
+
+from serial import Serial  # type: ignore
+from serial.serialutil import SerialException
+from serial.tools.list_ports import comports  # type: ignore
+
+from .constants import CLI_DONE, CLI_PROMPT, MAGIC_NUMBER
+
+# Harmless command sent to find the CLI port, answered by every version of the out of box demo.
+PROBE_COMMAND: bytes = b'version\n'
+
+# Any of these in the reply to PROBE_COMMAND marks a CLI port.
+CLI_REPLIES: tuple[bytes, ...] = (CLI_PROMPT.encode(), CLI_DONE.encode(), b'Error')
+
+
+class PortRole(Enum):
+    """What a probed serial port turned out to be.
+    """
+    CONFIG = 0
+    DATA = 1
+    # Did not answer the CLI probe and sent no frames. A board which is not streaming has a silent data port.
+    SILENT = 2
+    # Could not be opened, usually because it is in use or missing permissions.
+    UNAVAILABLE = 3
+
+
+class PortProbe(NamedTuple):
+    """Result of probing one serial port.
+    """
+    device: str
+    role: PortRole
+    # USB serial number of the adapter, shared by the CLI and data port of a board. None for ports which are not USB.
+    serial_number: Optional[str] = None
+
+
+class Board(NamedTuple):
+    """A board found by :obj:`discover`, with the ports to pass to connect_config and connect_data.
+    """
+    config_port: str
+    data_port: str
+    serial_number: Optional[str] = None
+
+
+def _read_until(ser: Serial, deadline: float, found: Callable[[bytes], bool]) -> bool:
+    received = b''
+    while monotonic() < deadline:
+        chunk = ser.read(max(1, ser.in_waiting))
+        if chunk:
+            # Only the tail can complete a match split across reads
+            received = received[-64:] + chunk
+            if found(received):
+                return True
+    return False
+
+
+def probe_port(device: str, serial_number: Optional[str]=None, config_baud: int=115200, data_baud: int=921600, timeout: float=.5) -> PortProbe:
+    """Identifies a port by listening for the frame magic number at the data baud rate, then sending PROBE_COMMAND at the config baud rate.
+    Takes up to twice `timeout`, and returns early once the port is identified.
+
+    Args:
+        device (str): Port name.
+        serial_number (Optional[str], optional): USB serial number to report. Defaults to None.
+        config_baud (int, optional): Baud rate of the CLI port. Defaults to 115200.
+        data_baud (int, optional): Baud rate of the data port. Defaults to 921600.
+        timeout (float, optional): Seconds to wait for frames, and again for a CLI reply. Should cover a few frame periods. Defaults to .5.
+
+    Returns:
+        PortProbe: The role of the port.
+    """
+    try:
+        with Serial(device, data_baud, timeout=.05) as ser:
+            ser.reset_input_buffer()
+            if _read_until(ser, monotonic() + timeout, lambda b: MAGIC_NUMBER in b):
+                return PortProbe(device, PortRole.DATA, serial_number)
+
+            ser.baudrate = config_baud
+            ser.reset_input_buffer()
+            ser.write(PROBE_COMMAND)
+            if _read_until(ser, monotonic() + timeout, lambda b: any(r in b for r in CLI_REPLIES)):
+                return PortProbe(device, PortRole.CONFIG, serial_number)
+    except (SerialException, OSError, ValueError):
+        return PortProbe(device, PortRole.UNAVAILABLE, serial_number)
+
+    return PortProbe(device, PortRole.SILENT, serial_number)
+
+
+def pair_ports(probes: Sequence[PortProbe]) -> list[Board]:
+    """Pairs probed ports into boards. The two ports of a board share a USB serial number, and a silent port is taken as the data port
+    of the CLI port it shares a serial number with. Ports without a serial number are only paired if there is exactly one CLI and one data port among them.
+
+    Args:
+        probes (Sequence[PortProbe]): Results of :obj:`probe_port`.
+
+    Returns:
+        list[Board]: Boards with exactly one CLI port and one data port, in order of their CLI port.
+    """
+    groups: dict[Optional[str], list[PortProbe]] = {}
+    for probe in probes:
+        groups.setdefault(probe.serial_number, []).append(probe)
+
+    boards = []
+    for serial_number, group in groups.items():
+        config = [p.device for p in group if p.role == PortRole.CONFIG]
+        data = [p.device for p in group if p.role == PortRole.DATA]
+        if serial_number is not None and not data:
+            data = [p.device for p in group if p.role == PortRole.SILENT]
+        if len(config) == 1 and len(data) == 1:
+            boards.append(Board(config[0], data[0], serial_number))
+
+    return sorted(boards)
+
+
+def discover(ports: Optional[Sequence[str]]=None, config_baud: int=115200, data_baud: int=921600, timeout: float=.5,
+             workers: Optional[int]=None) -> list[Board]:
+    """Finds connected boards by probing serial ports concurrently, see :obj:`probe_port` and :obj:`pair_ports`.
+    Every port is probed at the same time, so finding any number of boards takes about as long as probing one.
+
+    Ports should not be in use by another program while they are probed. A streaming board is found through its data port,
+    otherwise a data port is only identified by sharing a USB serial number with a CLI port.
+
+    Args:
+        ports (Optional[Sequence[str]], optional): Port names to probe. Defaults to every port listed by pyserial.
+        config_baud (int, optional): Baud rate of the CLI port. Defaults to 115200.
+        data_baud (int, optional): Baud rate of the data port. Defaults to 921600.
+        timeout (float, optional): Per port seconds to wait for frames, and again for a CLI reply. Defaults to .5.
+        workers (Optional[int], optional): Ports probed at once, None probes all of them at once. Defaults to None.
+
+    Returns:
+        list[Board]: Boards found.
+
+    Example:
+        >>> sensors = []
+        >>> for i, board in enumerate(discover()):
+        ...     sensor = IWR6843AOP(str(i))
+        ...     sensor.connect_config(board.config_port, 115200)
+        ...     sensor.connect_data(board.data_port, 921600)
+        ...     sensors.append(sensor)
+    """
+    serial_numbers = {p.device: p.serial_number for p in comports()}
+    if ports is None:
+        ports = list(serial_numbers)
+    if not ports:
+        return []
+
+    with ThreadPoolExecutor(workers or len(ports), thread_name_prefix='probe') as pool:
+        probes = list(pool.map(lambda device: probe_port(device, serial_numbers.get(device), config_baud, data_baud, timeout), ports))
+
+    return pair_ports(probes)
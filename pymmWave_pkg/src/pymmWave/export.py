@@ -0,0 +1,231 @@
+"""Exports raw captures to Arrow IPC or Parquet tables, decoding chunks of the capture in parallel.
+
+Usage:
+    python -m pymmWave.export session.bin session.parquet --workers 8
+"""
+import os
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from mmap import ACCESS_READ, mmap
+from struct import error as StructError
+from typing import Any, Optional
+
+import numpy as np
+
+from .capture import CAPTURE_INDEX_DTYPE, index_path
+from .constants import MAGIC_NUMBER, TLV_type
+from .framing import FRAME_HEADER_LEN, MAX_FRAME_LEN, FrameSynchronizer, detected_points, iter_tlvs, parse_header
+
+# Output columns, one row per detected point.
+COLUMNS: tuple[str, ...] = ('frame_number', 'host_timestamp_ns', 'time_cpu_cycles', 'x', 'y', 'z', 'doppler', 'snr', 'noise')
+
+# Per-row flags returned by decode_range along with the columns.
+_VALIDITY: tuple[str, ...] = ('host_valid', 'side_valid')
+
+# Bytes of capture decoded by one task.
+DEFAULT_CHUNK_SIZE: int = 64 << 20
+
+
+def _require_pyarrow() -> Any:
+    try:
+        import pyarrow  # type: ignore
+    except ImportError as e:
+        raise ImportError("Exporting requires pyarrow, install it with `pip install pyarrow`.") from e
+    return pyarrow
+
+
+def _open_index(capture_path: str) -> Optional[np.ndarray]:
+    path = index_path(capture_path)
+    if not os.path.exists(path) or os.path.getsize(path) < CAPTURE_INDEX_DTYPE.itemsize:
+        return None
+    return np.memmap(path, dtype=CAPTURE_INDEX_DTYPE, mode='r', shape=(os.path.getsize(path) // CAPTURE_INDEX_DTYPE.itemsize,))
+
+
+def _is_frame_start(buf: Any, idx: int) -> bool:
+    """Whether a magic number at `idx` starts a real frame: its length is plausible, and it is followed by another frame or the end of the capture.
+    """
+    if idx + FRAME_HEADER_LEN > len(buf):
+        return False
+    try:
+        total = parse_header(buf[idx:idx + FRAME_HEADER_LEN]).total_packet_len
+    except StructError:
+        return False
+    end = idx + total
+    return FRAME_HEADER_LEN <= total <= MAX_FRAME_LEN and (end >= len(buf) or buf[end:end + len(MAGIC_NUMBER)] == MAGIC_NUMBER)
+
+
+def split_capture(capture_path: str, chunk_size: int=DEFAULT_CHUNK_SIZE) -> list[tuple[int, int]]:
+    """Splits a capture into byte ranges which start at a frame, so they can be decoded independently.
+    Splits are taken from the capture's index if it has one, otherwise from magic numbers found near every `chunk_size` bytes.
+
+    Args:
+        capture_path (str): Path of the capture file.
+        chunk_size (int, optional): Approximate size of a range. Defaults to DEFAULT_CHUNK_SIZE.
+
+    Returns:
+        list[tuple[int, int]]: (start, end) byte ranges covering the whole capture, in order.
+    """
+    size = os.path.getsize(capture_path)
+    if not size:
+        return []
+
+    index = _open_index(capture_path)
+    starts = [0]
+    if index is not None:
+        offsets = index['offset']
+        for target in range(chunk_size, size, chunk_size):
+            i = int(np.searchsorted(offsets, target))
+            if i < len(offsets) and offsets[i] > starts[-1]:
+                starts.append(int(offsets[i]))
+    else:
+        with open(capture_path, 'rb') as f, mmap(f.fileno(), 0, access=ACCESS_READ) as buf:
+            for target in range(chunk_size, size, chunk_size):
+                idx = buf.find(MAGIC_NUMBER, max(target, starts[-1] + 1))
+                while idx >= 0 and not _is_frame_start(buf, idx):
+                    idx = buf.find(MAGIC_NUMBER, idx + 1)
+                if idx < 0:
+                    break
+                if idx > starts[-1]:
+                    starts.append(idx)
+
+    return list(zip(starts, starts[1:] + [size]))
+
+
+def decode_range(capture_path: str, start: int, end: int, doppler_filtering: Optional[float]=None) -> dict[str, np.ndarray]:
+    """Decodes every frame in a byte range of a capture into columns. Runs in the worker processes of :obj:`export`.
+
+    Args:
+        capture_path (str): Path of the capture file.
+        start (int): First byte, at the start of a frame.
+        end (int): Byte after the last.
+        doppler_filtering (Optional[float], optional): Points with an absolute doppler at or below this are dropped, None keeps every point. Defaults to None.
+
+    Returns:
+        dict[str, np.ndarray]: One array per entry of COLUMNS, plus boolean 'host_valid' and 'side_valid' arrays marking rows which have a host timestamp and side info.
+    """
+    index = _open_index(capture_path)
+    parts: dict[str, list[np.ndarray]] = {c: [] for c in COLUMNS + _VALIDITY}
+    sync = FrameSynchronizer()
+
+    with open(capture_path, 'rb') as f, mmap(f.fileno(), 0, access=ACCESS_READ) as buf:
+        sync.feed(buf[start:end])
+
+    for frame in sync.frames():
+        try:
+            header = parse_header(frame)
+            points = detected_points(frame, header)
+            side = None
+            for tlv_type, idx, length in iter_tlvs(frame, header):
+                if tlv_type == TLV_type.MMWDEMO_OUTPUT_MSG_DETECTED_POINTS_SIDE_INFO.value and length >= 4 * len(points):
+                    side = np.frombuffer(frame, dtype='<i2', count=2 * len(points), offset=idx).reshape(-1, 2)
+        except (ValueError, StructError):
+            continue
+
+        if doppler_filtering is not None:
+            keep = np.abs(points[:, 3]) > doppler_filtering
+            points = points[keep]
+            side = side[keep] if side is not None else None
+        n = len(points)
+        if not n:
+            continue
+
+        host_ns = None
+        if index is not None:
+            row = int(np.searchsorted(index['offset'], start + sync.frame_offset))
+            # Rebuilt indexes have no timestamps, stored as 0
+            if row < len(index) and int(index['offset'][row]) == start + sync.frame_offset and index['host_ns'][row]:
+                host_ns = int(index['host_ns'][row])
+
+        parts['frame_number'].append(np.full(n, header.frame_number, dtype=np.uint32))
+        parts['host_timestamp_ns'].append(np.full(n, host_ns or 0, dtype=np.int64))
+        parts['host_valid'].append(np.full(n, host_ns is not None))
+        parts['side_valid'].append(np.full(n, side is not None))
+        parts['time_cpu_cycles'].append(np.full(n, header.time_cpu_cycles, dtype=np.uint32))
+        for i, c in enumerate(('x', 'y', 'z', 'doppler')):
+            parts[c].append(points[:, i])
+        parts['snr'].append(side[:, 0] if side is not None else np.zeros(n, dtype=np.int16))
+        parts['noise'].append(side[:, 1] if side is not None else np.zeros(n, dtype=np.int16))
+
+    dtypes = {'frame_number': np.uint32, 'host_timestamp_ns': np.int64, 'time_cpu_cycles': np.uint32, 'snr': np.int16, 'noise': np.int16, 'host_valid': bool, 'side_valid': bool}
+    return {c: np.concatenate(v) if v else np.empty(0, dtype=dtypes.get(c, np.float32)) for c, v in parts.items()}
+
+
+def _record_batch(pa: Any, columns: dict[str, np.ndarray], schema: Any) -> Any:
+    masks = {'host_timestamp_ns': ~columns['host_valid'], 'snr': ~columns['side_valid'], 'noise': ~columns['side_valid']}
+    arrays = [pa.array(columns[c], type=schema.field(c).type, mask=masks.get(c)) for c in COLUMNS]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def export(capture_path: str, output_path: str, fmt: Optional[str]=None, workers: Optional[int]=None,
+           chunk_size: int=DEFAULT_CHUNK_SIZE, doppler_filtering: Optional[float]=None) -> int:
+    """Decodes a capture to a table with one row per detected point, with the columns listed in COLUMNS.
+
+    The capture is split at frame boundaries, the pieces are decoded in a process pool and written out in capture order,
+    one record batch (or Parquet row group) per piece. Host timestamps come from the capture's index, and are null without one.
+    Side info (snr, noise) is null for frames which do not have it. Requires pyarrow.
+
+    Args:
+        capture_path (str): Path of the capture file.
+        output_path (str): Path of the table to write.
+        fmt (Optional[str], optional): 'parquet' or 'arrow', None picks by the output extension (.parquet, else Arrow IPC). Defaults to None.
+        workers (Optional[int], optional): Worker processes, None uses one per CPU. Defaults to None.
+        chunk_size (int, optional): Approximate bytes of capture per task. Defaults to DEFAULT_CHUNK_SIZE.
+        doppler_filtering (Optional[float], optional): Points with an absolute doppler at or below this are dropped, None keeps every point. Defaults to None.
+
+    Returns:
+        int: Number of rows written.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+    pa = _require_pyarrow()
+    if fmt is None:
+        fmt = 'parquet' if output_path.endswith('.parquet') else 'arrow'
+
+    schema = pa.schema([
+        ('frame_number', pa.uint32()), ('host_timestamp_ns', pa.int64()), ('time_cpu_cycles', pa.uint32()),
+        ('x', pa.float32()), ('y', pa.float32()), ('z', pa.float32()), ('doppler', pa.float32()),
+        ('snr', pa.int16()), ('noise', pa.int16())])
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq  # type: ignore
+        writer = pq.ParquetWriter(output_path, schema)
+    elif fmt == 'arrow':
+        writer = pa.ipc.new_file(output_path, schema)
+    else:
+        raise ValueError(f"Unknown export format {fmt}.")
+
+    ranges = split_capture(capture_path, chunk_size)
+    rows = 0
+    try:
+        with ProcessPoolExecutor(workers) as pool:
+            n = len(ranges)
+            # map() yields in submission order, so the output keeps the capture order
+            for columns in pool.map(decode_range, [capture_path] * n, [s for s, _ in ranges], [e for _, e in ranges], [doppler_filtering] * n):
+                batch = _record_batch(pa, columns, schema)
+                if fmt == 'parquet':
+                    writer.write_table(pa.Table.from_batches([batch]))
+                else:
+                    writer.write_batch(batch)
+                rows += batch.num_rows
+    finally:
+        writer.close()
+
+    return rows
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Export a raw pymmWave capture to Parquet or Arrow IPC.")
+    parser.add_argument('capture', help="Capture file, as written by IWR6843AOP.start_recording.")
+    parser.add_argument('output', help="Output table. Written as Parquet if it ends in .parquet, Arrow IPC otherwise.")
+    parser.add_argument('--format', choices=('parquet', 'arrow'), help="Override the format chosen from the output extension.")
+    parser.add_argument('--workers', type=int, help="Worker processes. Defaults to one per CPU.")
+    parser.add_argument('--chunk-mb', type=int, default=DEFAULT_CHUNK_SIZE >> 20, help="MiB of capture decoded per task.")
+    parser.add_argument('--doppler-filtering', type=float, help="Drop points with an absolute doppler at or below this.")
+    args = parser.parse_args()
+
+    rows = export(args.capture, args.output, args.format, args.workers, args.chunk_mb << 20, args.doppler_filtering)
+    print(f"Wrote {rows} points to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,269 @@
+from struct import Struct
+from typing import Iterator, NamedTuple, Union
+
+import numpy as np
+
+from .constants import MAGIC_NUMBER, TLV_type
+
+# Everything following the magic number in the frame header, all uint32:
+#   version, totalPacketLen, platform, frameNumber, timeCpuCycles, numDetectedObj, numTLVs, subFrameNumber
+FRAME_HEADER: Struct = Struct('<8I')
+FRAME_HEADER_LEN: int = len(MAGIC_NUMBER) + FRAME_HEADER.size
+
+# TLV header, both uint32: type, length of the payload which follows
+TLV_HEADER: Struct = Struct('<2I')
+TLV_HEADER_LEN: int = TLV_HEADER.size
+
+# Layout of a single detected point in the MMWDEMO_OUTPUT_MSG_DETECTED_POINTS TLV: four little-endian float32 values.
+DETECTED_POINT_DTYPE = np.dtype([('x', '<f4'), ('y', '<f4'), ('z', '<f4'), ('doppler', '<f4')])
+
+# Upper bound on an accepted packet length. Anything larger is treated as a corrupt header.
+MAX_FRAME_LEN: int = 1 << 20
+
+
+class FrameHeader(NamedTuple):
+    """Decoded TI frame header. Field order matches the order on the wire.
+    """
+    version: int
+    total_packet_len: int
+    platform: int
+    frame_number: int
+    time_cpu_cycles: int
+    num_detected_obj: int
+    num_tlvs: int
+    sub_frame_number: int
+
+
+def parse_header(frame: Union[bytes, bytearray, memoryview]) -> FrameHeader:
+    """Parses the header of a frame which starts with the magic number.
+
+    Args:
+        frame (Union[bytes, bytearray, memoryview]): A frame, as given out by :obj:`FrameSynchronizer<pymmWave.framing.FrameSynchronizer>`.
+
+    Returns:
+        FrameHeader: The decoded header.
+
+    Raises:
+        struct.error: If the frame is shorter than a header.
+    """
+    return FrameHeader._make(FRAME_HEADER.unpack_from(frame, len(MAGIC_NUMBER)))
+
+
+def iter_tlvs(frame: Union[bytes, bytearray, memoryview], header: FrameHeader) -> Iterator[tuple[int, int, int]]:
+    """Walks the TLVs of a frame. Iteration stops early at a TLV which does not fit in the frame.
+
+    Args:
+        frame (Union[bytes, bytearray, memoryview]): A complete frame.
+        header (FrameHeader): The header of that frame.
+
+    Yields:
+        tuple[int, int, int]: (TLV type, offset of the payload in the frame, payload length)
+    """
+    idx = FRAME_HEADER_LEN
+    end = len(frame)
+    for _ in range(header.num_tlvs):
+        if idx + TLV_HEADER_LEN > end:
+            return
+        tlv_type, tlv_length = TLV_HEADER.unpack_from(frame, idx)
+        idx += TLV_HEADER_LEN
+        if idx + tlv_length > end:
+            return
+        yield tlv_type, idx, tlv_length
+        idx += tlv_length
+
+
+def detected_points(frame: Union[bytes, bytearray, memoryview], header: FrameHeader) -> np.ndarray:
+    """Reads the detected points TLV of a frame without copying it.
+
+    Args:
+        frame (Union[bytes, bytearray, memoryview]): A complete frame.
+        header (FrameHeader): The header of that frame.
+
+    Returns:
+        np.ndarray: Nx4 float32 view into `frame` holding x, y, z, doppler. Empty if the frame has no detected points.
+    """
+    for tlv_type, idx, length in iter_tlvs(frame, header):
+        if tlv_type == TLV_type.MMWDEMO_OUTPUT_MSG_DETECTED_POINTS.value:
+            count = min(header.num_detected_obj, length // DETECTED_POINT_DTYPE.itemsize)
+            return np.frombuffer(frame, dtype='<f4', count=count * 4, offset=idx).reshape(count, 4)
+
+    return np.empty((0, 4), dtype='<f4')
+
+
+def _magic_overlap(buf: bytearray, end: int) -> int:
+    """Length of the start of a magic number with which the bytes before `end` end, 0 if none. The bytes of the magic number are distinct, so there is at most one.
+    Such a tail is either part of the frame, or the start of the next frame's magic number when the frame was cut short by fewer bytes than that.
+    """
+    k = MAGIC_NUMBER.find(buf[end - 1]) + 1
+    if 0 < k < len(MAGIC_NUMBER) and buf[end - k:end] == MAGIC_NUMBER[:k]:
+        return k
+    return 0
+
+
+def _tlvs_fit(buf: bytearray, idx: int, total_packet_len: int) -> bool:
+    """Whether the TLVs announced by the header of the frame at `idx` fit within its packet length.
+    """
+    num_tlvs = FRAME_HEADER.unpack_from(buf, idx + len(MAGIC_NUMBER))[6]
+    if num_tlvs * TLV_HEADER_LEN > total_packet_len - FRAME_HEADER_LEN:
+        return False
+    offset = FRAME_HEADER_LEN
+    for _ in range(num_tlvs):
+        if offset + TLV_HEADER_LEN > total_packet_len:
+            return False
+        offset += TLV_HEADER_LEN + TLV_HEADER.unpack_from(buf, idx + offset)[1]
+        if offset > total_packet_len:
+            return False
+    return True
+
+
+class FrameSynchronizer(object):
+    """Incrementally splits a byte stream into complete TI frames.
+
+    Bytes are appended to a persistent buffer with :obj:`feed`, and complete frames are handed out by :obj:`frames`.
+    The magic number is located with the native `bytearray.find`, and the search never revisits bytes which were already ruled out,
+    so the cost of framing depends only on the number of bytes received. Partial frames are carried over to the next call.
+    This class does no I/O, and can be fed from a serial port, a file, a socket, or anything else producing bytes.
+
+    Example:
+        >>> sync = FrameSynchronizer()
+        >>> sync.feed(serial_port.read_all())
+        >>> for frame in sync.frames():
+        ...     header = parse_header(frame)
+    """
+    def __init__(self, max_frame_len: int=MAX_FRAME_LEN):
+        """Initialize the synchronizer.
+
+        Args:
+            max_frame_len (int, optional): Largest packet length accepted before a header is considered corrupt. Defaults to MAX_FRAME_LEN.
+        """
+        self._buf: bytearray = bytearray()
+        self._start: int = 0
+        # Stream offset of the first buffered byte
+        self._base: int = 0
+        self._max_frame_len: int = max_frame_len
+        # Buffer index up to which the pending frame was searched for a following magic number
+        self._scanned: int = 0
+        # Stream offset of the end of the frame last yielded. The search resumes a few bytes before it when the frame ends like a magic number.
+        self._yielded_end: int = 0
+        self.frames_found: int = 0
+        self.bytes_discarded: int = 0
+        # Magic numbers followed by an impossible packet length
+        self.corrupt_headers: int = 0
+        # Frames cut short by the magic number of a following frame, the search resumes there
+        self.truncated_frames: int = 0
+        # Frames whose TLVs do not fit in their packet length
+        self.malformed_frames: int = 0
+        # Stream offset of the frame last yielded by frames()
+        self.frame_offset: int = -1
+
+    @property
+    def corrupt_frames(self) -> int:
+        """Number of damaged frames skipped so far: corrupt headers, truncated frames and malformed frames.
+        """
+        return self.corrupt_headers + self.truncated_frames + self.malformed_frames
+
+    def feed(self, data: Union[bytes, bytearray, memoryview]) -> None:
+        """Append received bytes to the internal buffer.
+
+        Args:
+            data (Union[bytes, bytearray, memoryview]): Any bytes-like object.
+        """
+        self._buf += data
+
+    def pending(self) -> int:
+        """Number of buffered bytes which have not been handed out as part of a frame yet.
+
+        Returns:
+            int: Byte count
+        """
+        return len(self._buf) - self._start
+
+    def stream_offset(self) -> int:
+        """Total number of bytes fed so far, i.e. the stream offset of the next byte to be fed.
+
+        Returns:
+            int: Byte count
+        """
+        return self._base + len(self._buf)
+
+    def reset(self) -> None:
+        """Drop all buffered data. Counters and the stream offset are kept.
+        """
+        self._base += len(self._buf)
+        self._buf.clear()
+        self._start = 0
+        self._scanned = 0
+
+    def _discard(self, idx: int) -> None:
+        """Drops the buffered bytes before `idx`, counting those which were not part of a yielded frame.
+        """
+        self.bytes_discarded += max(0, idx - max(self._start, self._yielded_end - self._base))
+        self._start = idx
+
+    def frames(self) -> Iterator[memoryview]:
+        """Yields every complete frame currently in the buffer, in order.
+        Each frame is copied once out of the buffer, so the returned memoryview stays valid after later calls to :obj:`feed`.
+        Bytes preceding a magic number are discarded, as are headers advertising an impossible length, frames containing the magic number of
+        a following frame (a truncated frame whose length swallowed its successor), and frames whose TLVs do not fit in their length.
+        A frame is yielded as soon as its last byte is buffered, it is never held back for the bytes following it.
+
+        Yields:
+            memoryview: A complete frame, starting with the magic number.
+        """
+        buf = self._buf
+        magic_len = len(MAGIC_NUMBER)
+        try:
+            while True:
+                idx = buf.find(MAGIC_NUMBER, self._start)
+                if idx < 0:
+                    # Keep a possible partial magic number at the tail
+                    self._discard(max(self._start, len(buf) - magic_len + 1))
+                    return
+
+                if idx != self._start:
+                    self._discard(idx)
+                if len(buf) - idx < FRAME_HEADER_LEN:
+                    return
+
+                total_packet_len: int = FRAME_HEADER.unpack_from(buf, idx + magic_len)[1]
+                if total_packet_len < FRAME_HEADER_LEN or total_packet_len > self._max_frame_len:
+                    # Not a real frame, resume the search just past this magic number
+                    self.corrupt_headers += 1
+                    self._discard(idx + 1)
+                    continue
+
+                end = idx + total_packet_len
+                # A frame directly followed by the next one is whole. Otherwise a magic number within the span means it was cut short, resync there
+                if not buf.startswith(MAGIC_NUMBER, end):
+                    scan_from = max(idx + 1, self._scanned - magic_len + 1)
+                    self._scanned = min(end, len(buf))
+                    following = buf.find(MAGIC_NUMBER, scan_from, self._scanned)
+                    if following >= 0:
+                        self.truncated_frames += 1
+                        self._discard(following)
+                        self._scanned = 0
+                        continue
+                    if end > len(buf):
+                        return
+
+                self._scanned = 0
+                if not _tlvs_fit(buf, idx, total_packet_len):
+                    self.malformed_frames += 1
+                    self._discard(end)
+                    continue
+
+                frame = memoryview(buf[idx:end])
+                # A frame is handed out as soon as it is complete. If it was cut short by a few bytes, the next magic number straddles its end,
+                #   so the search resumes at any tail which could start one.
+                self._start = end - _magic_overlap(buf, end)
+                self._yielded_end = self._base + end
+                self.frame_offset = self._base + idx
+                self.frames_found += 1
+                yield frame
+        finally:
+            # Compact once per pass rather than once per frame
+            if self._start:
+                self._scanned = max(0, self._scanned - self._start)
+                self._base += self._start
+                del buf[:self._start]
+                self._start = 0
@@ -0,0 +1,292 @@
+from asyncio import FIRST_EXCEPTION, Event, Task, create_task, gather, sleep, wait
+from collections import deque
+from time import monotonic_ns
+from typing import AsyncIterator, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+
+from .data_model import DopplerPointCloud, PointCloudBatch
+from .delivery import DeliveryPolicy, FrameRing, Subscription
+from .sensor import SpatialSensor
+
+
+class FusedCloud(NamedTuple):
+    """Points of every sensor of a :obj:`SensorArray<pymmWave.fusion.SensorArray>` over one time window, in the world frame.
+    """
+    # One frame per contributing sensor frame, in world coordinates. Frame sources are indices into SensorArray.sensors.
+    batch: PointCloudBatch
+    # Host time.monotonic_ns() window covered, the end is excluded.
+    start_ns: int
+    end_ns: int
+    # Sensors which contributed nothing, neither a frame in the window nor one within their staleness limit.
+    missing: tuple[int, ...]
+    # Time the points were motion compensated to: the window end, or the reference frame when matching.
+    reference_ns: int
+
+    def get(self) -> np.ndarray:
+        """Merged Mx4 points of every sensor.
+        """
+        return self.batch.get()
+
+
+class SensorArray(object):
+    """Fuses the point clouds of several :obj:`SpatialSensor<pymmWave.sensor.SpatialSensor>` into world frame clouds.
+
+    Every sensor is read concurrently, and each of its clouds is moved into the world frame with the sensor's precomputed extrinsic as it arrives.
+    Clouds are timestamped with their host receive time, minus the time the frame took to cross the serial link (see :obj:`Sensor.transfer_delay_ns<pymmWave.sensor.Sensor.transfer_delay_ns>`),
+    so sensors at different baud rates or frame sizes line up.
+
+    By default clouds are grouped into consecutive windows of `window_s`. Each window is published as a :obj:`FusedCloud<pymmWave.fusion.FusedCloud>`
+    with a single allocation for the merged points. A sensor with nothing in a window contributes its newest cloud instead, as long as that is no older than the sensor's staleness limit.
+
+    With a match tolerance, every frame of the reference sensor is published instead, together with the frame of every other sensor nearest in time to it, if one is within the tolerance.
+    This avoids pairing frames of free-running sensors which happen to arrive together, but were captured up to a frame period apart.
+
+    With a known ego velocity, see :obj:`set_ego_velocity`, points are motion compensated: every frame is shifted by the distance the rig travelled between its timestamp and the reference time.
+
+    The array reads sensors through :obj:`Sensor.get_data<pymmWave.sensor.Sensor.get_data>`, so it must be their only consumer of get_data. Clouds are copied while being transformed,
+    and pooled clouds are released right away.
+
+    Example:
+        >>> array = SensorArray([SpatialSensor(front, (0, 0.1, 0), (0, 0, 0)), SpatialSensor(back, (0, -0.1, 0), (0, 0, np.pi))], window_s=0.1)
+        >>> asyncio.create_task(array.run())
+        >>> async for fused in array.stream():
+        ...     print(fused.get().shape, fused.missing)
+    """
+    def __init__(self, sensors: Sequence[SpatialSensor], window_s: float=0.1, staleness_s: Union[float, Sequence[float]]=0.2,
+                 delay_s: float=0.02, history: int=16, policy: DeliveryPolicy=DeliveryPolicy.LATEST, capacity: int=1,
+                 match_tolerance_s: Optional[float]=None, reference: int=0, correct_transfer_delay: bool=True):
+        """Set up fusion. Nothing is read until :obj:`run`.
+
+        Args:
+            sensors (Sequence[SpatialSensor]): Sensors with their placement in the world frame.
+            window_s (float, optional): Length of a fusion window in seconds. Defaults to 0.1.
+            staleness_s (Union[float, Sequence[float]], optional): Oldest cloud reused for a window without a new cloud, for every sensor or per sensor. 0 never reuses clouds. Defaults to 0.2.
+            delay_s (float, optional): Time waited after the end of a window before fusing it, for clouds which are still being delivered. Defaults to 0.02.
+            history (int, optional): Clouds buffered per sensor. Defaults to 16.
+            policy (DeliveryPolicy, optional): Buffering of fused clouds, see :obj:`FrameRing<pymmWave.delivery.FrameRing>`. Defaults to DeliveryPolicy.LATEST.
+            capacity (int, optional): Fused clouds buffered for policies other than LATEST. Defaults to 1.
+            match_tolerance_s (Optional[float], optional): Match frames to the reference sensor's frames by nearest timestamp, pairing only frames at most this far apart. None groups by windows. Defaults to None.
+            reference (int, optional): Index of the sensor whose frames drive matching. Defaults to 0.
+            correct_transfer_delay (bool, optional): Subtract the serial transfer time from receive timestamps. Defaults to True.
+        """
+        assert sensors, "A sensor array needs sensors."
+        assert window_s > 0 and delay_s >= 0
+        self.sensors: list[SpatialSensor] = list(sensors)
+        self.window_ns = int(window_s * 1e9)
+        self.delay_ns = int(delay_s * 1e9)
+        if isinstance(staleness_s, (int, float)):
+            staleness_s = [staleness_s] * len(self.sensors)
+        assert len(staleness_s) == len(self.sensors)
+        self.staleness_ns: list[int] = [int(s * 1e9) for s in staleness_s]
+        assert 0 <= reference < len(self.sensors)
+        self.match_tolerance_ns: Optional[int] = None if match_tolerance_s is None else int(match_tolerance_s * 1e9)
+        self.reference = reference
+        self.correct_transfer_delay = correct_transfer_delay
+        self._ego_velocity: Optional[np.ndarray] = None
+        # Set when a reference frame arrives while matching, created on the event loop by run()
+        self._reference_arrived: Optional[Event] = None
+
+        # Recent world frame clouds per sensor with their receive times, oldest first
+        self._frames: list[deque[tuple[int, DopplerPointCloud]]] = [deque(maxlen=history) for _ in self.sensors]
+        self._output: FrameRing[FusedCloud] = FrameRing(policy, capacity)
+        # Under DeliveryPolicy.BLOCKING this is created by the first get_fused call, so that the ring is not held back by a reader which is never used
+        self._consumer: Optional[Subscription[FusedCloud]] = None if policy == DeliveryPolicy.BLOCKING else self._output.subscribe()
+
+        self.windows: int = 0
+        self.windows_skipped: int = 0
+        self.frames_received: list[int] = [0] * len(self.sensors)
+        self.frames_reused: list[int] = [0] * len(self.sensors)
+        self.windows_missing: list[int] = [0] * len(self.sensors)
+
+    def set_ego_velocity(self, velocity: Optional[Sequence[float]]) -> None:
+        """Sets the velocity of the rig in the world frame, used to motion compensate every fused cloud from now on. Rotation of the rig is not compensated.
+
+        Args:
+            velocity (Optional[Sequence[float]]): (x, y, z) in meters per second, None turns compensation off.
+        """
+        self._ego_velocity = None if velocity is None else np.asarray(velocity, dtype=np.float64)
+
+    def _timestamp(self, idx: int, cloud: DopplerPointCloud) -> int:
+        metadata = cloud.get_metadata()
+        if metadata is None:
+            return monotonic_ns()
+        if self.correct_transfer_delay:
+            return metadata.host_timestamp_ns - self.sensors[idx].sensor.transfer_delay_ns(metadata)
+        return metadata.host_timestamp_ns
+
+    def add(self, idx: int, cloud: DopplerPointCloud) -> None:
+        """Adds a cloud of sensor `idx`, as :obj:`run` does for every cloud received. Useful to feed the array without running it.
+
+        Args:
+            idx (int): Index of the sensor in :obj:`sensors`.
+            cloud (DopplerPointCloud): Cloud in the sensor's frame.
+        """
+        timestamp_ns = self._timestamp(idx, cloud)
+        points = cloud.get()
+        world = np.empty_like(points)
+        self.sensors[idx].extrinsic.apply(points, out=world)
+        self._frames[idx].append((timestamp_ns, DopplerPointCloud(world, cloud.get_metadata())))
+        self.frames_received[idx] += 1
+        cloud.release()
+        if idx == self.reference and self._reference_arrived is not None:
+            self._reference_arrived.set()
+
+    def _merge(self, picked: list[tuple[int, int, DopplerPointCloud]], start_ns: int, end_ns: int, reference_ns: int, missing: list[int]) -> FusedCloud:
+        """Stacks (sensor, timestamp, cloud) picks into a fused cloud with a single allocation, and motion compensates it to `reference_ns`.
+        """
+        batch = PointCloudBatch.from_clouds([cloud for _, _, cloud in picked], [idx for idx, _, _ in picked])
+        velocity = self._ego_velocity
+        data = batch.get()
+        if velocity is not None and data.shape[0]:
+            # A static point seen `age` earlier has since moved against the rig's motion
+            age_s = (reference_ns - np.array([ts for _, ts, _ in picked], dtype=np.int64)) / 1e9
+            data[:, :3] -= (np.repeat(age_s, batch.sizes())[:, None] * velocity).astype(data.dtype)
+
+        return FusedCloud(batch, start_ns, end_ns, tuple(missing), reference_ns)
+
+    def fuse(self, end_ns: int) -> FusedCloud:
+        """Fuses the window ending at `end_ns`. Clouds from before the window are discarded, except each sensor's newest, which may still be reused.
+
+        Args:
+            end_ns (int): End of the window, host time.monotonic_ns().
+
+        Returns:
+            FusedCloud: The window.
+        """
+        start_ns = end_ns - self.window_ns
+        picked: list[tuple[int, int, DopplerPointCloud]] = []
+        missing: list[int] = []
+        for idx, frames in enumerate(self._frames):
+            while len(frames) > 1 and frames[1][0] < start_ns:
+                frames.popleft()
+
+            in_window = [(idx, ts, cloud) for ts, cloud in frames if start_ns <= ts < end_ns]
+            if not in_window and frames and frames[0][0] < start_ns and end_ns - frames[0][0] <= self.staleness_ns[idx]:
+                in_window = [(idx, frames[0][0], frames[0][1])]
+                self.frames_reused[idx] += 1
+            if not in_window:
+                missing.append(idx)
+                self.windows_missing[idx] += 1
+            picked += in_window
+
+        self.windows += 1
+        return self._merge(picked, start_ns, end_ns, end_ns, missing)
+
+    def match(self, reference_ns: int) -> FusedCloud:
+        """Fuses the reference sensor's frame at `reference_ns` with the nearest frame of every other sensor within the match tolerance.
+        Frames too old to match any later reference frame are discarded.
+
+        Args:
+            reference_ns (int): Timestamp of a reference sensor frame, as used by the array.
+
+        Returns:
+            FusedCloud: The matched frames, covering reference_ns plus or minus the tolerance.
+        """
+        tolerance = self.match_tolerance_ns or 0
+        picked: list[tuple[int, int, DopplerPointCloud]] = []
+        missing: list[int] = []
+        for idx, frames in enumerate(self._frames):
+            while frames and frames[0][0] < reference_ns - tolerance:
+                frames.popleft()
+
+            best = min(frames, key=lambda f: abs(f[0] - reference_ns), default=None)
+            if best is None or abs(best[0] - reference_ns) > tolerance:
+                missing.append(idx)
+                self.windows_missing[idx] += 1
+            else:
+                picked.append((idx, best[0], best[1]))
+
+        self.windows += 1
+        return self._merge(picked, reference_ns - tolerance, reference_ns + tolerance + 1, reference_ns, missing)
+
+    async def _collect(self, idx: int) -> None:
+        sensor = self.sensors[idx].sensor
+        while True:
+            cloud = await sensor.get_data()
+            self.add(idx, cloud)  # type: ignore
+
+    async def _tick(self) -> None:
+        end_ns = monotonic_ns() + self.window_ns
+        while True:
+            delay = end_ns + self.delay_ns - monotonic_ns()
+            if delay > 0:
+                await sleep(delay / 1e9)
+            # When fusion falls behind, windows which can no longer be published on time are skipped
+            behind = (monotonic_ns() - self.delay_ns - end_ns) // self.window_ns
+            if behind > 0:
+                end_ns += behind * self.window_ns
+                self.windows_skipped += behind
+            self._output.put(self.fuse(end_ns))
+            end_ns += self.window_ns
+
+    async def _match_references(self) -> None:
+        self._reference_arrived = Event()
+        frames = self._frames[self.reference]
+        last: Optional[int] = None
+        while True:
+            pending = [ts for ts, _ in frames if last is None or ts > last]
+            if not pending:
+                self._reference_arrived.clear()
+                await self._reference_arrived.wait()
+                continue
+
+            # Other sensors may still deliver frames up to the tolerance after the reference frame
+            reference_ns = pending[0]
+            delay = reference_ns + self.match_tolerance_ns + self.delay_ns - monotonic_ns()  # type: ignore
+            if delay > 0:
+                await sleep(delay / 1e9)
+            self._output.put(self.match(reference_ns))
+            last = reference_ns
+
+    async def run(self, start_sensors: bool=True) -> None:
+        """Reads every sensor and publishes fused clouds until cancelled.
+
+        Args:
+            start_sensors (bool, optional): Also run every sensor's :obj:`start_sensor<pymmWave.sensor.Sensor.start_sensor>`. Use False if the sensors are already running. Defaults to True.
+
+        Raises:
+            Exception: Whatever a sensor raised, which stops the array.
+        """
+        tasks: list[Task[None]] = []
+        if start_sensors:
+            tasks += [create_task(s.sensor.start_sensor()) for s in self.sensors]
+        tasks += [create_task(self._collect(idx)) for idx in range(len(self.sensors))]
+        tasks.append(create_task(self._tick() if self.match_tolerance_ns is None else self._match_references()))
+        try:
+            while True:
+                done, _ = await wait(tasks, return_when=FIRST_EXCEPTION)
+                for task in done:
+                    if task.exception() is not None:
+                        raise task.exception()  # type: ignore
+                # Sensors which finished, e.g. replays, leave the others running
+                tasks = [t for t in tasks if t not in done]
+        finally:
+            for task in tasks:
+                task.cancel()
+            await gather(*tasks, return_exceptions=True)
+
+    async def get_fused(self) -> FusedCloud:
+        """Waits for the next fused cloud.
+        """
+        if self._consumer is None:
+            self._consumer = self._output.subscribe()
+        return await self._consumer.get()
+
+    def get_fused_nowait(self) -> Optional[FusedCloud]:
+        """Returns the next fused cloud if there is one, otherwise None.
+        """
+        if self._consumer is None:
+            self._consumer = self._output.subscribe()
+        return self._consumer.get_nowait()
+
+    def subscribe(self) -> Subscription[FusedCloud]:
+        """Adds an independent reader of fused clouds, see :obj:`FrameRing.subscribe<pymmWave.delivery.FrameRing.subscribe>`.
+        """
+        return self._output.subscribe()
+
+    async def stream(self) -> AsyncIterator[FusedCloud]:
+        """Asynchronous iterator over fused clouds.
+        """
+        while True:
+            yield await self.get_fused()
@@ -0,0 +1,120 @@
+from enum import Enum
+from typing import NamedTuple
+
+# Bucket i counts durations in [2^(i-1), 2^i) nanoseconds, bucket 0 counts zero durations. The last bucket is open ended (> ~9 minutes).
+NUM_BUCKETS: int = 40
+
+
+class Stage(Enum):
+    """Stages of the acquisition pipeline, in the order data goes through them.
+    """
+    # Duration of a read call on the data port. In reader thread or executor mode this includes waiting for the device.
+    SERIAL_READ = 1
+    # Locating and copying out complete frames from the received bytes.
+    MAGIC_SYNC = 2
+    # Parsing the frame header and walking the TLV headers.
+    HEADER_PARSE = 3
+    # Decoding the detected points TLV.
+    TLV_DECODE = 4
+    # Doppler filtering and building the output array.
+    DOPPLER_FILTER = 5
+    # Time a point cloud spent in the delivery ring, from publication to retrieval.
+    QUEUE_WAIT = 6
+    # End to end time, from receiving the last byte of a frame to the consumer retrieving its point cloud.
+    CONSUMER_PICKUP = 7
+
+
+class HistogramSnapshot(NamedTuple):
+    """Immutable copy of a :obj:`LatencyHistogram<pymmWave.instrumentation.LatencyHistogram>`. All durations are in nanoseconds.
+    """
+    count: int
+    total_ns: int
+    max_ns: int
+    buckets: tuple[int, ...]
+
+    @property
+    def mean_ns(self) -> float:
+        return self.total_ns / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> int:
+        """Upper bound of the bucket holding the q-th percentile, exact to within a factor of two.
+
+        Args:
+            q (float): Percentile between 0 and 100.
+
+        Returns:
+            int: Duration in nanoseconds, 0 if nothing was recorded.
+        """
+        if not self.count:
+            return 0
+        rank = q / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank and n:
+                return min(1 << i, self.max_ns) if i else 0
+        return self.max_ns
+
+
+class LatencyHistogram(object):
+    """Fixed size histogram with power of two buckets. Recording is a bit_length and two additions, nothing is allocated.
+    """
+    __slots__ = ('count', 'total_ns', 'max_ns', 'buckets')
+
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.total_ns: int = 0
+        self.max_ns: int = 0
+        self.buckets: list[int] = [0] * NUM_BUCKETS
+
+    def record(self, ns: int) -> None:
+        self.count += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+        self.buckets[min(ns.bit_length(), NUM_BUCKETS - 1)] += 1
+
+    def snapshot(self) -> HistogramSnapshot:
+        return HistogramSnapshot(self.count, self.total_ns, self.max_ns, tuple(self.buckets))
+
+
+class InstrumentationSnapshot(NamedTuple):
+    """Point in time copy of every stage histogram and counter.
+    """
+    stages: dict[Stage, HistogramSnapshot]
+    counters: dict[str, int]
+
+    def __repr__(self) -> str:
+        lines = [f"{'stage':<16}{'count':>10}{'mean us':>12}{'p50 us':>10}{'p99 us':>10}{'max us':>10}"]
+        for stage, h in self.stages.items():
+            lines.append(f"{stage.name:<16}{h.count:>10}{h.mean_ns / 1e3:>12.1f}{h.percentile(50) / 1e3:>10.1f}{h.percentile(99) / 1e3:>10.1f}{h.max_ns / 1e3:>10.1f}")
+        lines += [f"{name}: {value}" for name, value in self.counters.items()]
+        return '\n'.join(lines)
+
+
+class PipelineInstrumentation(object):
+    """Per-stage latency histograms and event counters for a sensor pipeline.
+
+    Sensors hold either one of these or None, so disabled instrumentation costs a single None check per stage.
+    """
+    def __init__(self) -> None:
+        self._stages: dict[Stage, LatencyHistogram] = {stage: LatencyHistogram() for stage in Stage}
+        self._counters: dict[str, int] = {}
+
+    def record(self, stage: Stage, ns: int) -> None:
+        """Record one duration for a stage.
+        """
+        self._stages[stage].record(ns)
+
+    def count(self, name: str, n: int=1) -> None:
+        """Increment a named counter.
+        """
+        self._counters[name] = self._counters.get(name, 0) + n
+
+    def snapshot(self) -> InstrumentationSnapshot:
+        """Copy the current state. Safe to call while the pipeline runs.
+        """
+        return InstrumentationSnapshot({stage: h.snapshot() for stage, h in self._stages.items()}, dict(self._counters))
+
+    def reset(self) -> None:
+        self.__init__()  # type: ignore
@@ -0,0 +1,430 @@
+from multiprocessing import Event, Pipe, Process
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from struct import error as StructError
+from time import monotonic_ns
+from typing import Any, Optional, Protocol, Union
+
+import numpy as np
+from serial import Serial # type: ignore
+
+from .data_model import FrameMetadata
+from .framing import FrameSynchronizer, detected_points, iter_tlvs, parse_header
+from .pool import ArrayPool
+from .stats import FrameNumberTracker
+
+# Ring header, all int64: the last completed sequence number, the last sequence number released by the reader, then the writer's running totals.
+_HEAD = 0
+_RELEASED = 1
+_BYTES_RECEIVED = 2
+_FRAMES_RECEIVED = 3
+_FRAMES_CORRUPT = 4
+_FRAMES_GAP = 5
+_FRAMES_EMPTY = 6
+_HEADER_FIELDS = 7
+
+# Seconds a blocked writer waits for released slots before checking whether it was stopped.
+_BLOCKED_WAIT: float = .1
+
+# Per-slot bookkeeping stored ahead of the point data, all int64.
+_META_SEQ = 0
+_META_COUNT = 1
+_META_FRAME_NUMBER = 2
+_META_TIME_CPU_CYCLES = 3
+_META_HOST_NS = 4
+_META_NUM_POINTS = 5
+_META_PACKET_LEN = 6
+_META_NUM_TLVS = 7
+_META_TLVS = 8
+# Only the first few TLV types of a frame are kept, which covers the standard demo output.
+_MAX_TLVS = 8
+_META_FIELDS = _META_TLVS + _MAX_TLVS
+
+# Marks a slot which is being written.
+_WRITING = -1
+
+
+class ByteSource(Protocol):
+    """Anything a decode worker can read a TI byte stream from. Must be picklable, and should only acquire resources in :obj:`open`.
+    """
+    def open(self) -> None: ...
+
+    def read(self) -> bytes: ...
+
+    def close(self) -> None: ...
+
+
+class SerialByteSource(object):
+    """Reads a data port by name. The port is opened inside the worker process.
+    """
+    def __init__(self, port: str, baud_rate: int, timeout: float=1):
+        self.port = port
+        self.baud_rate = baud_rate
+        self.timeout = timeout
+        self._ser: Optional[Serial] = None
+
+    def open(self) -> None:
+        self._ser = Serial(self.port, self.baud_rate, timeout=self.timeout)
+
+    def read(self) -> bytes:
+        data: bytes = self._ser.read(max(1, self._ser.in_waiting))  # type: ignore
+        return data
+
+    def close(self) -> None:
+        if self._ser is not None:
+            self._ser.close()
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        state['_ser'] = None
+        return state
+
+
+class SharedCloudRing(object):
+    """Fixed size ring of point clouds in a :obj:`multiprocessing.shared_memory.SharedMemory` block.
+
+    A single writer fills slots in order, each tagged with an increasing sequence number. Readers in any process
+    get zero-copy Nx4 views of a slot, in the ring's data type. A view stays valid until the writer wraps around to its slot, which
+    :obj:`is_current` can detect, or copy a cloud out with :obj:`read`, which detects a wrap around during the copy.
+    A writer which must not overwrite unread clouds waits on :obj:`writable`, until the reader has released them with :obj:`release`.
+    """
+    def __init__(self, slots: int, max_points: int, name: Optional[str]=None, dtype: Union[np.dtype, Any]=np.float32):
+        """Create a new ring, or attach to an existing one.
+
+        Args:
+            slots (int): Number of clouds held.
+            max_points (int): Capacity of a single cloud. Extra points are dropped by the writer.
+            name (Optional[str], optional): Name of an existing ring to attach to. Creates a new ring if None. Defaults to None.
+            dtype (Union[np.dtype, Any], optional): Data type of the points, must match when attaching. Defaults to np.float32.
+        """
+        assert slots > 0 and max_points > 0
+        self.slots = slots
+        self.max_points = max_points
+        self.dtype = np.dtype(dtype)
+
+        meta_bytes = 8 * (_HEADER_FIELDS + slots * _META_FIELDS)
+        data_bytes = self.dtype.itemsize * slots * max_points * 4
+        if name is None:
+            self._shm = SharedMemory(create=True, size=meta_bytes + data_bytes)
+        else:
+            self._shm = SharedMemory(name=name)
+
+        buf = self._shm.buf
+        self._header: np.ndarray = np.ndarray((_HEADER_FIELDS,), dtype=np.int64, buffer=buf)
+        self._meta: np.ndarray = np.ndarray((slots, _META_FIELDS), dtype=np.int64, buffer=buf, offset=8 * _HEADER_FIELDS)
+        self._data: np.ndarray = np.ndarray((slots, max_points, 4), dtype=self.dtype, buffer=buf, offset=meta_bytes)
+        if name is None:
+            self._header[:] = 0
+            self._header[_HEAD] = -1
+            self._header[_RELEASED] = -1
+            self._meta[:, _META_SEQ] = _WRITING
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def head(self) -> int:
+        """Sequence number of the newest complete cloud, -1 if none were written.
+        """
+        return int(self._header[_HEAD])
+
+    @property
+    def released(self) -> int:
+        """Sequence number of the newest cloud the reader is done with, -1 if none.
+        """
+        return int(self._header[_RELEASED])
+
+    def release(self, seq: int) -> None:
+        """Tells the writer that the reader is done with every cloud up to and including `seq`. Only the reader may call this.
+        """
+        self._header[_RELEASED] = max(seq, self.released)
+
+    def writable(self) -> bool:
+        """Whether the next :obj:`write` only overwrites released clouds.
+        """
+        return self.head + 1 - self.slots <= self.released
+
+    @property
+    def counters(self) -> tuple[int, int, int, int, int]:
+        """Running totals published by the writer: (bytes received, frames decoded, corrupt frames, frames missing from the frame counter, frames decoded without detected points).
+        """
+        return tuple(int(x) for x in self._header[_BYTES_RECEIVED:])  # type: ignore
+
+    def add_counters(self, bytes_received: int, received: int, corrupt: int, gap: int, empty: int=0) -> None:
+        """Add to the running totals. Only the writer may call this.
+        """
+        self._header[_BYTES_RECEIVED:] += (bytes_received, received, corrupt, gap, empty)
+
+    def write(self, points: np.ndarray, mask: Optional[np.ndarray]=None, metadata: Optional[FrameMetadata]=None) -> int:
+        """Write the next cloud. Only one process may write to a ring.
+
+        Args:
+            points (np.ndarray): Nx4 array of x, y, z, doppler.
+            mask (Optional[np.ndarray], optional): Boolean selection of rows to keep. Defaults to None.
+            metadata (Optional[FrameMetadata], optional): Frame information. Defaults to None.
+
+        Returns:
+            int: Sequence number of the written cloud
+        """
+        seq = self.head + 1
+        slot = seq % self.slots
+        meta = self._meta[slot]
+        meta[_META_SEQ] = _WRITING
+
+        if mask is not None:
+            points = points[mask]
+        count = min(points.shape[0], self.max_points)
+        self._data[slot, :count] = points[:count]
+
+        meta[_META_COUNT] = count
+        if metadata is not None:
+            tlvs = metadata.tlv_types[:_MAX_TLVS]
+            meta[_META_FRAME_NUMBER] = metadata.frame_number
+            meta[_META_TIME_CPU_CYCLES] = metadata.time_cpu_cycles
+            meta[_META_HOST_NS] = metadata.host_timestamp_ns
+            meta[_META_NUM_POINTS] = metadata.num_points
+            meta[_META_PACKET_LEN] = metadata.packet_len
+            meta[_META_NUM_TLVS] = len(tlvs)
+            meta[_META_TLVS:_META_TLVS + len(tlvs)] = tlvs
+        else:
+            meta[_META_FRAME_NUMBER:] = 0
+        meta[_META_SEQ] = seq
+        self._header[_HEAD] = seq
+
+        return seq
+
+    def is_current(self, seq: int) -> bool:
+        """Whether the cloud with this sequence number is still held by the ring.
+        """
+        return int(self._meta[seq % self.slots, _META_SEQ]) == seq
+
+    def view(self, seq: int) -> Optional[np.ndarray]:
+        """Zero-copy view of a cloud.
+
+        Args:
+            seq (int): Sequence number.
+
+        Returns:
+            Optional[np.ndarray]: Nx4 view into shared memory, None if the cloud was already overwritten.
+        """
+        slot = seq % self.slots
+        if not self.is_current(seq):
+            return None
+        return self._data[slot, :int(self._meta[slot, _META_COUNT])]
+
+    def read(self, seq: int, pool: Optional[ArrayPool]=None) -> Optional[tuple[np.ndarray, FrameMetadata]]:
+        """Copies a cloud and its frame information out of the ring. The writer may wrap around to the slot while it is copied,
+        so the slot is checked again once everything was read, and a cloud which changed meanwhile is discarded.
+
+        Args:
+            seq (int): Sequence number.
+            pool (Optional[ArrayPool], optional): Pool to copy the points into, clouds larger than its buffers are copied into new arrays. Defaults to None.
+
+        Returns:
+            Optional[tuple[np.ndarray, FrameMetadata]]: Nx4 points and frame information, None if the cloud was overwritten before or while it was read.
+        """
+        slot = seq % self.slots
+        if not self.is_current(seq):
+            return None
+        count = min(int(self._meta[slot, _META_COUNT]), self.max_points)
+        points = pool.acquire(count) if pool is not None else None
+        if points is None:
+            points = np.empty((count, 4), dtype=self.dtype)
+        points[:] = self._data[slot, :count]
+        metadata = self.metadata(seq)
+
+        if not self.is_current(seq):
+            if pool is not None:
+                pool.release(points)
+            return None
+        return points, metadata
+
+    def metadata(self, seq: int) -> FrameMetadata:
+        """Frame information of a cloud, only meaningful while :obj:`is_current` holds.
+        """
+        meta = [int(x) for x in self._meta[seq % self.slots]]
+        tlvs = tuple(meta[_META_TLVS:_META_TLVS + meta[_META_NUM_TLVS]])
+        return FrameMetadata(meta[_META_FRAME_NUMBER], meta[_META_TIME_CPU_CYCLES], meta[_META_HOST_NS], tlvs, meta[_META_NUM_POINTS], meta[_META_PACKET_LEN])
+
+    def close(self) -> None:
+        """Detach from the shared memory. Outstanding views keep the mapping alive until they are released.
+        """
+        del self._header, self._meta, self._data
+        try:
+            self._shm.close()
+        except BufferError:
+            pass
+
+    def unlink(self) -> None:
+        """Destroy the shared memory block. Only the creator should call this.
+        """
+        self._shm.unlink()
+
+
+def _decode_worker(source: ByteSource, ring_name: str, slots: int, max_points: int, dtype: str, doppler_filtering: float, blocking: bool, conn: Connection, stop: Any,
+                   released: Any) -> None:
+    """Worker process body: frames and decodes the stream, writes clouds to the ring and notifies the parent with the newest sequence number.
+    When blocking, the worker waits for the parent to release a slot instead of overwriting it, and stops reading the source meanwhile.
+    The parent sets `released` whenever it released slots.
+    """
+    ring = SharedCloudRing(slots, max_points, name=ring_name, dtype=dtype)
+    sync = FrameSynchronizer()
+    frame_numbers = FrameNumberTracker()
+    try:
+        source.open()
+        while not stop.is_set():
+            data = source.read()
+            if not data:
+                continue
+
+            timestamp_ns = monotonic_ns()
+            damaged = sync.corrupt_frames
+            sync.feed(data)
+            frames = list(sync.frames())
+            damaged = sync.corrupt_frames - damaged
+            frame_numbers.skip(damaged)
+            seq = -1
+            resyncs = frame_numbers.resyncs
+            received = gap = empty = 0
+            corrupt = damaged
+            for frame in frames:
+                try:
+                    header = parse_header(frame)
+                except StructError:
+                    corrupt += 1
+                    continue
+                gap += frame_numbers.observe(header.frame_number)
+                try:
+                    points = detected_points(frame, header)
+                    tlv_types = tuple(tlv_type for tlv_type, _, _ in iter_tlvs(frame, header))
+                except (ValueError, StructError):
+                    corrupt += 1
+                    continue
+                received += 1
+                if not len(points):
+                    # Like the parent process, frames without detections are not delivered
+                    empty += 1
+                    continue
+
+                valid_doppler = np.greater(np.abs(points[:, 3]), doppler_filtering)
+                metadata = FrameMetadata(header.frame_number, header.time_cpu_cycles, timestamp_ns, tlv_types, header.num_detected_obj, header.total_packet_len)
+                if blocking and not ring.writable():
+                    # The parent must hear about every written cloud before it can release any
+                    if seq >= 0:
+                        conn.send(seq)
+                        seq = -1
+                    while True:
+                        # Cleared before checking, so a release between the check and the wait is not missed
+                        released.clear()
+                        if ring.writable() or stop.is_set():
+                            break
+                        released.wait(_BLOCKED_WAIT)
+                seq = ring.write(points, valid_doppler, metadata)
+
+            corrupt += frame_numbers.resyncs - resyncs
+            ring.add_counters(len(data), received, corrupt, gap, empty)
+            if seq >= 0:
+                conn.send(seq)
+    except (EOFError, BrokenPipeError):
+        pass
+    except Exception as e:
+        try:
+            conn.send(e)
+        except (OSError, ValueError):
+            pass
+    finally:
+        source.close()
+        ring.close()
+        conn.close()
+
+
+class DecodeWorker(object):
+    """Runs framing and TLV decoding for one byte source in a separate process.
+
+    Decoded clouds are published into a :obj:`SharedCloudRing<pymmWave.multiprocess.SharedCloudRing>`, and the parent is
+    notified through a pipe, whose file descriptor can be watched by an event loop with :obj:`fileno`.
+    By default the worker overwrites clouds which were not drained in time, counted in :obj:`dropped`. A blocking worker instead waits
+    until they were drained, leaving unread bytes in the source.
+    """
+    def __init__(self, source: ByteSource, doppler_filtering: float=0, slots: int=64, max_points: int=1024, dtype: Union[np.dtype, Any]=np.float32,
+                 blocking: bool=False):
+        """Set up the worker. Nothing runs until :obj:`start`.
+
+        Args:
+            source (ByteSource): Where the worker reads bytes from, e.g. :obj:`SerialByteSource<pymmWave.multiprocess.SerialByteSource>`.
+            doppler_filtering (float, optional): Points with an absolute doppler at or below this are dropped. Defaults to 0.
+            slots (int, optional): Number of clouds the ring holds. Defaults to 64.
+            max_points (int, optional): Largest cloud held by the ring. Defaults to 1024.
+            dtype (Union[np.dtype, Any], optional): Data type of the decoded points. Defaults to np.float32.
+            blocking (bool, optional): Wait for drained clouds to be released instead of overwriting them. Defaults to False.
+        """
+        self.ring = SharedCloudRing(slots, max_points, dtype=dtype)
+        self._recv, send = Pipe(duplex=False)
+        self._stop = Event()
+        self._released = Event()
+        self._process = Process(target=_decode_worker, args=(source, self.ring.name, slots, max_points, self.ring.dtype.str, doppler_filtering, blocking, send, self._stop, self._released),
+                                daemon=True)
+        self._send = send
+        self._last_seq = -1
+        self.dropped: int = 0
+
+    def start(self) -> None:
+        self._process.start()
+        # The child owns the write end now
+        self._send.close()
+
+    def fileno(self) -> int:
+        """File descriptor which becomes readable when new clouds are available.
+        """
+        return self._recv.fileno()
+
+    def poll(self, timeout: Optional[float]=0) -> bool:
+        return self._recv.poll(timeout)
+
+    def drain(self, pool: Optional[ArrayPool]=None) -> list[tuple[np.ndarray, FrameMetadata]]:
+        """Copies out every cloud published since the previous call, without blocking, then releases their slots to the worker.
+
+        Args:
+            pool (Optional[ArrayPool], optional): Pool to copy the points into. Defaults to None.
+
+        Returns:
+            list[tuple[np.ndarray, FrameMetadata]]: Nx4 points and their frame information, oldest first. Clouds overwritten before or while they were copied are counted in :obj:`dropped`.
+
+        Raises:
+            EOFError: If the worker exited.
+            Exception: Any exception raised within the worker.
+        """
+        head = self._last_seq
+        while self._recv.poll():
+            msg = self._recv.recv()
+            if isinstance(msg, Exception):
+                raise msg
+            head = max(head, msg)
+
+        clouds: list[tuple[np.ndarray, FrameMetadata]] = []
+        for seq in range(self._last_seq + 1, head + 1):
+            cloud = self.ring.read(seq, pool)
+            if cloud is None:
+                self.dropped += 1
+            else:
+                clouds.append(cloud)
+        if head > self._last_seq:
+            self._last_seq = head
+            self.ring.release(head)
+            self._released.set()
+
+        return clouds
+
+    def stop(self, timeout: float=2) -> None:
+        """Stops the worker and releases the ring.
+        """
+        self._stop.set()
+        self._released.set()
+        self._process.join(timeout)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join()
+        self._recv.close()
+        self.ring.close()
+        self.ring.unlink()
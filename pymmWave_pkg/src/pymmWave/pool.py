@@ -0,0 +1,79 @@
+from collections import deque
+from typing import Any, Optional, Union
+
+import numpy as np
+
+
+class ArrayPool(object):
+    """Recycles fixed size point buffers, so decoding a frame does not allocate.
+
+    Every buffer holds up to `max_points` rows of x, y, z, doppler. :obj:`acquire` hands out a view of the first rows of a free buffer,
+    and :obj:`release` takes it back once the consumer is done with it. Buffers which are never released are simply garbage collected,
+    and the pool allocates a replacement when it runs dry, counted in :obj:`allocated`.
+
+    Buffers may be released from any thread.
+
+    Example:
+        >>> pool = ArrayPool(max_points=1024)
+        >>> points = pool.acquire(100)
+        >>> pool.release(points)
+        True
+    """
+    def __init__(self, max_points: int=1024, buffers: int=64, dtype: Union[np.dtype, Any]=np.float32):
+        """Preallocate the buffers.
+
+        Args:
+            max_points (int, optional): Rows per buffer. Larger requests are not served by the pool. Defaults to 1024.
+            buffers (int, optional): Number of buffers allocated up front, and the most the pool holds on to. Defaults to 64.
+            dtype (Union[np.dtype, Any], optional): Data type of the buffers. Defaults to np.float32.
+        """
+        assert max_points > 0 and buffers > 0
+        self.max_points = max_points
+        self.buffers = buffers
+        self.dtype = np.dtype(dtype)
+        # Buffers created because the pool was empty, a steadily rising count means it is too small
+        self.allocated: int = 0
+        self._free: deque[np.ndarray] = deque(self._new() for _ in range(buffers))
+
+    def _new(self) -> np.ndarray:
+        return np.empty((self.max_points, 4), dtype=self.dtype)
+
+    def __len__(self) -> int:
+        """Number of free buffers.
+        """
+        return len(self._free)
+
+    def acquire(self, n: int) -> Optional[np.ndarray]:
+        """Get an uninitialized Nx4 array backed by a pooled buffer.
+
+        Args:
+            n (int): Number of rows.
+
+        Returns:
+            Optional[np.ndarray]: View of the first `n` rows of a buffer, None if `n` is larger than max_points.
+        """
+        if n > self.max_points:
+            return None
+        try:
+            buffer = self._free.pop()
+        except IndexError:
+            buffer = self._new()
+            self.allocated += 1
+        return buffer[:n]
+
+    def release(self, array: np.ndarray) -> bool:
+        """Return an array obtained from :obj:`acquire`. It must not be used afterwards.
+
+        Args:
+            array (np.ndarray): The array, or its whole buffer.
+
+        Returns:
+            bool: False if the array does not belong to a buffer of this pool's shape and type, or the pool is already full.
+        """
+        buffer = array if array.base is None else array.base
+        if not isinstance(buffer, np.ndarray) or buffer.shape != (self.max_points, 4) or buffer.dtype != self.dtype:
+            return False
+        if len(self._free) >= self.buffers:
+            return False
+        self._free.append(buffer)
+        return True
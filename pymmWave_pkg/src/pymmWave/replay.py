@@ -0,0 +1,231 @@
+from asyncio import Event as AsyncEvent, sleep
+from mmap import ACCESS_READ, mmap
+from time import monotonic_ns
+from typing import Optional
+
+import numpy as np
+
+from .IWR6843AOP import IWR6843AOP
+from .capture import build_index, load_index
+
+# Largest number of bytes handed to the decoder at once when replaying as fast as possible.
+_MAX_SPEED_CHUNK: int = 1 << 16
+
+
+class ReplaySensor(IWR6843AOP):
+    """Plays back a raw capture, as written by :obj:`IWR6843AOP.start_recording<pymmWave.IWR6843AOP.IWR6843AOP.start_recording>`, through the exact framing, decoding and delivery path of a live :obj:`IWR6843AOP<pymmWave.IWR6843AOP.IWR6843AOP>`.
+
+    The capture is memory-mapped, so replaying days of data never reads a whole file into memory. Frames are located with the capture's sidecar index,
+    which is rebuilt by scanning the capture if it is missing. Replay runs at the recorded pace, scaled by `speed`, or as fast as the consumer allows.
+    Delivery, filtering, statistics and instrumentation are configured exactly as on a live sensor. Serial port, reader thread and process decode settings have no effect.
+
+    For lossless replay as fast as possible, use a blocking delivery policy, otherwise frames are evicted as soon as they outpace the consumer.
+
+    Example:
+        >>> sensor = ReplaySensor('session.bin', speed=None)
+        >>> sensor.configure_delivery(DeliveryPolicy.BLOCKING, 64)
+        True
+        >>> asyncio.create_task(sensor.start_sensor())
+    """
+    def __init__(self, path: str, name: Optional[str]=None, speed: Optional[float]=1.0, loop: bool=False, default_fps: float=10.0, verbose: bool=False):
+        """Open a capture for replay.
+
+        Args:
+            path (str): Capture file path.
+            name (Optional[str], optional): Public name of the sensor. Defaults to the capture path.
+            speed (Optional[float], optional): Playback rate relative to the recording, None replays as fast as possible. Defaults to 1.0.
+            loop (bool, optional): Restart from the beginning at the end of the capture. Defaults to False.
+            default_fps (float, optional): Pace used for captures without host timestamps, e.g. when the index was rebuilt. Defaults to 10.0.
+            verbose (bool, optional): Print out extra information. Defaults to False.
+
+        Raises:
+            ValueError: If the capture is empty or `speed` is not positive.
+        """
+        super().__init__(path if name is None else name, verbose)
+        if speed is not None and speed <= 0:
+            raise ValueError("Replay speed must be positive.")
+
+        self.path = path
+        self._speed = speed
+        self._loop = loop
+        self._default_period_ns = int(1e9 / default_fps)
+
+        try:
+            self._index: np.ndarray = load_index(path)
+        except FileNotFoundError:
+            if verbose: self.log(f"No index for {path}, scanning the capture.")
+            self._index = build_index(path)
+
+        self._file = open(path, 'rb')
+        try:
+            self._mm: Optional[mmap] = mmap(self._file.fileno(), 0, access=ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{path} is an empty capture.")
+
+        self._ends: np.ndarray = self._index['offset'] + self._index['length']
+        self._timed: bool = bool(len(self._index)) and bool(self._index['host_ns'][-1])
+        # Next frame to replay, and the first byte which was not fed to the decoder yet
+        self._position: int = 0
+        self._byte_pos: int = 0
+        self._seeked: bool = False
+
+        self._is_alive = True
+        self._config_sent = True
+
+    def model(self) -> str:
+        """Returns the model of the replayed sensor.
+
+        Returns:
+            str: "IWR6843AOP replay"
+        """
+        return f"{super().model()} replay"
+
+    def _update_alive(self):
+        self._is_alive = self._mm is not None
+
+    def __len__(self) -> int:
+        """Number of frames in the capture.
+        """
+        return len(self._index)
+
+    def tell(self) -> int:
+        """Position of the next frame to be replayed, counted in frames from the start of the capture.
+        """
+        return self._position
+
+    def seek(self, position: int) -> bool:
+        """Continue replay from a frame position, as counted by :obj:`tell`.
+
+        Args:
+            position (int): Frame position, between 0 and len(sensor).
+
+        Returns:
+            bool: success
+        """
+        if not 0 <= position <= len(self._index):
+            return False
+
+        self._position = position
+        if position < len(self._index):
+            self._byte_pos = int(self._index['offset'][position])
+        else:
+            # Past the last frame, or the start of a capture without any complete frame
+            self._byte_pos = int(self._ends[-1]) if position else 0
+        self._seeked = True
+
+        return True
+
+    def seek_frame(self, frame_number: int) -> bool:
+        """Continue replay from the first frame whose device frame number is at least `frame_number`.
+
+        Args:
+            frame_number (int): Device frame number.
+
+        Returns:
+            bool: False if there is no such frame.
+        """
+        matches = np.flatnonzero(self._index['frame_number'] >= frame_number)
+        return bool(len(matches)) and self.seek(int(matches[0]))
+
+    def seek_time(self, seconds: float) -> bool:
+        """Continue replay from the first frame received at least `seconds` after the first frame of the capture.
+
+        Args:
+            seconds (float): Offset into the recording.
+
+        Returns:
+            bool: False if the capture is shorter, or has no host timestamps.
+        """
+        if not self._timed:
+            return False
+        host_ns = self._index['host_ns']
+        position = int(np.searchsorted(host_ns, host_ns[0] + int(seconds * 1e9)))
+        return position < len(host_ns) and self.seek(position)
+
+    def _frame_time_ns(self, position: int) -> int:
+        if self._timed:
+            return int(self._index['host_ns'][position])
+        return position * self._default_period_ns
+
+    def _feed(self, start: int, end: int) -> None:
+        """Decodes and publishes the frames from position `start` up to `end`.
+        Frames of a timed capture keep their recorded host timestamps, and frames which were received in one read are decoded together, as they were live.
+        """
+        stops = [end]
+        if self._timed:
+            host_ns = self._index['host_ns']
+            recorded = host_ns[start:end]
+            stops = [start + 1 + int(i) for i in np.flatnonzero(recorded[1:] != recorded[:-1])] + stops
+
+        for stop in stops:
+            byte_stop = int(self._ends[stop - 1])
+            data = self._mm[self._byte_pos:byte_stop]  # type: ignore
+            self._byte_pos = byte_stop
+            self._position = stop
+            self._on_data(data, monotonic_ns(), int(host_ns[stop - 1]) if self._timed else None)
+
+    async def start_sensor(self) -> None:
+        """Replays the capture, decoding and publishing it as :obj:`IWR6843AOP.start_sensor<pymmWave.IWR6843AOP.IWR6843AOP.start_sensor>` would.
+        Point clouds carry the host timestamps of the recording in their metadata, or the time of replay if the capture has none.
+        Returns at the end of the capture, unless looping.
+
+        Raises:
+            Exception: If the replay was stopped.
+        """
+        if not self.is_alive():
+            raise Exception("Replay is closed")
+
+        self._sync.reset()
+        self._frame_numbers.reset()
+        self._backlog.clear()
+        flow = AsyncEvent()
+        flow.set()
+        self._pause_reading, self._resume_reading = flow.clear, flow.set
+        # Pacing is anchored at the first frame replayed after starting or seeking
+        anchor: Optional[tuple[int, int]] = None
+        try:
+            while self._mm is not None:
+                if self._position >= len(self._index):
+                    if not self._loop or not len(self._index):
+                        return
+                    self.seek(0)
+
+                await flow.wait()
+                if self._seeked:
+                    # Partial frames from before the seek must not be joined with the new position
+                    self._sync.reset()
+                    self._frame_numbers.reset()
+                    self._seeked = False
+                    anchor = None
+
+                start = self._position
+                if self._speed is None:
+                    end = max(start + 1, int(np.searchsorted(self._ends, self._byte_pos + _MAX_SPEED_CHUNK, side='right')))
+                else:
+                    end = start + 1
+                    recorded = self._frame_time_ns(start)
+                    if anchor is None:
+                        anchor = (monotonic_ns(), recorded)
+                    delay = anchor[0] + (recorded - anchor[1]) / self._speed - monotonic_ns()
+                    if delay > 0:
+                        await sleep(delay / 1e9)
+                        if self._seeked or self._mm is None:
+                            continue
+
+                self._feed(start, end)
+                if self._speed is None:
+                    # Let consumers run between chunks
+                    await sleep(0)
+        finally:
+            self._pause_reading = self._resume_reading = self._noop
+
+    def stop_sensor(self):
+        """Closes the capture. Replay stops, and the sensor cannot be restarted.
+        """
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+            self._file.close()
+        self._update_alive()
+        self.stop_recording()
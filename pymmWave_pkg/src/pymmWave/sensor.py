@@ -1,7 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import Optional, Any
-from .data_model import DataModel
+from asyncio import wait_for, TimeoutError as AsyncTimeoutError
+from time import monotonic
+from typing import AsyncIterator, Optional, Any
+from .data_model import DataModel, DopplerPointCloud, FrameMetadata, PointCloudBatch
+from .stats import SensorStatistics
 from scipy.spatial.transform.rotation import Rotation
+from .transform import RigidTransform
 from enum import Enum
 from .logging import Logger, StdOutLogger
 
@@ -106,15 +110,109 @@ class Sensor(ABC):
         """
         pass
 
+    def get_statistics(self) -> Optional[SensorStatistics]:
+        """Returns throughput and frame loss statistics, for sensors which collect them.
+
+        Returns:
+            Optional[SensorStatistics]: Current statistics, None if the sensor does not support them.
+        """
+        return None
+
+    def transfer_delay_ns(self, metadata: FrameMetadata) -> int:
+        """Delay between the sensor sending a frame and the host receiving all of it, for sensors which can estimate it.
+
+        Args:
+            metadata (FrameMetadata): Frame information of a point cloud from this sensor.
+
+        Returns:
+            int: Nanoseconds, 0 if unknown.
+        """
+        return 0
+
+    async def stream(self) -> AsyncIterator[DataModel]:
+        """Asynchronous iterator over the sensor's data.
+
+        Example:
+            >>> async for cloud in sensor.stream():
+            ...     print(cloud.get().shape)
+
+        Yields:
+            DataModel: Data as returned by :obj:`get_data`.
+        """
+        while True:
+            yield await self.get_data()
+
+    async def get_batch(self, n: int, timeout: Optional[float]=None) -> PointCloudBatch:
+        """Collects up to `n` frames from a point cloud sensor into a single :obj:`PointCloudBatch<pymmWave.data_model.PointCloudBatch>`.
+        Returns as soon as `n` frames were collected or `timeout` expired, whichever comes first. Frames which are already available are taken without waiting.
+        Implementations may override this with something cheaper than calling :obj:`get_data` once per frame.
+
+        Args:
+            n (int): Largest number of frames to collect.
+            timeout (Optional[float], optional): Seconds to wait at most, None waits for `n` frames. Defaults to None.
+
+        Returns:
+            PointCloudBatch: The collected frames, possibly none.
+        """
+        clouds: list[DopplerPointCloud] = []
+        deadline = None if timeout is None else monotonic() + timeout
+        while len(clouds) < n:
+            data = self.get_data_nowait()
+            if data is None:
+                remaining = None if deadline is None else deadline - monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                try:
+                    data = await wait_for(self.get_data(), remaining)
+                except AsyncTimeoutError:
+                    break
+            clouds.append(data)  # type: ignore
+
+        return PointCloudBatch.from_clouds(clouds)
+
 class SpatialSensor(object):
-    """Wrapper to provide the notion of a sensor in space
+    """Wrapper to provide the notion of a sensor in space.
+    The sensor's points are rotated by `pitch_rads`, then moved to `location`, which places them in the world frame. That transform is precomputed as :obj:`extrinsic`.
     """
     def __init__(self, sens: Sensor, location: tuple[float, float, float], pitch_rads: tuple[float, float, float]):
         self.sensor = sens
-        self.location = location
+        self._location = location
         
         # This speeds up code later
-        self.pitch_rads: Rotation = Rotation.from_rotvec(pitch_rads) #type: ignore
+        self._pitch_rads: Rotation = Rotation.from_rotvec(pitch_rads) #type: ignore
+        self._update_extrinsic()
+
+    def _update_extrinsic(self) -> None:
+        self.extrinsic: RigidTransform = RigidTransform(self._pitch_rads, self._location)
+
+    @property
+    def location(self) -> tuple[float, float, float]:
+        return self._location
+
+    @location.setter
+    def location(self, location: tuple[float, float, float]) -> None:
+        self._location = location
+        self._update_extrinsic()
+
+    @property
+    def pitch_rads(self) -> Rotation:
+        return self._pitch_rads
+
+    @pitch_rads.setter
+    def pitch_rads(self, pitch_rads: Rotation) -> None:
+        self._pitch_rads = pitch_rads
+        self._update_extrinsic()
+
+    def to_world(self, cloud: DopplerPointCloud) -> DopplerPointCloud:
+        """Moves a point cloud of this sensor into the world frame, in-place.
+
+        Args:
+            cloud (DopplerPointCloud): Point cloud from :obj:`sensor`.
+
+        Returns:
+            DopplerPointCloud: The same cloud.
+        """
+        return cloud.transform(self.extrinsic)
 
 
 class InvalidSensorException(Exception):
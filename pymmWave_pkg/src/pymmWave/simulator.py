@@ -0,0 +1,257 @@
+import os
+import tty
+from select import select
+from threading import Event, Thread
+from time import monotonic, sleep
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+
+from .constants import CLI_ALREADY_STOPPED, CLI_DONE, CLI_PROMPT, MAGIC_NUMBER, TLV_type
+# The parser's own header layouts, so frames are built exactly as they are parsed
+from .framing import FRAME_HEADER, FRAME_HEADER_LEN, TLV_HEADER
+
+# Header values reported by the mmWave SDK 3.5 out of box demo on an IWR6843AOP.
+DEFAULT_VERSION: int = 0x03050004
+DEFAULT_PLATFORM: int = 0xA6843
+
+# The firmware pads every frame to a multiple of this many bytes.
+FRAME_ALIGNMENT: int = 32
+
+
+def build_frame(frame_number: int, points: np.ndarray, extra_tlvs: Iterable[tuple[int, bytes]]=(), time_cpu_cycles: int=0,
+                version: int=DEFAULT_VERSION, platform: int=DEFAULT_PLATFORM) -> bytes:
+    """Encodes a frame exactly as the out of box demo firmware sends it on the data port.
+
+    Args:
+        frame_number (int): Frame counter.
+        points (np.ndarray): Nx4 array of x, y, z, doppler. Written as a detected points TLV, omitted if empty.
+        extra_tlvs (Iterable[tuple[int, bytes]], optional): Further (TLV type, payload) pairs, written after the detected points. Defaults to ().
+        time_cpu_cycles (int, optional): Device timestamp. Defaults to 0.
+        version (int, optional): SDK version field. Defaults to DEFAULT_VERSION.
+        platform (int, optional): Platform field. Defaults to DEFAULT_PLATFORM.
+
+    Returns:
+        bytes: The frame, padded to FRAME_ALIGNMENT.
+    """
+    tlvs: list[bytes] = []
+    if len(points):
+        payload = np.ascontiguousarray(points, dtype='<f4').tobytes()
+        tlvs += [TLV_HEADER.pack(TLV_type.MMWDEMO_OUTPUT_MSG_DETECTED_POINTS.value, len(payload)), payload]
+    for tlv_type, payload in extra_tlvs:
+        tlvs += [TLV_HEADER.pack(tlv_type, len(payload)), payload]
+    body = b''.join(tlvs)
+
+    length = FRAME_HEADER_LEN + len(body)
+    padding = -length % FRAME_ALIGNMENT
+    header = FRAME_HEADER.pack(version, length + padding, platform, frame_number, time_cpu_cycles, len(points), len(tlvs) // 2, 0)
+
+    return MAGIC_NUMBER + header + body + b'\x0f' * padding
+
+
+class FrameGenerator(object):
+    """Produces a reproducible stream of synthetic frames, optionally with injected corruption.
+
+    Corrupted frames are damaged in one of the ways seen on real links: truncated, a length field which is out of range,
+    random bytes inserted ahead of the frame, or a flipped byte in the payload.
+    """
+    CORRUPTIONS: tuple[str, ...] = ('truncate', 'length', 'garbage', 'bitflip')
+
+    def __init__(self, points: int=100, extra_tlvs: Sequence[int]=(), extra_tlv_size: int=24, corruption: float=0.0, seed: Optional[int]=0):
+        """Set up the generator.
+
+        Args:
+            points (int, optional): Points per frame. Defaults to 100.
+            extra_tlvs (Sequence[int], optional): Types of additional TLVs added to every frame, filled with random bytes. Defaults to ().
+            extra_tlv_size (int, optional): Payload size of each additional TLV. Defaults to 24.
+            corruption (float, optional): Probability of each frame being corrupted. Defaults to 0.0.
+            seed (Optional[int], optional): Random seed, None for a different stream every time. Defaults to 0.
+        """
+        assert 0 <= corruption <= 1
+        self.points = points
+        self.extra_tlvs = tuple(extra_tlvs)
+        self.extra_tlv_size = extra_tlv_size
+        self.corruption = corruption
+        self._rng = np.random.default_rng(seed)
+        self.frame_number: int = 0
+        self.corrupted: int = 0
+
+    def points_for(self, n: int) -> np.ndarray:
+        """Random points spread over a typical indoor field of view, with a nonzero doppler.
+        """
+        pts = np.empty((n, 4), dtype='<f4')
+        pts[:, 0] = self._rng.uniform(-4, 4, n)
+        pts[:, 1] = self._rng.uniform(0.2, 8, n)
+        pts[:, 2] = self._rng.uniform(-1, 2, n)
+        pts[:, 3] = self._rng.choice((-1, 1), n) * self._rng.uniform(0.05, 1.2, n)
+        return pts
+
+    def next_frame(self) -> bytes:
+        """Builds the next frame and advances the frame counter.
+        """
+        extra = [(t, self._rng.bytes(self.extra_tlv_size)) for t in self.extra_tlvs]
+        frame = build_frame(self.frame_number, self.points_for(self.points), extra, time_cpu_cycles=self.frame_number * 1000)
+        self.frame_number += 1
+
+        if self.corruption and self._rng.random() < self.corruption:
+            frame = self._corrupt(frame)
+            self.corrupted += 1
+        return frame
+
+    def frames(self, n: int) -> bytes:
+        """A run of `n` consecutive frames.
+        """
+        return b''.join(self.next_frame() for _ in range(n))
+
+    def _corrupt(self, frame: bytes) -> bytes:
+        kind = self.CORRUPTIONS[int(self._rng.integers(len(self.CORRUPTIONS)))]
+        if kind == 'truncate':
+            return frame[:int(self._rng.integers(len(MAGIC_NUMBER), len(frame)))]
+        if kind == 'length':
+            # totalPacketLen follows the magic number and version
+            return frame[:12] + b'\xff\xff\xff\xff' + frame[16:]
+        if kind == 'garbage':
+            return self._rng.bytes(int(self._rng.integers(1, 64))) + frame
+        damaged = bytearray(frame)
+        damaged[int(self._rng.integers(FRAME_HEADER_LEN, len(frame)))] ^= 0xFF
+        return bytes(damaged)
+
+
+class PtySimulator(object):
+    """Simulates an IWR6843AOP evaluation board on a pair of pseudo-terminals, so the real serial code paths run without hardware.
+
+    The config port answers CLI commands like the out of box demo: it echoes the command, replies "Done"
+    (or "Ignored: Sensor is already stopped"), and prints the prompt. After `sensorStart` the data port streams frames from a
+    :obj:`FrameGenerator<pymmWave.simulator.FrameGenerator>` until `sensorStop`. Baud rates are ignored by pseudo-terminals,
+    so the stream can run far faster than a real board. POSIX only.
+
+    Damaged frames are injected through the generator's `corruption`, a hung device with :obj:`stall` and :obj:`resume`.
+
+    Example:
+        >>> with PtySimulator(fps=1000) as sim:
+        ...     sensor.connect_config(sim.config_port, 115200)
+        ...     sensor.connect_data(sim.data_port, 921600)
+        ...     sensor.send_config(EXAMPLE_CONFIG)
+    """
+    def __init__(self, fps: Optional[float]=20.0, generator: Optional[FrameGenerator]=None, chunk_frames: int=1):
+        """Create the pseudo-terminals. Nothing is answered or streamed until :obj:`start`.
+
+        Args:
+            fps (Optional[float], optional): Frames per second once started, None streams as fast as the reader consumes. Defaults to 20.0.
+            generator (Optional[FrameGenerator], optional): Source of frames. Defaults to a FrameGenerator with default settings.
+            chunk_frames (int, optional): Frames written per write call. Defaults to 1.
+        """
+        self.fps = fps
+        self.generator = generator if generator is not None else FrameGenerator()
+        self.chunk_frames = chunk_frames
+        self.commands: list[str] = []
+        self.frames_sent: int = 0
+        self.bytes_sent: int = 0
+
+        self._cli_master, self._cli_slave = os.openpty()
+        self._data_master, self._data_slave = os.openpty()
+        for fd in (self._cli_slave, self._data_slave):
+            tty.setraw(fd)
+        self.config_port: str = os.ttyname(self._cli_slave)
+        self.data_port: str = os.ttyname(self._data_slave)
+
+        self._closed = Event()
+        self._streaming = Event()
+        self._stalled: bool = False
+        self._threads = [Thread(target=self._serve_cli, name='simulator-cli', daemon=True),
+                         Thread(target=self._stream, name='simulator-data', daemon=True)]
+
+    def start(self) -> 'PtySimulator':
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    @property
+    def streaming(self) -> bool:
+        return self._streaming.is_set()
+
+    def stall(self, until_resumed: bool=True) -> None:
+        """Stops the stream as if the device hung. CLI commands are still answered.
+
+        Args:
+            until_resumed (bool, optional): Also keep `sensorStart` from restarting the stream until :obj:`resume` is called, as a device which does not recover when it is reconfigured. Defaults to True.
+        """
+        self._stalled = until_resumed
+        self._streaming.clear()
+
+    def resume(self) -> None:
+        """Ends a :obj:`stall`, the next `sensorStart` restarts the stream.
+        """
+        self._stalled = False
+
+    def _reply(self, command: str) -> str:
+        name = command.split(' ', 1)[0]
+        if name == 'sensorStop':
+            if not self._streaming.is_set():
+                return CLI_ALREADY_STOPPED
+            self._streaming.clear()
+        elif name == 'sensorStart' and not self._stalled:
+            self._streaming.set()
+        return CLI_DONE
+
+    def _serve_cli(self) -> None:
+        pending = b''
+        while not self._closed.is_set():
+            if not select([self._cli_master], [], [], .1)[0]:
+                continue
+            try:
+                pending += os.read(self._cli_master, 4096)
+            except OSError:
+                return
+            *lines, pending = pending.split(b'\n')
+            for raw in lines:
+                command = raw.decode('utf-8', 'replace').strip()
+                if not command:
+                    continue
+                self.commands.append(command)
+                reply = f"{command}\n{self._reply(command)}\n{CLI_PROMPT}"
+                os.write(self._cli_master, reply.encode())
+
+    def _stream(self) -> None:
+        period = None if self.fps is None else self.chunk_frames / self.fps
+        deadline = monotonic()
+        while not self._closed.is_set():
+            if not self._streaming.wait(.1):
+                deadline = monotonic()
+                continue
+            data = self.generator.frames(self.chunk_frames)
+            try:
+                os.write(self._data_master, data)
+            except OSError:
+                return
+            self.frames_sent += self.chunk_frames
+            self.bytes_sent += len(data)
+
+            if period is not None:
+                deadline += period
+                delay = deadline - monotonic()
+                if delay > 0:
+                    sleep(delay)
+                else:
+                    # Running late, do not try to catch up with a burst
+                    deadline = monotonic()
+
+    def close(self) -> None:
+        """Stop both threads and close the pseudo-terminals.
+        """
+        self._closed.set()
+        self._streaming.clear()
+        for thread in self._threads:
+            if thread.is_alive():
+                thread.join(1)
+        for fd in (self._cli_master, self._cli_slave, self._data_master, self._data_slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def __enter__(self) -> 'PtySimulator':
+        return self.start()
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
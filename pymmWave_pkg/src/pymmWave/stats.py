@@ -0,0 +1,290 @@
+from time import monotonic_ns
+from typing import NamedTuple, Optional
+
+# A UART byte is sent as 10 bits: start bit, 8 data bits, stop bit.
+BITS_PER_BYTE: int = 10
+
+def transfer_time_ns(num_bytes: int, baud_rate: Optional[int]) -> int:
+    """Time taken to send `num_bytes` over a UART, 0 if the baud rate is unknown.
+    """
+    return num_bytes * BITS_PER_BYTE * 1_000_000_000 // baud_rate if baud_rate else 0
+
+
+# Frame numbers are uint32 on the wire.
+_FRAME_NUMBER_MOD: int = 1 << 32
+
+# Largest jump in the frame counter taken as frames lost on the link. Anything larger is a damaged frame number or a device restart.
+MAX_FRAME_GAP: int = 1024
+
+
+class RateWindow(object):
+    """Event rate over a sliding time window.
+
+    Events are summed into a fixed number of time buckets, so adding is O(1) and memory does not grow with the event rate.
+    The rate is exact to within one bucket, i.e. `window_s / buckets` seconds.
+    """
+    __slots__ = ('_bucket_ns', '_counts', '_current', '_start_ns', 'total')
+
+    def __init__(self, window_s: float=5.0, buckets: int=20, now_ns: Optional[int]=None):
+        """Create an empty window.
+
+        Args:
+            window_s (float, optional): Length of the window in seconds. Defaults to 5.0.
+            buckets (int, optional): Resolution of the window. Defaults to 20.
+            now_ns (Optional[int], optional): Start time, as time.monotonic_ns(). Defaults to now.
+        """
+        assert window_s > 0 and buckets > 0
+        self._bucket_ns: int = max(1, int(window_s * 1e9 / buckets))
+        self._counts: list[int] = [0] * buckets
+        self._start_ns: int = monotonic_ns() if now_ns is None else now_ns
+        # Absolute number of the newest bucket
+        self._current: int = self._start_ns // self._bucket_ns
+        self.total: int = 0
+
+    def _advance(self, now_ns: int) -> None:
+        bucket = now_ns // self._bucket_ns
+        if bucket > self._current:
+            n = len(self._counts)
+            for b in range(max(self._current + 1, bucket - n + 1), bucket + 1):
+                self._counts[b % n] = 0
+            self._current = bucket
+
+    def add(self, n: int, now_ns: int) -> None:
+        """Count `n` events happening at `now_ns`.
+        """
+        self._advance(now_ns)
+        self._counts[self._current % len(self._counts)] += n
+        self.total += n
+
+    def rate(self, now_ns: int) -> float:
+        """Events per second over the window ending at `now_ns`, or since creation if that is shorter.
+        """
+        self._advance(now_ns)
+        # The newest bucket has only partially elapsed
+        span = (len(self._counts) - 1) * self._bucket_ns + now_ns - self._current * self._bucket_ns
+        span = min(span, now_ns - self._start_ns)
+        if span <= 0:
+            return 0.0
+        return sum(self._counts) * 1e9 / span
+
+
+class FrameNumberTracker(object):
+    """Detects frames lost before they reached the host, from gaps in the device frame counter.
+
+    A frame number which does not move forward by at most `max_gap` (a repeat, a jump backwards or far ahead) is not counted as a gap.
+    It is counted in :obj:`resyncs` instead, and becomes the new baseline once the following frame continues from it, as after a device restart.
+    Otherwise it is taken to be a damaged frame number and the old baseline is kept.
+    """
+    def __init__(self, max_gap: int=MAX_FRAME_GAP) -> None:
+        """Initialize the tracker.
+
+        Args:
+            max_gap (int, optional): Largest number of consecutive frames considered lost rather than a resync. Defaults to MAX_FRAME_GAP.
+        """
+        self.max_gap = max_gap
+        self._last: Optional[int] = None
+        # Out of sequence frame number which may be a new baseline
+        self._candidate: Optional[int] = None
+        # Out of sequence frames since the last frame in sequence, each stands in for one frame number
+        self._out_of_sequence: int = 0
+        # Frames dropped before their number was read, not yet matched to a gap
+        self._skipped: int = 0
+        self.resyncs: int = 0
+
+    def _follows(self, previous: int, frame_number: int) -> bool:
+        return 0 < (frame_number - previous) % _FRAME_NUMBER_MOD <= self.max_gap + 1
+
+    def observe(self, frame_number: int) -> int:
+        """Record a frame number.
+
+        Args:
+            frame_number (int): Frame counter from the frame header.
+
+        Returns:
+            int: Number of frames missing between the previous frame number and this one.
+        """
+        last = self._last
+        if last is None:
+            self._last = frame_number
+            return 0
+
+        if self._follows(last, frame_number):
+            # uint32 wrap around is handled by the modulo. Frames with damaged numbers were already counted as resyncs.
+            missing = (frame_number - last - 1) % _FRAME_NUMBER_MOD
+            missing -= min(missing, self._out_of_sequence)
+            skipped = min(missing, self._skipped)
+            self._skipped -= skipped
+            missing -= skipped
+            self._last = frame_number
+            self._candidate = None
+            self._out_of_sequence = 0
+            return missing
+
+        if self._candidate is not None and self._follows(self._candidate, frame_number):
+            # The counter really did jump, continue from here. The jump was already counted.
+            self._last = frame_number
+            self._candidate = None
+            self._out_of_sequence = 0
+            self._skipped = 0
+            return 0
+
+        self._candidate = frame_number
+        self._out_of_sequence += 1
+        self.resyncs += 1
+        return 0
+
+    def skip(self, n: int) -> None:
+        """Record frames which were dropped before their frame number could be read, e.g. by the synchronizer.
+        They are already counted as corrupt, so the next `n` missing frame numbers are not counted as gaps.
+        """
+        self._skipped += n
+
+    def reset(self) -> None:
+        self._last = None
+        self._candidate = None
+        self._out_of_sequence = 0
+        self._skipped = 0
+
+
+class SensorStatistics(NamedTuple):
+    """Throughput and loss of a sensor pipeline. Rates are taken over the last `window_s` seconds, counts are totals.
+
+    A frame produced by the device ends up either delivered to the consumer, evicted by the delivery policy before it was read,
+    received without any detected points (empty, never delivered), received but undecodable (corrupt), or never seen at all (gap in the device frame counter).
+    """
+    # Frames per second produced by the device: received, corrupt and lost to gaps.
+    device_fps: float
+    # Frames per second retrieved by the consumer.
+    delivered_fps: float
+    # Bytes per second received on the data port.
+    bytes_per_s: float
+    # Fraction of the configured baud rate in use, None if the baud rate is unknown.
+    link_utilisation: Optional[float]
+    # Frames decoded successfully, including empty frames.
+    frames_received: int
+    # Frames retrieved by the consumer.
+    frames_delivered: int
+    bytes_received: int
+    # Frames decoded but never read by the consumer, because the delivery policy discarded them.
+    dropped_evicted: int
+    # Frames which were received but could not be decoded, were dropped by the frame synchronizer as damaged, or carried an implausible frame number.
+    dropped_corrupt: int
+    # Frames missing from the device frame counter which were never received at all.
+    dropped_gap: int
+    window_s: float
+    # Times the sensor was reconnected after a failure or stall, see SensorSupervisor.
+    reconnects: int = 0
+    # Seconds from detecting the most recent failure until frames arrived again, None if there was no recovery.
+    last_recovery_s: Optional[float] = None
+    # Seconds spent recovering, over every reconnect.
+    recovery_s: float = 0.0
+    # Frames decoded without any detected points. They are counted in frames_received but not delivered, nor counted as dropped.
+    frames_empty: int = 0
+
+    @property
+    def dropped(self) -> int:
+        return self.dropped_evicted + self.dropped_corrupt + self.dropped_gap
+
+    @property
+    def drop_rate(self) -> float:
+        """Fraction of the frames produced by the device which were not delivered for any of the tracked reasons.
+        """
+        produced = self.frames_received + self.dropped_corrupt + self.dropped_gap
+        return self.dropped / produced if produced else 0.0
+
+
+class PipelineStatistics(object):
+    """Collects the counts behind :obj:`SensorStatistics<pymmWave.stats.SensorStatistics>`.
+
+    The decoding side (bytes and frames) and the consumer side (deliveries) may be updated from different threads.
+    """
+    def __init__(self, window_s: float=5.0):
+        """Start collecting.
+
+        Args:
+            window_s (float, optional): Window over which rates are measured, in seconds. Defaults to 5.0.
+        """
+        now = monotonic_ns()
+        self.window_s = window_s
+        self._bytes = RateWindow(window_s, now_ns=now)
+        self._device_frames = RateWindow(window_s, now_ns=now)
+        self._delivered = RateWindow(window_s, now_ns=now)
+        self.frames_received: int = 0
+        self.frames_empty: int = 0
+        self.dropped_corrupt: int = 0
+        self.dropped_gap: int = 0
+        self.dropped_evicted: int = 0
+        # Time of the last read which decoded a frame, for stall detection
+        self.last_frame_ns: int = now
+        self.reconnects: int = 0
+        self.last_recovery_ns: Optional[int] = None
+        self.recovery_ns: int = 0
+
+    def add_bytes(self, n: int, now_ns: int) -> None:
+        self._bytes.add(n, now_ns)
+
+    def add_frames(self, received: int, corrupt: int, gap: int, now_ns: int, empty: int=0) -> None:
+        """Record the outcome of decoding one read.
+
+        Args:
+            received (int): Frames decoded, including empty ones.
+            corrupt (int): Frames which failed to decode, were dropped by the frame synchronizer, or carried an implausible frame number.
+            gap (int): Frames missing from the device frame counter.
+            now_ns (int): Time of the read, as time.monotonic_ns().
+            empty (int, optional): Of the frames decoded, those without any detected points. Defaults to 0.
+        """
+        self.frames_received += received
+        self.frames_empty += empty
+        if received:
+            self.last_frame_ns = now_ns
+        self.dropped_corrupt += corrupt
+        self.dropped_gap += gap
+        self._device_frames.add(received + corrupt + gap, now_ns)
+
+    def add_evicted(self, n: int) -> None:
+        """Record frames which were decoded but discarded before reaching the delivery ring.
+        """
+        self.dropped_evicted += n
+
+    def add_recovery(self, duration_ns: int) -> None:
+        """Record a reconnect which took `duration_ns` from detecting the failure until frames arrived again.
+        """
+        self.reconnects += 1
+        self.last_recovery_ns = duration_ns
+        self.recovery_ns += duration_ns
+
+    def add_delivered(self, n: int, now_ns: int) -> None:
+        self._delivered.add(n, now_ns)
+
+    def delivered_rate(self, now_ns: Optional[int]=None) -> float:
+        return self._delivered.rate(monotonic_ns() if now_ns is None else now_ns)
+
+    def snapshot(self, baud_rate: Optional[int]=None, evicted: int=0) -> SensorStatistics:
+        """Current statistics.
+
+        Args:
+            baud_rate (Optional[int], optional): Configured baud rate of the data port. Defaults to None.
+            evicted (int, optional): Frames discarded by the delivery ring, added to those recorded with :obj:`add_evicted`. Defaults to 0.
+
+        Returns:
+            SensorStatistics: The statistics.
+        """
+        now = monotonic_ns()
+        bytes_per_s = self._bytes.rate(now)
+        utilisation = bytes_per_s * BITS_PER_BYTE / baud_rate if baud_rate else None
+        return SensorStatistics(
+            self._device_frames.rate(now),
+            self._delivered.rate(now),
+            bytes_per_s,
+            utilisation,
+            self.frames_received,
+            self._delivered.total,
+            self._bytes.total,
+            self.dropped_evicted + evicted,
+            self.dropped_corrupt,
+            self.dropped_gap,
+            self.window_s,
+            self.reconnects,
+            None if self.last_recovery_ns is None else self.last_recovery_ns / 1e9,
+            self.recovery_ns / 1e9,
+            self.frames_empty)
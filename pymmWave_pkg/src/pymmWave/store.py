@@ -0,0 +1,235 @@
+import json
+import os
+from time import monotonic_ns, time_ns
+from typing import Any, BinaryIO, Optional, Union
+
+import numpy as np
+
+from .data_model import DopplerPointCloud, FrameMetadata, PointCloudBatch
+
+# One file of little-endian float32 values per column, in this order in a DopplerPointCloud.
+COLUMNS: tuple[str, ...] = ('x', 'y', 'z', 'doppler')
+COLUMN_DTYPE = np.dtype('<f4')
+
+# One record per frame. `offset` and `count` locate the frame's rows in the column files.
+FRAME_TABLE_DTYPE = np.dtype([('offset', '<u8'), ('count', '<u4'), ('frame_number', '<u4'), ('host_ns', '<i8'), ('time_cpu_cycles', '<u4'), ('num_points', '<u4')])
+
+FRAME_TABLE_FILE: str = 'frames.bin'
+# Frames buffered before the writer flushes on its own.
+FLUSH_FRAMES: int = 256
+INFO_FILE: str = 'store.json'
+
+
+def _column_file(path: str, column: str) -> str:
+    return os.path.join(path, f"{column}.f32")
+
+
+class PointCloudStoreWriter(object):
+    """Appends point clouds to a columnar store on disk, readable with :obj:`PointCloudStore<pymmWave.store.PointCloudStore>`.
+
+    A store is a directory holding one float32 file per column and a frame table. Point rows are written before the frame table
+    record which refers to them, so a reader, or a writer interrupted at any point, never sees a partially written frame.
+    Opening an existing store appends to it.
+
+    Example:
+        >>> with PointCloudStoreWriter('session.store') as store:
+        ...     async for cloud in sensor.stream():
+        ...         store.append(cloud)
+    """
+    def __init__(self, path: str):
+        """Open or create a store.
+
+        Args:
+            path (str): Directory of the store.
+        """
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        info_path = os.path.join(path, INFO_FILE)
+        if not os.path.exists(info_path):
+            # Host timestamps are time.monotonic_ns(), this allows converting them to wall clock time later
+            with open(info_path, 'w') as f:
+                json.dump({'epoch_offset_ns': time_ns() - monotonic_ns(), 'columns': list(COLUMNS)}, f)
+
+        table = _map(os.path.join(path, FRAME_TABLE_FILE), FRAME_TABLE_DTYPE)
+        self.frames: int = len(table)
+        self._rows: int = int(table['offset'][-1] + table['count'][-1]) if len(table) else 0
+        del table
+
+        self._table: BinaryIO = open(os.path.join(path, FRAME_TABLE_FILE), 'ab')
+        self._table.truncate(self.frames * FRAME_TABLE_DTYPE.itemsize)
+        self._columns: list[BinaryIO] = []
+        for c in COLUMNS:
+            f = open(_column_file(path, c), 'ab')
+            # An interrupted append may have left rows without a frame table record
+            f.truncate(self._rows * COLUMN_DTYPE.itemsize)
+            self._columns.append(f)
+        self._record = np.zeros(1, dtype=FRAME_TABLE_DTYPE)
+        # Table records are held back until the rows they refer to are flushed
+        self._pending: bytearray = bytearray()
+
+    def append(self, cloud: DopplerPointCloud, host_ns: Optional[int]=None) -> None:
+        """Append one point cloud.
+
+        Args:
+            cloud (DopplerPointCloud): The cloud, with its frame information if it has any.
+            host_ns (Optional[int], optional): Timestamp to index the frame by. Defaults to the cloud's host timestamp, or now if it has none.
+        """
+        data = cloud.get()
+        metadata = cloud.get_metadata()
+        for i, f in enumerate(self._columns):
+            f.write(np.ascontiguousarray(data[:, i], dtype=COLUMN_DTYPE).tobytes())
+
+        record = self._record
+        record['offset'] = self._rows
+        record['count'] = data.shape[0]
+        if metadata is not None:
+            record['frame_number'] = metadata.frame_number
+            record['time_cpu_cycles'] = metadata.time_cpu_cycles
+            record['num_points'] = metadata.num_points
+            record['host_ns'] = metadata.host_timestamp_ns if host_ns is None else host_ns
+        else:
+            record['frame_number'] = self.frames
+            record['time_cpu_cycles'] = 0
+            record['num_points'] = data.shape[0]
+            record['host_ns'] = monotonic_ns() if host_ns is None else host_ns
+        self._pending += record.tobytes()
+
+        self._rows += data.shape[0]
+        self.frames += 1
+        if len(self._pending) >= FLUSH_FRAMES * FRAME_TABLE_DTYPE.itemsize:
+            self.flush()
+
+    def append_batch(self, batch: PointCloudBatch) -> None:
+        """Append every frame of a batch, in order.
+        """
+        for i in range(len(batch)):
+            self.append(batch.frame(i))
+
+    def flush(self) -> None:
+        """Make everything appended so far visible to readers. Columns are flushed ahead of the frame table.
+        """
+        for f in self._columns:
+            f.flush()
+        self._table.write(self._pending)
+        self._table.flush()
+        self._pending.clear()
+
+    def close(self) -> None:
+        self.flush()
+        for f in self._columns:
+            f.close()
+        self._table.close()
+
+    def __enter__(self) -> 'PointCloudStoreWriter':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+def _map(path: str, dtype: Union[np.dtype, Any], count: Optional[int]=None) -> np.ndarray:
+    """Read-only memory map of a file, or an empty array for a missing or empty file, which cannot be mapped.
+    """
+    if not os.path.exists(path):
+        return np.empty(0, dtype=dtype)
+    size = os.path.getsize(path) // np.dtype(dtype).itemsize
+    if count is not None:
+        size = min(size, count)
+    if not size:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', shape=(size,))
+
+
+class PointCloudStore(object):
+    """Reads a store written by :obj:`PointCloudStoreWriter<pymmWave.store.PointCloudStoreWriter>` through memory maps.
+
+    Opening a store only maps it, any frame or time range can then be sliced into a :obj:`PointCloudBatch<pymmWave.data_model.PointCloudBatch>`,
+    reading only that part of the files. Frames appended after opening become visible with :obj:`refresh`.
+
+    Stored frame information has no TLV types, metadata of the returned batches has an empty `tlv_types`.
+
+    Example:
+        >>> store = PointCloudStore('session.store')
+        >>> start = store.table['host_ns'][0]
+        >>> batch = store.time_range(start + 10_000_000_000, start + 20_000_000_000)
+    """
+    def __init__(self, path: str):
+        """Open a store.
+
+        Args:
+            path (str): Directory of the store.
+
+        Raises:
+            FileNotFoundError: If there is no store at `path`.
+        """
+        self.path = path
+        with open(os.path.join(path, INFO_FILE)) as f:
+            self.epoch_offset_ns: int = json.load(f)['epoch_offset_ns']
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Remap the files, picking up frames appended since the store was opened.
+        """
+        self.table: np.ndarray = _map(os.path.join(self.path, FRAME_TABLE_FILE), FRAME_TABLE_DTYPE)
+        rows = int(self.table['offset'][-1] + self.table['count'][-1]) if len(self.table) else 0
+        self._columns: list[np.ndarray] = [_map(_column_file(self.path, c), COLUMN_DTYPE, rows) for c in COLUMNS]
+
+    def __len__(self) -> int:
+        """Number of frames in the store.
+        """
+        return len(self.table)
+
+    def column(self, name: str) -> np.ndarray:
+        """Memory mapped float32 values of one column, over every frame.
+
+        Args:
+            name (str): One of COLUMNS.
+
+        Returns:
+            np.ndarray: Read-only view of the whole column.
+        """
+        return self._columns[COLUMNS.index(name)]
+
+    def frame_range(self, start: int, stop: int, dtype: Union[np.dtype, Any]=np.float32) -> PointCloudBatch:
+        """Frames `start` up to `stop`, by position in the store.
+
+        Args:
+            start (int): First frame.
+            stop (int): Frame after the last.
+            dtype (Union[np.dtype, Any], optional): Data type of the returned points. Defaults to np.float32, as stored.
+
+        Returns:
+            PointCloudBatch: The frames, with frame information.
+        """
+        table = self.table[start:stop]
+        if not len(table):
+            return PointCloudBatch(np.empty((0, 4), dtype=dtype), np.zeros(1, dtype=np.int64), [])
+
+        # Frames are contiguous, so the whole range is a single slice of every column
+        first = int(table['offset'][0])
+        last = int(table['offset'][-1] + table['count'][-1])
+        data = np.empty((last - first, len(COLUMNS)), dtype=dtype)
+        for i, col in enumerate(self._columns):
+            data[:, i] = col[first:last]
+
+        offsets = np.zeros(len(table) + 1, dtype=np.int64)
+        np.cumsum(table['count'], out=offsets[1:])
+        metadata: list[Optional[FrameMetadata]] = [
+            FrameMetadata(int(r['frame_number']), int(r['time_cpu_cycles']), int(r['host_ns']), (), int(r['num_points'])) for r in table]
+
+        return PointCloudBatch(data, offsets, metadata)
+
+    def time_range(self, start_ns: int, end_ns: int, dtype: Union[np.dtype, Any]=np.float32) -> PointCloudBatch:
+        """Frames with a host timestamp in [start_ns, end_ns). Frames are assumed to be stored in time order.
+
+        Args:
+            start_ns (int): Start time, as stored (time.monotonic_ns() of the recording host by default).
+            end_ns (int): End time, excluded.
+            dtype (Union[np.dtype, Any], optional): Data type of the returned points. Defaults to np.float32, as stored.
+
+        Returns:
+            PointCloudBatch: The frames, with frame information.
+        """
+        host_ns = self.table['host_ns']
+        start, stop = np.searchsorted(host_ns, [start_ns, end_ns])
+        return self.frame_range(int(start), int(stop), dtype)
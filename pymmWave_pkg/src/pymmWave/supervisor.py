@@ -0,0 +1,169 @@
+from asyncio import Task, create_task, get_running_loop, sleep, wait
+from time import monotonic_ns
+from typing import Optional, Sequence
+
+from .IWR6843AOP import IWR6843AOP
+
+# Used when the configuration has no frameCfg line.
+DEFAULT_FRAME_PERIOD_S: float = 0.1
+
+
+def frame_period_s(config: Sequence[str]) -> Optional[float]:
+    """Frame period configured by the `frameCfg` line of a TI configuration.
+
+    Args:
+        config (Sequence[str]): Configuration lines, as passed to send_config.
+
+    Returns:
+        Optional[float]: Seconds, None if there is no valid frameCfg line.
+    """
+    for line in config:
+        args = line.split()
+        # frameCfg <chirpStartIdx> <chirpEndIdx> <numLoops> <numFrames> <framePeriodicity ms> ...
+        if len(args) > 5 and args[0] == 'frameCfg':
+            try:
+                return float(args[5]) / 1e3
+            except ValueError:
+                return None
+    return None
+
+
+class SensorSupervisor(object):
+    """Keeps an :obj:`IWR6843AOP<pymmWave.IWR6843AOP.IWR6843AOP>` streaming through cable glitches and device resets.
+
+    The supervisor runs :obj:`start_sensor<pymmWave.IWR6843AOP.IWR6843AOP.start_sensor>` and watches it. When it fails, or no frame has been decoded
+    for `stall_periods` frame periods, the ports are reopened with the names and baud rates in use and the last configuration is re-sent
+    (see :obj:`reconnect<pymmWave.IWR6843AOP.IWR6843AOP.reconnect>`), retrying every `retry_interval_s`. Streaming then resumes into the same delivery ring,
+    so consumers of get_data or subscriptions simply see a gap. Recovery times are reported in :obj:`get_statistics<pymmWave.IWR6843AOP.IWR6843AOP.get_statistics>`.
+
+    The sensor must be connected and configured before supervising it.
+
+    Example:
+        >>> sensor.send_config(EXAMPLE_CONFIG)
+        True
+        >>> asyncio.create_task(SensorSupervisor(sensor).run())
+        >>> cloud = await sensor.get_data()
+    """
+    def __init__(self, sensor: IWR6843AOP, stall_periods: float=10.0, frame_period: Optional[float]=None,
+                 retry_interval_s: float=1.0, max_attempts: Optional[int]=None):
+        """Set up supervision. Nothing runs until :obj:`run`.
+
+        Args:
+            sensor (IWR6843AOP): Connected and configured sensor.
+            stall_periods (float, optional): Frame periods without a decoded frame after which the sensor is considered stalled. Defaults to 10.0.
+            frame_period (Optional[float], optional): Frame period in seconds. Defaults to the period configured by the last configuration sent, or DEFAULT_FRAME_PERIOD_S.
+            retry_interval_s (float, optional): Wait between reconnect attempts. Defaults to 1.0.
+            max_attempts (Optional[int], optional): Consecutive reconnect attempts which fail, or succeed without frames following, after which :obj:`run` gives up. None retries forever. Defaults to None.
+        """
+        assert stall_periods > 0 and retry_interval_s >= 0
+        self.sensor = sensor
+        self.stall_periods = stall_periods
+        self.frame_period = frame_period
+        self.retry_interval_s = retry_interval_s
+        self.max_attempts = max_attempts
+        self.stalls: int = 0
+        self.failures: int = 0
+        self.last_error: Optional[BaseException] = None
+
+    def _stall_timeout_ns(self) -> int:
+        period = self.frame_period
+        config = self.sensor.last_config
+        if period is None and config is not None:
+            period = frame_period_s(config)
+        return int((period or DEFAULT_FRAME_PERIOD_S) * self.stall_periods * 1e9)
+
+    async def _watch(self, task: 'Task[None]') -> bool:
+        """Waits until the sensor task fails or stalls. Returns False if it finished on its own.
+        """
+        timeout_ns = self._stall_timeout_ns()
+        # Startup gets a full stall timeout, frames from before the start do not count
+        started_ns = monotonic_ns()
+        while True:
+            last_ns = max(self.sensor.last_frame_ns(), started_ns)
+            remaining = last_ns + timeout_ns - monotonic_ns()
+            if remaining <= 0:
+                self.stalls += 1
+                self.sensor.log(f"{self.sensor.name} stalled, no frames for {timeout_ns / 1e9:.2f} s.")
+                return True
+            done, _ = await wait([task], timeout=remaining / 1e9)
+            if done:
+                return self._failed(task)
+
+    def _failed(self, task: 'Task[None]') -> bool:
+        """Records the outcome of a finished sensor task. Returns False if it finished on its own.
+        """
+        exc = task.exception()
+        if exc is None:
+            return False
+        self.failures += 1
+        self.last_error = exc
+        self.sensor.log(f"{self.sensor.name} failed: {exc!r}")
+        return True
+
+    async def _recovered(self, task: 'Task[None]', failed_ns: int) -> Optional[bool]:
+        """Waits for the first frame decoded after reconnecting, as long as a stall would be tolerated.
+        Returns True once it arrived, False if the sensor stalled or failed again, and None if the task finished on its own.
+        """
+        timeout_ns = self._stall_timeout_ns()
+        deadline = monotonic_ns() + timeout_ns
+        while self.sensor.last_frame_ns() < failed_ns:
+            if task.done():
+                return False if self._failed(task) else None
+            if monotonic_ns() >= deadline:
+                self.stalls += 1
+                self.sensor.log(f"{self.sensor.name} reconnected but sent no frames for {timeout_ns / 1e9:.2f} s.")
+                return False
+            await sleep(min(timeout_ns / 1e9, 0.01))
+
+        self.sensor.record_recovery(self.sensor.last_frame_ns() - failed_ns)
+        return True
+
+    async def _reconnect(self, attempts: int) -> int:
+        """Reconnects, retrying every retry_interval_s. `attempts` counts earlier attempts which did not bring frames back, returns the updated count.
+        """
+        loop = get_running_loop()
+        while True:
+            if attempts:
+                if self.max_attempts is not None and attempts >= self.max_attempts:
+                    raise ConnectionError(f"Could not reconnect {self.sensor.name} after {attempts} attempts.")
+                await sleep(self.retry_interval_s)
+            attempts += 1
+            # Opening ports and configuring blocks on serial timeouts, which must not stall the event loop
+            if await loop.run_in_executor(None, self.sensor.reconnect):
+                return attempts
+
+    async def run(self) -> None:
+        """Streams from the sensor, recovering from failures and stalls, until cancelled.
+
+        Raises:
+            ConnectionError: If max_attempts reconnect attempts in a row failed, or did not bring frames back.
+        """
+        # Detection time of the failure being recovered from, None while healthy
+        failed_ns: Optional[int] = None
+        # Reconnect attempts since that failure
+        attempts = 0
+        while True:
+            task = create_task(self.sensor.start_sensor())
+            try:
+                if failed_ns is not None:
+                    # Recovery ends with the first frame decoded after reconnecting. Without one the board is reconnected again,
+                    #   and the recovery time still counts from the original failure.
+                    recovered = await self._recovered(task, failed_ns)
+                    if recovered is None:
+                        return
+                    if recovered:
+                        failed_ns = None
+                        attempts = 0
+
+                if failed_ns is None and not await self._watch(task):
+                    return
+            finally:
+                task.cancel()
+                # wait() does not raise the outcome of the sensor task, so a CancelledError here is run() itself being cancelled, and propagates
+                await wait([task])
+                if not task.cancelled():
+                    task.exception()
+
+            if failed_ns is None:
+                failed_ns = monotonic_ns()
+            attempts = await self._reconnect(attempts)
@@ -0,0 +1,133 @@
+from typing import Optional, Sequence, Union
+
+import numpy as np
+from scipy.spatial.transform.rotation import Rotation
+
+
+def _rotation_matrix(rotation: Union[Rotation, np.ndarray, None]) -> np.ndarray:
+    if rotation is None:
+        return np.eye(3)
+    if isinstance(rotation, Rotation):
+        matrix = rotation.as_matrix().reshape(-1, 3, 3)  # type: ignore
+        if matrix.shape[0] != 1:
+            raise ValueError("A rigid transform needs a single rotation.")
+        return matrix[0]
+    matrix = np.asarray(rotation, dtype=np.float64)
+    if matrix.shape != (3, 3):
+        raise ValueError("Rotation matrices must be 3x3.")
+    return matrix
+
+
+class RigidTransform(object):
+    """A rotation followed by a translation, p' = R p + t, held as a cached 4x4 homogeneous matrix.
+
+    Transforms compose with `@` without touching any points, `a @ b` applies `b` first. :obj:`apply` moves x, y, z of an Nx3 or Nx4 array
+    in place with a single matrix product, doppler is left as it is. The operator used for that product is cached per data type,
+    so float32 clouds are transformed in float32.
+
+    Example:
+        >>> to_world = RigidTransform(Rotation.from_rotvec([0, 0, np.pi / 2]), (1.0, 0.0, 0.5))
+        >>> to_world.apply(cloud.get())
+    """
+    __slots__ = ('_matrix', '_operators')
+
+    def __init__(self, rotation: Union[Rotation, np.ndarray, None]=None, translation: Sequence[float]=(0.0, 0.0, 0.0)):
+        """Build a transform.
+
+        Args:
+            rotation (Union[Rotation, np.ndarray, None], optional): Single scipy Rotation or 3x3 matrix, applied first. Defaults to no rotation.
+            translation (Sequence[float], optional): (x meters, y meters, z meters), added after rotating. Defaults to (0.0, 0.0, 0.0).
+
+        Raises:
+            ValueError: If the rotation is not a single 3x3 rotation.
+        """
+        matrix = np.eye(4)
+        matrix[:3, :3] = _rotation_matrix(rotation)
+        matrix[:3, 3] = translation
+        self._matrix: np.ndarray = matrix
+        self._operators: dict[np.dtype, tuple[np.ndarray, np.ndarray]] = {}
+
+    @classmethod
+    def from_matrix(cls, matrix: np.ndarray) -> 'RigidTransform':
+        """Build a transform from a 3x4 or 4x4 homogeneous matrix.
+        """
+        matrix = np.asarray(matrix, dtype=np.float64)
+        if matrix.shape not in ((3, 4), (4, 4)):
+            raise ValueError("Homogeneous matrices must be 3x4 or 4x4.")
+        return cls(matrix[:3, :3], matrix[:3, 3])
+
+    @classmethod
+    def from_translate_rotate(cls, location: Sequence[float], rotation: Rotation) -> 'RigidTransform':
+        """The transform of :obj:`DopplerPointCloud.translate_rotate<pymmWave.data_model.DopplerPointCloud.translate_rotate>`, which translates before rotating: p' = R (p + location).
+        """
+        matrix = _rotation_matrix(rotation)
+        return cls(matrix, matrix @ np.asarray(location, dtype=np.float64))
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """4x4 homogeneous matrix. Must not be modified.
+        """
+        return self._matrix
+
+    @property
+    def rotation(self) -> np.ndarray:
+        """3x3 rotation matrix.
+        """
+        return self._matrix[:3, :3]
+
+    @property
+    def translation(self) -> np.ndarray:
+        """Translation, applied after the rotation.
+        """
+        return self._matrix[:3, 3]
+
+    def inverse(self) -> 'RigidTransform':
+        """The transform undoing this one.
+        """
+        rotation = self.rotation.T
+        return RigidTransform(rotation, -rotation @ self.translation)
+
+    def __matmul__(self, other: 'RigidTransform') -> 'RigidTransform':
+        return RigidTransform.from_matrix(self._matrix @ other._matrix)
+
+    def _operator(self, dtype: np.dtype, columns: int) -> tuple[np.ndarray, np.ndarray]:
+        operator = self._operators.get(dtype)
+        if operator is None:
+            # Points are rows, so they are multiplied by the transposed rotation. The extra row and column pass doppler through unchanged.
+            matrix = np.eye(4, dtype=dtype)
+            matrix[:3, :3] = self.rotation.T
+            offset = np.zeros(4, dtype=dtype)
+            offset[:3] = self.translation
+            operator = self._operators[dtype] = (matrix, offset)
+        return operator[0][:columns, :columns], operator[1][:columns]
+
+    def apply(self, points: np.ndarray, out: Optional[np.ndarray]=None) -> np.ndarray:
+        """Transforms the x, y, z columns of points.
+
+        Args:
+            points (np.ndarray): Nx3 or Nx4 array, with any fourth column (doppler) passed through.
+            out (Optional[np.ndarray], optional): Array of the same shape receiving the result, which may be `points` itself. Defaults to `points`, transforming in place.
+
+        Returns:
+            np.ndarray: `out`.
+        """
+        if out is None:
+            out = points
+        if not points.shape[0]:
+            return out
+        assert points.ndim == 2 and points.shape[1] in (3, 4)
+
+        matrix, offset = self._operator(points.dtype, points.shape[1])
+        # One matrix product into scratch space, then the translation is added while writing the result
+        product = np.empty(points.shape, dtype=points.dtype)
+        np.dot(points, matrix, out=product)
+        np.add(product, offset, out=out)
+
+        return out
+
+    def __eq__(self, o: object) -> bool:
+        return isinstance(o, RigidTransform) and bool(np.array_equal(self._matrix, o._matrix))
+
+    def __repr__(self) -> str:
+        return f"RigidTransform({self._matrix[:3].tolist()})"
+
@@ -0,0 +1,101 @@
+from asyncio import AbstractEventLoop, Protocol, ReadTransport
+from os import read
+from time import perf_counter_ns
+from typing import Any, Callable, Optional
+
+from serial import Serial # type: ignore
+
+# Largest read performed per readiness event. Larger than any single TI frame at the usual baud rates.
+_MAX_READ: int = 1 << 16
+
+
+class SerialReadTransport(ReadTransport):
+    """asyncio read transport over the file descriptor of an already opened :obj:`serial.Serial` port.
+
+    The event loop wakes up only when the port has bytes available, and those bytes are read without blocking
+    and handed to the protocol's `data_received`. The port itself is not owned by the transport, closing the
+    transport stops reading but leaves the port open.
+
+    This relies on `loop.add_reader`, which is only available on POSIX selector event loops.
+    """
+    def __init__(self, loop: AbstractEventLoop, ser: Serial, protocol: Protocol, read_timer: Optional[Callable[[int], None]]=None):
+        """Start reading from the port.
+
+        Args:
+            loop (AbstractEventLoop): The running event loop.
+            ser (Serial): An open serial port.
+            protocol (Protocol): Receives `data_received` and `connection_lost` callbacks.
+            read_timer (Optional[Callable[[int], None]], optional): Called with the duration of every read in nanoseconds. Defaults to None.
+
+        Raises:
+            NotImplementedError: If the loop or the port does not support file descriptor readiness.
+        """
+        super().__init__()
+        try:
+            self._fd: int = ser.fileno()
+        except (AttributeError, OSError) as e:
+            raise NotImplementedError("Serial port does not expose a file descriptor") from e
+
+        self._loop = loop
+        self._serial = ser
+        self._protocol = protocol
+        self._closing = False
+        self._paused = False
+        self._read_timer = read_timer
+
+        self._loop.add_reader(self._fd, self._read_ready)
+        self._protocol.connection_made(self)
+
+    def _read_ready(self) -> None:
+        try:
+            if self._read_timer is None:
+                data = read(self._fd, _MAX_READ)
+            else:
+                t0 = perf_counter_ns()
+                data = read(self._fd, _MAX_READ)
+                self._read_timer(perf_counter_ns() - t0)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as e:
+            self._close(e)
+            return
+
+        if not data:
+            # Readable but empty means the device went away
+            self._close(ConnectionResetError("Serial device disconnected"))
+            return
+
+        self._protocol.data_received(data)
+
+    def is_reading(self) -> bool:
+        return not self._paused and not self._closing
+
+    def pause_reading(self) -> None:
+        if self._closing or self._paused:
+            return
+        self._paused = True
+        self._loop.remove_reader(self._fd)
+
+    def resume_reading(self) -> None:
+        if self._closing or not self._paused:
+            return
+        self._paused = False
+        self._loop.add_reader(self._fd, self._read_ready)
+
+    def is_closing(self) -> bool:
+        return self._closing
+
+    def close(self) -> None:
+        self._close(None)
+
+    def get_extra_info(self, name: str, default: Any=None) -> Any:
+        if name == 'serial':
+            return self._serial
+        return default
+
+    def _close(self, exc: Optional[Exception]) -> None:
+        if self._closing:
+            return
+        self._closing = True
+        self._loop.remove_reader(self._fd)
+        self._loop.call_soon(self._protocol.connection_lost, exc)
@@ -0,0 +1,28 @@
+import os
+
+import pytest
+
+from pymmWave.IWR6843AOP import IWR6843AOP
+from pymmWave.constants import EXAMPLE_CONFIG
+from pymmWave.simulator import FrameGenerator
+
+posix_only = pytest.mark.skipif(os.name != 'posix', reason="PtySimulator needs pseudo-terminals")
+
+
+@pytest.fixture
+def sim():
+    from pymmWave.simulator import PtySimulator
+    with PtySimulator(fps=50, generator=FrameGenerator(points=16)) as sim:
+        yield sim
+
+
+@pytest.fixture
+def sensor(sim):
+    """A sensor connected to the simulator and configured, so starting it streams frames.
+    """
+    sensor = IWR6843AOP('sim')
+    assert sensor.connect_config(sim.config_port, 115200)
+    assert sensor.connect_data(sim.data_port, 921600)
+    assert sensor.send_config(EXAMPLE_CONFIG)
+    yield sensor
+    sensor.stop_sensor()
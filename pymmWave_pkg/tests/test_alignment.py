@@ -0,0 +1,72 @@
+import numpy as np
+
+from pymmWave.IWR6843AOP import IWR6843AOP
+from pymmWave.data_model import DopplerPointCloud, FrameMetadata
+from pymmWave.fusion import SensorArray
+from pymmWave.sensor import SpatialSensor
+
+from conftest import posix_only
+
+MS = 1_000_000
+
+
+def _array(*sensors, **kwargs):
+    return SensorArray([SpatialSensor(s, (0.0, 0.0, 0.0), (0.0, 0.0, 0.0)) for s in sensors], window_s=.1, **kwargs)
+
+
+def _cloud(x, timestamp_ns, packet_len=0):
+    return DopplerPointCloud(np.array([[x, 0.0, 0.0, .5]]), FrameMetadata(0, 0, timestamp_ns, (1,), 1, packet_len))
+
+
+def test_match_pairs_nearest_frames_within_tolerance():
+    array = _array(IWR6843AOP('reference'), IWR6843AOP('other'), match_tolerance_s=.04)
+    array.add(0, _cloud(1.0, 1000 * MS))
+    array.add(0, _cloud(2.0, 1100 * MS))
+    for ts in (970, 1030, 1080, 1200):
+        array.add(1, _cloud(ts / 1000, ts * MS))
+
+    fused = array.match(1000 * MS)
+    assert fused.missing == ()
+    assert np.allclose(fused.get()[:, 0], [1.0, .97])
+    assert fused.reference_ns == 1000 * MS
+
+    fused = array.match(1100 * MS)
+    assert np.allclose(fused.get()[:, 0], [2.0, 1.08])
+
+    array.add(0, _cloud(3.0, 1300 * MS))
+    fused = array.match(1300 * MS)
+    assert fused.missing == (1,)
+    assert array.windows_missing == [0, 1]
+
+
+def test_ego_motion_is_compensated_to_the_reference_time():
+    array = _array(IWR6843AOP('moving'))
+    array.set_ego_velocity((2.0, 0.0, 0.0))
+    array.add(0, _cloud(5.0, 1050 * MS))
+    array.add(0, _cloud(5.0, 1090 * MS))
+
+    # A static point seen earlier has since moved against the rig's motion
+    assert np.allclose(array.fuse(1100 * MS).get()[:, 0], [5.0 - 2 * .05, 5.0 - 2 * .01])
+
+    array.set_ego_velocity(None)
+    array.add(0, _cloud(5.0, 1150 * MS))
+    assert np.allclose(array.fuse(1200 * MS).get()[:, 0], [5.0])
+
+
+@posix_only
+def test_transfer_delay_is_subtracted(sim):
+    slow = IWR6843AOP('slow')
+    assert slow.connect_data(sim.data_port, 115200)
+    # 1152 bytes take 100ms at 115200 baud
+    assert slow.transfer_delay_ns(_cloud(0.0, 0, 1152).get_metadata()) == 100 * MS
+    array = _array(slow, IWR6843AOP('unconnected'))
+    array.add(0, _cloud(1.0, 1150 * MS, 1152))
+    array.add(1, _cloud(2.0, 1050 * MS, 1152))
+
+    fused = array.fuse(1100 * MS)
+    assert np.allclose(fused.get()[:, 0], [1.0, 2.0])
+    assert fused.missing == ()
+
+    uncorrected = _array(slow, correct_transfer_delay=False)
+    uncorrected.add(0, _cloud(1.0, 1150 * MS, 1152))
+    assert uncorrected.fuse(1100 * MS).missing == (0,)
@@ -0,0 +1,94 @@
+import numpy as np
+from scipy.spatial.transform import Rotation
+
+from pymmWave.algos import IMUAdjustedPersistedData
+from pymmWave.data_model import DopplerPointCloud, FrameMetadata, ImuVelocityData, PointCloudBatch
+
+
+def _clouds(sizes):
+    rng = np.random.default_rng(11)
+    return [DopplerPointCloud(rng.normal(size=(n, 4)).astype(np.float32), FrameMetadata(i, 0, 0, (), n)) for i, n in enumerate(sizes)]
+
+
+def test_append_matches_from_clouds():
+    clouds = _clouds([3, 0, 7, 1] * 10)
+    batch = PointCloudBatch.from_clouds([])
+    for i, cloud in enumerate(clouds):
+        batch.append(cloud, source=i % 2)
+
+    expected = PointCloudBatch.from_clouds(clouds, sources=[i % 2 for i in range(len(clouds))])
+    assert batch.get().dtype == np.float32
+    assert np.array_equal(batch.get(), expected.get())
+    assert np.array_equal(batch.offsets(), expected.offsets())
+    assert np.array_equal(batch.sources(), expected.sources())
+    assert batch.get_metadata() == expected.get_metadata()
+
+
+def test_discard_drops_oldest_frames():
+    clouds = _clouds([2, 3, 4])
+    batch = PointCloudBatch.from_clouds(clouds)
+    batch.discard(2)
+
+    assert list(batch.sizes()) == [4]
+    assert np.array_equal(batch.get(), clouds[2].get())
+    assert batch.get_metadata()[0].frame_number == 2
+    # Storage is reused for later appends
+    batch.append(clouds[0])
+    assert np.array_equal(batch.frame(1).get(), clouds[0].get())
+    batch.discard(10)
+    assert len(batch) == 0
+
+
+def test_concat_keeps_sources():
+    first = PointCloudBatch.from_clouds(_clouds([2, 1]), sources=[0, 1])
+    second = PointCloudBatch.from_clouds(_clouds([4]), sources=[1])
+    batch = PointCloudBatch.concat([first, second])
+
+    assert list(batch.sizes()) == [2, 1, 4]
+    assert list(batch.sources()) == [0, 1, 1]
+    assert np.array_equal(batch.by_source(1).get(), np.concatenate([first.frame(1).get(), second.get()]))
+
+
+def test_translate_rotate_matches_per_cloud():
+    clouds = _clouds([5, 6])
+    batch = PointCloudBatch.from_clouds(clouds)
+    rotation = Rotation.from_euler('zyx', [.3, .2, .1])
+    batch.translate_rotate((1.0, 0.0, -1.0), rotation)
+    for cloud in clouds:
+        cloud.translate_rotate((1.0, 0.0, -1.0), rotation)
+
+    assert np.allclose(batch.get(), np.concatenate([c.get() for c in clouds]))
+
+
+def test_cloud_append():
+    first, second = _clouds([2, 3])
+    expected = np.concatenate([first.get(), second.get()])
+    assert first.append(second)
+    assert np.array_equal(first.get(), expected)
+
+
+def _still():
+    return ImuVelocityData((0.0, 0.0, 0.0), (0.0, 0.0, 0.0))
+
+
+def test_persisted_data_keeps_input_unchanged():
+    algo = IMUAdjustedPersistedData(2)
+    clouds = _clouds([2, 3, 4])
+    inputs = [c.get().copy() for c in clouds]
+    sizes = [algo.run(cloud, _still()).get().shape[0] for cloud in clouds]
+
+    assert sizes == [2, 5, 9]
+    for cloud, original in zip(clouds, inputs):
+        assert np.array_equal(cloud.get(), original)
+
+
+def test_change_persisted_steps():
+    algo = IMUAdjustedPersistedData(5)
+    for cloud in _clouds([2] * 5):
+        algo.run(cloud, _still())
+    assert algo.change_persisted_steps(1)
+    assert not algo.change_persisted_steps(-1)
+
+    sizes = [algo.run(cloud, _still()).get().shape[0] for cloud in _clouds([2] * 3)]
+    # At most one step is persisted from now on, plus the newest cloud
+    assert sizes == [4, 6, 6]
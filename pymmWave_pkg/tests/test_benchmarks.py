@@ -0,0 +1,33 @@
+import json
+import os
+import subprocess
+import sys
+
+SUITE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks', 'suite.py')
+
+
+def _suite(*args):
+    return subprocess.run([sys.executable, SUITE, '--filter', 'decode', '--repeat', '1', '--min-time', '0', *args], capture_output=True, text=True, timeout=120)
+
+
+def test_suite_writes_and_compares_results(tmp_path):
+    output = str(tmp_path / 'results.json')
+    assert _suite('--output', output).returncode == 0
+
+    with open(output) as f:
+        written = json.load(f)
+    results = written['results']
+    assert written['environment']['python']
+    assert results and all(res['status'] == 'ok' and res['frames_per_s'] > 0 for res in results.values())
+
+    # Against itself with a generous threshold nothing regressed
+    assert _suite('--baseline', output, '--threshold', '100').returncode == 0
+
+    # An impossibly fast baseline is a regression
+    for res in results.values():
+        res['best_s'] = 1e-12
+    with open(output, 'w') as f:
+        json.dump(written, f)
+    slower = _suite('--baseline', output)
+    assert slower.returncode == 1
+    assert 'SLOWER' in slower.stdout
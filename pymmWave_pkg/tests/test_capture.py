@@ -0,0 +1,22 @@
+import numpy as np
+
+from pymmWave.capture import CaptureWriter, build_index, load_index
+from pymmWave.simulator import FrameGenerator
+
+
+def test_rebuilt_index_matches_written(tmp_path):
+    path = str(tmp_path / 'capture.bin')
+    data = FrameGenerator(points=20, corruption=.1, seed=2).frames(300)
+    with CaptureWriter(path) as capture:
+        for i in range(0, len(data), 1000):
+            assert capture.write(data[i:i + 1000], i + 1)
+
+    written = load_index(path)
+    assert capture.bytes_written == len(data)
+    assert len(written) == capture.frames_indexed > 0
+    assert np.all(written['host_ns'] > 0)
+
+    rebuilt = build_index(path, chunk_size=4096)
+    for field in ('frame_number', 'length', 'offset'):
+        assert np.array_equal(rebuilt[field], written[field])
+    assert not np.any(rebuilt['host_ns'])
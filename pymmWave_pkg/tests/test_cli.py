@@ -0,0 +1,90 @@
+import asyncio
+from time import monotonic
+
+import pytest
+
+from pymmWave.IWR6843AOP import IWR6843AOP, send_configs
+from pymmWave.constants import CLI_COMMAND_TIME, CLI_PROMPT, CLI_SLOW_COMMAND_TIME, EXAMPLE_CONFIG
+from pymmWave.simulator import FrameGenerator, PtySimulator
+
+from conftest import posix_only
+
+COMMANDS = [line.strip() for line in EXAMPLE_CONFIG if line[0] != '%']
+
+
+def _connected(sim, name='cli'):
+    sensor = IWR6843AOP(name)
+    assert sensor.connect_config(sim.config_port, 115200)
+    assert sensor.connect_data(sim.data_port, 921600)
+    return sensor
+
+
+class _RejectingSimulator(PtySimulator):
+    def _reply(self, command):
+        if command.startswith('channelCfg'):
+            return "Error -1"
+        return super()._reply(command)
+
+
+def test_cli_lines_drop_the_prompt():
+    async def run():
+        lines = asyncio.Queue()
+        protocol = IWR6843AOP._CliProtocol(lines)
+        protocol.data_received(b'sensorStop\r\nIgnored: Sensor is already stopped\r\n' + CLI_PROMPT.encode())
+        protocol.data_received(b' flushCfg\r\nDo')
+        protocol.data_received(b'ne\r\n')
+        protocol.connection_lost(None)
+        return [lines.get_nowait() for _ in range(lines.qsize())]
+
+    assert asyncio.run(run()) == ['sensorStop', 'Ignored: Sensor is already stopped', 'flushCfg', 'Done', None]
+
+
+@posix_only
+def test_send_config_async(sim):
+    sensor = _connected(sim)
+    assert asyncio.run(asyncio.wait_for(sensor.send_config_async(EXAMPLE_CONFIG), 10))
+
+    # sensorStop on a stopped device is answered "Ignored"
+    assert sim.commands == COMMANDS
+    assert sim.streaming
+    assert sensor.last_config == tuple(EXAMPLE_CONFIG)
+    sensor.stop_sensor()
+
+
+@posix_only
+def test_send_configs_to_several_boards():
+    with PtySimulator(fps=50, generator=FrameGenerator(points=4)) as a, PtySimulator(fps=50, generator=FrameGenerator(points=4)) as b:
+        sensors = [_connected(a, 'a'), _connected(b, 'b')]
+        assert asyncio.run(asyncio.wait_for(send_configs(sensors, EXAMPLE_CONFIG), 10)) == [True, True]
+        assert a.commands == b.commands == COMMANDS
+        for sensor in sensors:
+            sensor.stop_sensor()
+
+
+@posix_only
+def test_error_reply_fails_the_config():
+    with _RejectingSimulator(fps=50) as sim:
+        sensor = _connected(sim)
+        assert not asyncio.run(asyncio.wait_for(sensor.send_config_async(EXAMPLE_CONFIG, max_retries=2), 10))
+
+        # Every attempt stops at the rejected command
+        assert sim.commands.count('channelCfg 15 7 0') == 2
+        assert 'sensorStart' not in sim.commands
+        assert sensor.last_config is None
+
+
+@posix_only
+def test_unanswered_command_times_out():
+    # Never started, so nothing answers on the config port
+    sim = PtySimulator()
+    try:
+        sensor = _connected(sim)
+        timeout = sensor._command_timeout('sensorStop')
+        assert timeout == pytest.approx(CLI_SLOW_COMMAND_TIME['sensorStop'], abs=.01)
+        assert sensor._command_timeout('flushCfg') > sensor._command_timeout('lowPower 0 0') > CLI_COMMAND_TIME
+
+        start = monotonic()
+        assert not asyncio.run(sensor.send_config_async(['sensorStop\n']))
+        assert timeout <= monotonic() - start < timeout + .5
+    finally:
+        sim.close()
@@ -0,0 +1,72 @@
+import asyncio
+
+import numpy as np
+
+from pymmWave.IWR6843AOP import IWR6843AOP
+from pymmWave.algos import SimpleMeanDistance
+from pymmWave.data_model import DopplerPointCloud, PointCloudBatch
+from pymmWave.delivery import DeliveryPolicy
+from pymmWave.simulator import FrameGenerator
+
+
+def _clouds(sizes):
+    rng = np.random.default_rng(4)
+    return [DopplerPointCloud(rng.normal(size=(n, 4)).astype(np.float32)) for n in sizes]
+
+
+def test_batch_from_clouds():
+    clouds = _clouds([3, 0, 5])
+    batch = PointCloudBatch.from_clouds(clouds)
+
+    assert len(batch) == 3
+    assert list(batch.offsets()) == [0, 3, 3, 8]
+    assert list(batch.sizes()) == [3, 0, 5]
+    for i, cloud in enumerate(clouds):
+        assert np.array_equal(batch.frame(i).get(), cloud.get())
+
+
+def test_mean_distance_batch_matches_per_frame():
+    clouds = _clouds([3, 0, 5, 1])
+    algo = SimpleMeanDistance()
+    expected = [algo.run(c) for c in clouds]
+
+    assert np.allclose(algo.run_batch(PointCloudBatch.from_clouds(clouds)), expected)
+
+
+def _sensor():
+    sensor = IWR6843AOP('consumer')
+    sensor.configure_delivery(DeliveryPolicy.RING, 16)
+    return sensor
+
+
+def test_get_batch_takes_buffered_frames_then_waits():
+    sensor = _sensor()
+    gen = FrameGenerator(points=4)
+    sensor._on_data(gen.frames(3), 0)
+
+    async def run():
+        batch = await sensor.get_batch(10, timeout=0)
+        assert [m.frame_number for m in batch.get_metadata()] == [0, 1, 2]
+
+        loop = asyncio.get_running_loop()
+        loop.call_later(.05, sensor._on_data, gen.frames(2), 0)
+        batch = await sensor.get_batch(2)
+        assert [m.frame_number for m in batch.get_metadata()] == [3, 4]
+        assert batch.get().shape == (8, 4)
+
+    asyncio.run(run())
+    assert sensor.get_statistics().frames_delivered == 5
+
+
+def test_stream_yields_frames_in_order():
+    sensor = _sensor()
+    sensor._on_data(FrameGenerator(points=4).frames(5), 0)
+
+    async def run():
+        numbers = []
+        async for cloud in sensor.stream():
+            numbers.append(cloud.get_metadata().frame_number)
+            if len(numbers) == 5:
+                return numbers
+
+    assert asyncio.run(run()) == [0, 1, 2, 3, 4]
@@ -0,0 +1,56 @@
+import numpy as np
+
+from pymmWave.IWR6843AOP import IWR6843AOP
+from pymmWave.framing import FRAME_HEADER_LEN, TLV_HEADER_LEN
+from pymmWave.simulator import FrameGenerator, build_frame
+
+
+def _points(n):
+    return FrameGenerator(seed=3).points_for(n)
+
+
+def test_detected_points_decode_exactly():
+    points = _points(50)
+    frame = memoryview(build_frame(7, points, [(6, b'\x00' * 24)]))
+    cloud = IWR6843AOP('decode')._process_frame(frame, 0)
+
+    assert cloud.dtype == np.float32
+    assert cloud.get().flags['C_CONTIGUOUS']
+    assert np.array_equal(cloud.get(), points)
+
+
+def test_points_are_read_in_place():
+    points = _points(10)
+    frame = build_frame(0, points)
+    sensor = IWR6843AOP('decode')
+    header = sensor._frame()
+    header.numDetectedObj = 10
+    decoded = sensor._processDetectedPoints(memoryview(frame), FRAME_HEADER_LEN + TLV_HEADER_LEN, header)
+
+    frame_array = np.frombuffer(frame, dtype=np.uint8)
+    for column in (decoded.x_coord, decoded.y_coord, decoded.z_coord, decoded.doppler, decoded.points):
+        assert np.shares_memory(column, frame_array)
+    assert np.array_equal(decoded.doppler, points[:, 3])
+
+
+def test_short_buffer_keeps_complete_points():
+    points = _points(10)
+    frame = build_frame(0, points)
+    sensor = IWR6843AOP('decode')
+    header = sensor._frame()
+    header.numDetectedObj = 10
+    # Two and a half points cut off the end of the TLV
+    end = FRAME_HEADER_LEN + TLV_HEADER_LEN + 8 * 16 - 8
+    decoded = sensor._processDetectedPoints(memoryview(frame)[:end], FRAME_HEADER_LEN + TLV_HEADER_LEN, header)
+
+    assert np.array_equal(decoded.points, points[:7])
+
+
+def test_doppler_filtering():
+    points = _points(40)
+    points[::2, 3] = .01
+    sensor = IWR6843AOP('decode')
+    sensor.configure_filtering(.02)
+    cloud = sensor._process_frame(memoryview(build_frame(0, points)), 0)
+
+    assert np.array_equal(cloud.get(), points[1::2])
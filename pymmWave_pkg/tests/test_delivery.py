@@ -0,0 +1,88 @@
+import asyncio
+
+from pymmWave.IWR6843AOP import IWR6843AOP
+from pymmWave.delivery import DeliveryPolicy, FrameRing
+from pymmWave.simulator import FrameGenerator
+
+
+def test_latest_keeps_only_the_newest():
+    ring: FrameRing[int] = FrameRing(DeliveryPolicy.LATEST, capacity=8)
+    sub = ring.subscribe()
+    for i in range(5):
+        assert ring.put(i)
+
+    assert ring.capacity == 1
+    assert sub.get_nowait() == 4
+    assert sub.get_nowait() is None
+    assert sub.dropped == 4
+
+
+def test_ring_drops_per_subscriber():
+    ring: FrameRing[int] = FrameRing(DeliveryPolicy.RING, capacity=3)
+    fast, slow = ring.subscribe(), ring.subscribe()
+    for i in range(5):
+        ring.put(i)
+        assert fast.get_nowait() == i
+
+    assert slow.get_many(10) == [2, 3, 4]
+    assert (fast.dropped, slow.dropped) == (0, 2)
+    assert ring.dropped == 2
+
+
+def test_blocking_refuses_until_consumed():
+    ring: FrameRing[int] = FrameRing(DeliveryPolicy.BLOCKING, capacity=2)
+    sub = ring.subscribe()
+    writable = []
+    assert ring.put(0) and ring.put(1)
+    assert not ring.put(2)
+    ring.add_writable_callback(lambda: writable.append(True))
+    assert not writable
+
+    assert sub.get_nowait() == 0
+    assert writable == [True]
+    assert ring.put(2)
+    assert sub.get_many(10) == [1, 2]
+    assert sub.dropped == 0
+
+
+def test_blocking_released_by_unsubscribe():
+    ring: FrameRing[int] = FrameRing(DeliveryPolicy.BLOCKING, capacity=1)
+    sub = ring.subscribe()
+    ring.put(0)
+    assert not ring.writable()
+
+    sub.close()
+    assert ring.writable()
+    assert ring.put(1)
+
+
+def _sensor_fed(policy, capacity=1, frames=5):
+    sensor = IWR6843AOP('delivery')
+    assert sensor.configure_delivery(policy, capacity)
+    sensor._on_data(FrameGenerator(points=4).frames(frames), 0)
+    return sensor
+
+
+def test_get_data_nowait_returns_the_newest_frame():
+    # Frames received before the first read are there for it, like with a Queue(1)
+    sensor = _sensor_fed(DeliveryPolicy.LATEST)
+    assert sensor.get_data_nowait().get_metadata().frame_number == 4
+    assert sensor.get_data_nowait() is None
+    assert sensor.get_statistics().dropped_evicted == 4
+
+
+def test_ring_keeps_frames_from_before_the_first_read():
+    sensor = _sensor_fed(DeliveryPolicy.RING, 3)
+    batch = asyncio.run(sensor.get_batch(10, timeout=0))
+    assert [m.frame_number for m in batch.get_metadata()] == [2, 3, 4]
+
+
+def test_unused_get_data_does_not_block():
+    sensor = IWR6843AOP('delivery')
+    sensor.configure_delivery(DeliveryPolicy.BLOCKING, 2)
+    sub = sensor.subscribe()
+    sensor._on_data(FrameGenerator(points=4).frames(5), 0)
+
+    # Only the subscription holds the sensor back, get_data was never called
+    assert [sub.get_nowait().get_metadata().frame_number for _ in range(2)] == [0, 1]
+    assert [c.get_metadata().frame_number for c in sub.get_many(10)] == [2, 3]
@@ -0,0 +1,48 @@
+from serial import Serial
+
+from pymmWave.discovery import Board, PortProbe, PortRole, discover, pair_ports, probe_port
+
+from conftest import posix_only
+
+
+def _start_streaming(sim):
+    with Serial(sim.config_port, 115200, timeout=1) as cli:
+        cli.write(b'sensorStart\n')
+        cli.read_until(b'Done')
+    assert sim.streaming
+
+
+def test_pair_by_serial_number():
+    probes = [PortProbe('/dev/ttyUSB3', PortRole.DATA, 'B'), PortProbe('/dev/ttyUSB0', PortRole.CONFIG, 'A'),
+              PortProbe('/dev/ttyUSB1', PortRole.SILENT, 'A'), PortProbe('/dev/ttyUSB2', PortRole.CONFIG, 'B'),
+              # Ambiguous: two CLI ports share a serial number
+              PortProbe('/dev/ttyUSB4', PortRole.CONFIG, 'C'), PortProbe('/dev/ttyUSB5', PortRole.CONFIG, 'C'),
+              PortProbe('/dev/ttyUSB6', PortRole.UNAVAILABLE, 'D')]
+
+    assert pair_ports(probes) == [Board('/dev/ttyUSB0', '/dev/ttyUSB1', 'A'), Board('/dev/ttyUSB2', '/dev/ttyUSB3', 'B')]
+
+
+def test_pair_without_serial_numbers():
+    # A silent port without a serial number cannot be told apart from any other port
+    assert pair_ports([PortProbe('a', PortRole.CONFIG), PortProbe('b', PortRole.SILENT)]) == []
+    assert pair_ports([PortProbe('a', PortRole.CONFIG), PortProbe('b', PortRole.DATA)]) == [Board('a', 'b')]
+    assert pair_ports([PortProbe('a', PortRole.CONFIG), PortProbe('b', PortRole.DATA), PortProbe('c', PortRole.DATA)]) == []
+
+
+@posix_only
+def test_probe_simulated_board(sim):
+    assert probe_port(sim.config_port, timeout=.2).role == PortRole.CONFIG
+    assert probe_port(sim.data_port, timeout=.2).role == PortRole.SILENT
+    _start_streaming(sim)
+    assert probe_port(sim.data_port, timeout=.5).role == PortRole.DATA
+
+
+@posix_only
+def test_probe_missing_port(tmp_path):
+    assert probe_port(str(tmp_path / 'ttyMissing'), timeout=.1).role == PortRole.UNAVAILABLE
+
+
+@posix_only
+def test_discover_streaming_board(sim):
+    _start_streaming(sim)
+    assert discover([sim.data_port, sim.config_port], timeout=.5) == [Board(sim.config_port, sim.data_port)]
@@ -0,0 +1,71 @@
+import numpy as np
+from scipy.spatial.transform import Rotation
+
+from pymmWave.IWR6843AOP import IWR6843AOP
+from pymmWave.data_model import DopplerPointCloud, FrameMetadata
+from pymmWave.multiprocess import SharedCloudRing
+from pymmWave.simulator import FrameGenerator, build_frame
+from pymmWave.store import PointCloudStore, PointCloudStoreWriter
+
+
+def _points(n):
+    return FrameGenerator(seed=9).points_for(n)
+
+
+def test_decoded_clouds_are_float32_by_default():
+    sensor = IWR6843AOP('dtype')
+    points = _points(10)
+    cloud = sensor._process_frame(memoryview(build_frame(0, points)), 0)
+
+    assert cloud.dtype == np.float32
+    assert sensor.configure_dtype(np.float64)
+    cloud = sensor._process_frame(memoryview(build_frame(1, points)), 0)
+    assert cloud.dtype == np.float64
+    assert np.array_equal(cloud.get(), points.astype(np.float64))
+
+
+def test_unsupported_dtype_is_rejected():
+    sensor = IWR6843AOP('dtype')
+    assert not sensor.configure_dtype(np.int32)
+    assert sensor._process_frame(memoryview(build_frame(0, _points(3))), 0).dtype == np.float32
+
+
+def test_astype_keeps_metadata():
+    metadata = FrameMetadata(3, 0, 0, (1,), 5)
+    cloud = DopplerPointCloud(_points(5), metadata)
+
+    assert cloud.astype(np.float32) is cloud
+    double = cloud.astype(np.float64)
+    assert double.dtype == np.float64
+    assert double.get_metadata() == metadata
+    assert np.array_equal(double.get(), cloud.get())
+
+
+def test_translate_rotate_keeps_dtype():
+    rotation = Rotation.from_euler('xyz', [.1, .2, .3])
+    single = DopplerPointCloud(_points(50))
+    double = single.astype(np.float64)
+    single.translate_rotate((1.0, 2.0, 3.0), rotation)
+    double.translate_rotate((1.0, 2.0, 3.0), rotation)
+
+    assert single.dtype == np.float32
+    assert np.allclose(single.get(), double.get(), atol=1e-5)
+
+
+def test_ring_and_store_keep_dtype(tmp_path):
+    points = _points(6).astype(np.float64)
+    ring = SharedCloudRing(2, 8, dtype=np.float64)
+    try:
+        copied, _ = ring.read(ring.write(points))
+        assert copied.dtype == np.float64
+        assert np.array_equal(copied, points)
+    finally:
+        ring.close()
+        ring.unlink()
+
+    path = str(tmp_path / 'session.store')
+    with PointCloudStoreWriter(path) as writer:
+        writer.append(DopplerPointCloud(points))
+    store = PointCloudStore(path)
+    assert store.frame_range(0, 1).get().dtype == np.float32
+    assert store.frame_range(0, 1, np.float64).get().dtype == np.float64
@@ -0,0 +1,77 @@
+import os
+
+import numpy as np
+import pytest
+
+from pymmWave.capture import CaptureWriter, index_path
+from pymmWave.constants import TLV_type
+from pymmWave.export import COLUMNS, decode_range, export, split_capture
+from pymmWave.simulator import FrameGenerator, build_frame
+
+FRAMES = 60
+POINTS = 8
+
+
+@pytest.fixture(params=[True, False], ids=['indexed', 'unindexed'])
+def capture(tmp_path, request):
+    path = str(tmp_path / 'capture.bin')
+    gen = FrameGenerator(points=POINTS, seed=8)
+    with CaptureWriter(path) as writer:
+        for i in range(FRAMES):
+            points = gen.points_for(POINTS)
+            # Every other frame has side info: snr i, noise -i
+            side = [(TLV_type.MMWDEMO_OUTPUT_MSG_DETECTED_POINTS_SIDE_INFO.value, np.array([[i, -i]] * POINTS, dtype='<i2').tobytes())] if i % 2 else []
+            writer.write(build_frame(i, points, side), 1000 + i)
+    if not request.param:
+        os.unlink(index_path(path))
+    return path
+
+
+def test_split_ranges_decode_like_the_whole(capture):
+    size = os.path.getsize(capture)
+    ranges = split_capture(capture, chunk_size=size // 7)
+    assert len(ranges) > 1
+    assert ranges[0][0] == 0 and ranges[-1][1] == size
+    assert all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:]))
+
+    whole = decode_range(capture, 0, size)
+    parts = [decode_range(capture, start, end) for start, end in ranges]
+    for c in whole:
+        assert np.array_equal(np.concatenate([p[c] for p in parts]), whole[c])
+    assert np.array_equal(np.unique(whole['frame_number']), np.arange(FRAMES))
+
+
+def test_decode_range_columns(capture):
+    columns = decode_range(capture, 0, os.path.getsize(capture))
+    indexed = os.path.exists(index_path(capture))
+
+    assert len(columns['x']) == FRAMES * POINTS
+    assert np.all(columns['host_valid'] == indexed)
+    if indexed:
+        assert np.array_equal(columns['host_timestamp_ns'], 1000 + columns['frame_number'].astype(np.int64))
+    odd = columns['frame_number'] % 2 == 1
+    assert np.array_equal(columns['side_valid'], odd)
+    assert np.array_equal(columns['snr'][odd], columns['frame_number'][odd].astype(np.int16))
+    assert np.array_equal(columns['noise'][odd], -columns['frame_number'][odd].astype(np.int16))
+
+
+@pytest.mark.parametrize('fmt', ['parquet', 'arrow'])
+def test_export(capture, tmp_path, fmt):
+    pa = pytest.importorskip('pyarrow')
+    output = str(tmp_path / f'out.{fmt}')
+    rows = export(capture, output, workers=2, chunk_size=os.path.getsize(capture) // 5, doppler_filtering=.2)
+
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        table = pq.read_table(output)
+    else:
+        with pa.ipc.open_file(output) as reader:
+            table = reader.read_all()
+    assert table.num_rows == rows > 0
+    assert table.column_names == list(COLUMNS)
+    assert np.all(np.abs(table.column('doppler').to_numpy()) > .2)
+    frame_numbers = table.column('frame_number').to_numpy()
+    assert np.all(np.diff(frame_numbers.astype(np.int64)) >= 0)
+    # Missing side info and timestamps are null
+    assert table.column('snr').null_count == np.count_nonzero(frame_numbers % 2 == 0)
+    assert table.column('host_timestamp_ns').null_count == (0 if os.path.exists(index_path(capture)) else rows)
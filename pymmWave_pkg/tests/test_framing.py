@@ -0,0 +1,120 @@
+import numpy as np
+import pytest
+
+from pymmWave.framing import FrameSynchronizer, detected_points, parse_header
+from pymmWave.simulator import FrameGenerator, build_frame
+
+
+def _stream(kind, frames=400, corruption=.2):
+    """A corrupted stream, with the intact frames it should decode to by frame number.
+    """
+    gen = FrameGenerator(points=20, extra_tlvs=(6,), corruption=corruption, seed=1)
+    gen.CORRUPTIONS = (kind,)
+    chunks, intact, damaged = [], {}, 0
+    for _ in range(frames):
+        corrupted = gen.corrupted
+        frame = gen.next_frame()
+        if gen.corrupted == corrupted:
+            intact[gen.frame_number - 1] = frame
+        else:
+            damaged += 1
+        chunks.append(frame)
+    # An intact final frame, so a damaged last frame is not left pending
+    last = gen.frame_number
+    intact[last] = build_frame(last, gen.points_for(20))
+    chunks.append(intact[last])
+    return b''.join(chunks), intact, damaged
+
+
+def _sync(data, chunk_size):
+    sync = FrameSynchronizer()
+    frames = []
+    for i in range(0, len(data), chunk_size):
+        sync.feed(data[i:i + chunk_size])
+        frames += [bytes(frame) for frame in sync.frames()]
+    return sync, frames
+
+
+@pytest.mark.parametrize('chunk_size', [7, 333, 1 << 20])
+@pytest.mark.parametrize('kind', FrameGenerator.CORRUPTIONS)
+def test_resync_after_corruption(kind, chunk_size):
+    data, intact, damaged = _stream(kind)
+    sync, frames = _sync(data, chunk_size)
+
+    numbers = [parse_header(frame).frame_number for frame in frames]
+    assert numbers == sorted(set(numbers))
+    # Every intact frame comes through unchanged
+    by_number = dict(zip(numbers, frames))
+    for number, frame in intact.items():
+        assert by_number[number] == frame
+
+    if kind == 'length':
+        # Damaged frames are dropped, and counted once each
+        assert set(numbers) == set(intact)
+        assert sync.corrupt_frames == damaged
+    elif kind == 'truncate':
+        # Unless cut short by less than a magic number, which only loses its end, a truncated frame is dropped and counted once
+        assert len(numbers) + sync.corrupt_frames == len(intact) + damaged
+    elif kind == 'garbage':
+        assert len(numbers) == len(intact) + damaged
+        assert sync.corrupt_frames == 0
+
+
+def test_truncated_frame_does_not_swallow_the_next():
+    gen = FrameGenerator(points=20)
+    first, second, third = gen.next_frame(), gen.next_frame(), gen.next_frame()
+    sync, frames = _sync(first[:len(first) // 2] + second + third, 1 << 20)
+
+    assert frames == [second, third]
+    assert sync.truncated_frames == 1
+    assert sync.bytes_discarded == len(first) // 2
+    points = detected_points(frames[0], parse_header(frames[0]))
+    assert len(points) == 20 and np.all(np.abs(points[:, 3]) >= .05)
+
+
+def test_frame_with_overflowing_tlvs_is_dropped():
+    gen = FrameGenerator(points=20)
+    bad = bytearray(gen.next_frame())
+    # Length of the first TLV, right after the frame header and its TLV type
+    bad[44:48] = (len(bad) * 2).to_bytes(4, 'little')
+    good = gen.next_frame()
+    sync, frames = _sync(bytes(bad) + good, 1 << 20)
+
+    assert frames == [good]
+    assert sync.malformed_frames == 1
+
+
+def test_truncated_frame_ending_in_part_of_the_next_magic():
+    gen = FrameGenerator(points=20)
+    first, second = gen.next_frame(), gen.next_frame()
+    # Three bytes short, so the claimed end falls within the magic number of the next frame
+    data = first[:-3] + second
+    sync, frames = _sync(data, 1 << 20)
+
+    assert frames == [data[:len(first)], second]
+    assert sync.corrupt_frames == 0 and sync.bytes_discarded == 0
+
+
+@pytest.mark.parametrize('tail', [b'\x02', b'\x02\x01\x04'])
+def test_frame_ending_like_a_magic_number_is_not_held(tail):
+    gen = FrameGenerator(points=20)
+    first = bytearray(gen.next_frame())
+    first[-len(tail):] = tail
+    second = gen.next_frame()
+
+    sync = FrameSynchronizer()
+    sync.feed(bytes(first))
+    assert [bytes(frame) for frame in sync.frames()] == [bytes(first)]
+    # The tail is not mistaken for the start of the next frame, nor counted as discarded
+    sync.feed(second)
+    assert [bytes(frame) for frame in sync.frames()] == [second]
+    assert sync.bytes_discarded == 0
+
+
+def test_bytes_between_frames_are_discarded():
+    gen = FrameGenerator(points=20)
+    first, second = gen.next_frame(), gen.next_frame()
+    sync, frames = _sync(b'\x02' + first + b'\x00' * 5 + second, 3)
+
+    assert frames == [first, second]
+    assert sync.bytes_discarded == 6
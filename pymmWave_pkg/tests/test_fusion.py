@@ -0,0 +1,78 @@
+import asyncio
+from time import monotonic_ns
+
+import numpy as np
+
+from pymmWave.IWR6843AOP import IWR6843AOP
+from pymmWave.data_model import DopplerPointCloud, FrameMetadata
+from pymmWave.delivery import DeliveryPolicy
+from pymmWave.fusion import SensorArray
+from pymmWave.sensor import SpatialSensor
+from pymmWave.simulator import FrameGenerator
+
+MS = 1_000_000
+
+
+def _array(**kwargs):
+    sensors = [SpatialSensor(IWR6843AOP('left'), (0.0, 0.0, 0.0), (0.0, 0.0, 0.0)),
+               SpatialSensor(IWR6843AOP('right'), (1.0, 0.0, 0.0), (0.0, 0.0, np.pi))]
+    return SensorArray(sensors, window_s=.1, **kwargs)
+
+
+def _cloud(x, timestamp_ns, frame_number=0):
+    return DopplerPointCloud(np.array([[x, 0.0, 0.0, .5]]), FrameMetadata(frame_number, 0, timestamp_ns, (1,), 1))
+
+
+def test_window_is_fused_in_the_world_frame():
+    array = _array()
+    array.add(0, _cloud(2.0, 1000 * MS))
+    array.add(1, _cloud(2.0, 1050 * MS))
+    # Outside the window
+    array.add(0, _cloud(5.0, 1100 * MS))
+    fused = array.fuse(1100 * MS)
+
+    assert (fused.start_ns, fused.end_ns, fused.missing) == (1000 * MS, 1100 * MS, ())
+    assert list(fused.batch.sources()) == [0, 1]
+    assert np.allclose(fused.get(), [[2.0, 0.0, 0.0, .5], [-1.0, 0.0, 0.0, .5]])
+    assert array.frames_received == [2, 1]
+
+
+def test_stale_clouds_are_reused_up_to_the_limit():
+    array = _array(staleness_s=.15)
+    array.add(0, _cloud(1.0, 1000 * MS))
+    array.add(1, _cloud(1.0, 1000 * MS))
+    assert array.fuse(1100 * MS).missing == ()
+    array.add(0, _cloud(1.0, 1120 * MS))
+
+    # Sensor 1's cloud is 0.15s old at the end of this window
+    fused = array.fuse(1150 * MS)
+    assert fused.missing == ()
+    assert array.frames_reused == [0, 1]
+
+    fused = array.fuse(1250 * MS)
+    assert fused.missing == (1,)
+    assert array.windows_missing == [0, 1]
+
+
+def test_run_fuses_live_sensors():
+    array = _array(delay_s=0, policy=DeliveryPolicy.RING, capacity=64)
+    for spatial in array.sensors:
+        spatial.sensor.configure_delivery(DeliveryPolicy.RING, 16)
+    gen = [FrameGenerator(points=4, seed=1), FrameGenerator(points=4, seed=2)]
+
+    async def run():
+        task = asyncio.create_task(array.run(start_sensors=False))
+        assert array.get_fused_nowait() is None
+        for _ in range(5):
+            for spatial, g in zip(array.sensors, gen):
+                spatial.sensor._on_data(g.frames(1), monotonic_ns())
+            await asyncio.sleep(.05)
+        fused = await asyncio.wait_for(array.get_fused(), 1)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return fused
+
+    fused = asyncio.run(run())
+    assert set(fused.batch.sources()) <= {0, 1}
+    assert array.frames_received == [5, 5]
+    assert array.windows >= 2
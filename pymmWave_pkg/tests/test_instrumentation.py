@@ -0,0 +1,54 @@
+from pymmWave.IWR6843AOP import IWR6843AOP
+from pymmWave.framing import MAGIC_NUMBER
+from pymmWave.instrumentation import LatencyHistogram, Stage
+from pymmWave.simulator import FrameGenerator
+
+
+def test_histogram_percentiles():
+    histogram = LatencyHistogram()
+    for ns in [0] + [1000] * 98 + [1_000_000]:
+        histogram.record(ns)
+    snap = histogram.snapshot()
+
+    assert snap.count == 100
+    assert snap.max_ns == 1_000_000
+    assert snap.percentile(0) == 0
+    # Exact to within a factor of two
+    assert 1000 <= snap.percentile(50) < 2000
+    assert snap.percentile(100) == 1_000_000
+
+
+def test_off_by_default():
+    sensor = IWR6843AOP('instrumentation')
+    sensor._on_data(FrameGenerator(points=4).frames(3), 0)
+
+    assert sensor.get_instrumentation() is None
+
+
+def test_stages_and_counters_are_recorded():
+    sensor = IWR6843AOP('instrumentation')
+    sensor.configure_instrumentation()
+    gen = FrameGenerator(points=4)
+    data = gen.frames(3)
+    # A damaged header ahead of the frames
+    sensor._on_data(MAGIC_NUMBER + b'\xff' * 40 + data, 0)
+    assert sensor.get_data_nowait() is not None
+
+    snap = sensor.get_instrumentation()
+    assert snap.stages[Stage.MAGIC_SYNC].count == 1
+    for stage in (Stage.HEADER_PARSE, Stage.TLV_DECODE, Stage.DOPPLER_FILTER):
+        assert snap.stages[stage].count == 3
+    assert snap.stages[Stage.QUEUE_WAIT].count == 1
+    assert snap.stages[Stage.CONSUMER_PICKUP].count == 1
+    assert snap.counters['frames_synced'] == 3
+    assert snap.counters['bytes_received'] == 48 + len(data)
+    assert snap.counters['corrupt_headers'] == 1
+
+
+def test_enabling_resets():
+    sensor = IWR6843AOP('instrumentation')
+    sensor.configure_instrumentation()
+    sensor._on_data(FrameGenerator(points=4).frames(3), 0)
+    sensor.configure_instrumentation()
+
+    assert sensor.get_instrumentation().stages[Stage.HEADER_PARSE].count == 0
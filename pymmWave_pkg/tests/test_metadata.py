@@ -0,0 +1,39 @@
+import numpy as np
+
+from pymmWave.IWR6843AOP import IWR6843AOP
+from pymmWave.delivery import DeliveryPolicy
+from pymmWave.simulator import FrameGenerator, build_frame
+
+
+def _points(n):
+    return FrameGenerator(seed=5).points_for(n)
+
+
+def test_clouds_carry_frame_metadata():
+    frame = build_frame(42, _points(6), [(6, b'\x00' * 24)], time_cpu_cycles=1234)
+    cloud = IWR6843AOP('metadata')._process_frame(memoryview(frame), 987)
+    metadata = cloud.get_metadata()
+
+    assert metadata.frame_number == 42
+    assert metadata.time_cpu_cycles == 1234
+    assert metadata.host_timestamp_ns == 987
+    assert metadata.tlv_types == (1, 6)
+    assert metadata.num_points == 6
+    assert metadata.packet_len == len(frame)
+
+
+def test_frames_without_points_are_counted_not_delivered():
+    sensor = IWR6843AOP('metadata')
+    sensor.configure_delivery(DeliveryPolicy.RING, 8)
+    frames = [build_frame(0, _points(3)), build_frame(1, _points(0)), build_frame(2, _points(0), [(6, b'\x00' * 24)]), build_frame(3, _points(2))]
+    sensor._on_data(b''.join(frames), 0)
+
+    assert sensor.get_data_nowait().get_metadata().frame_number == 0
+    assert sensor.get_data_nowait().get_metadata().frame_number == 3
+    assert sensor.get_data_nowait() is None
+
+    stats = sensor.get_statistics()
+    assert stats.frames_received == 4
+    assert stats.frames_empty == 2
+    # Their frame numbers were seen, so they are not gaps either
+    assert stats.dropped == 0
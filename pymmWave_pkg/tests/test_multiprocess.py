@@ -0,0 +1,132 @@
+import asyncio
+import time
+
+import numpy as np
+import pytest
+
+from pymmWave.delivery import DeliveryPolicy
+from pymmWave.multiprocess import DecodeWorker, SharedCloudRing
+from pymmWave.pool import ArrayPool
+from pymmWave.simulator import FrameGenerator
+
+from conftest import posix_only
+
+
+class _BytesSource(object):
+    """Hands out a fixed byte stream in chunks, then nothing.
+    """
+    def __init__(self, data, chunk_size=4096):
+        self.data = data
+        self.chunk_size = chunk_size
+
+    def open(self):
+        self._pos = 0
+
+    def read(self):
+        chunk = self.data[self._pos:self._pos + self.chunk_size]
+        self._pos += len(chunk)
+        if not chunk:
+            time.sleep(.01)
+        return chunk
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def ring():
+    ring = SharedCloudRing(2, 8)
+    yield ring
+    ring.close()
+    ring.unlink()
+
+
+def test_read_copies_a_cloud(ring):
+    points = np.arange(12, dtype=np.float32).reshape(3, 4)
+    seq = ring.write(points)
+    pool = ArrayPool(8, 1)
+    copied, _ = ring.read(seq, pool)
+
+    assert np.array_equal(copied, points)
+    assert not np.shares_memory(copied, ring.view(seq))
+    assert len(pool) == 0
+
+
+def test_read_discards_a_cloud_overwritten_while_copying(ring):
+    points = np.ones((3, 4), dtype=np.float32)
+    seq = ring.write(points)
+    metadata = ring.metadata
+
+    def wrap_around(s):
+        # The writer laps the reader between copying the points and reading the frame information
+        ring.write(2 * points)
+        ring.write(3 * points)
+        return metadata(s)
+    ring.metadata = wrap_around
+    pool = ArrayPool(8, 1)
+
+    assert ring.read(seq, pool) is None
+    # The torn copy went back to the pool
+    assert len(pool) == 1
+    ring.metadata = metadata
+    assert ring.read(seq) is None
+
+
+def _drain_all(worker, frames, timeout=10):
+    clouds = []
+    deadline = time.monotonic() + timeout
+    while len(clouds) < frames and time.monotonic() < deadline:
+        if worker.poll(.1):
+            clouds += worker.drain()
+    return clouds
+
+
+def test_blocking_worker_waits_for_drained_slots():
+    data = FrameGenerator(points=10).frames(100)
+    worker = DecodeWorker(_BytesSource(data), slots=4, blocking=True)
+    worker.start()
+    try:
+        time.sleep(.5)
+        # Nothing drained yet, so the worker stopped once the ring was full
+        assert worker.ring.head == 3
+        clouds = _drain_all(worker, 100)
+    finally:
+        worker.stop()
+
+    assert [m.frame_number for _, m in clouds] == list(range(100))
+    assert worker.dropped == 0
+
+
+def test_worker_overwrites_undrained_clouds():
+    data = FrameGenerator(points=10).frames(100)
+    worker = DecodeWorker(_BytesSource(data), slots=4)
+    worker.start()
+    try:
+        while worker.ring.head < 99:
+            time.sleep(.01)
+        clouds = _drain_all(worker, 4)
+    finally:
+        worker.stop()
+
+    assert [m.frame_number for _, m in clouds] == [96, 97, 98, 99]
+    assert worker.dropped == 96
+
+
+@posix_only
+def test_process_decode_blocking_is_lossless(sensor):
+    assert sensor.configure_process_decode(slots=4)
+    assert sensor.configure_delivery(DeliveryPolicy.BLOCKING, 2)
+
+    async def run():
+        sub = sensor.subscribe()
+        task = asyncio.create_task(sensor.start_sensor())
+        numbers = []
+        for _ in range(30):
+            numbers.append((await asyncio.wait_for(sub.get(), 5)).get_metadata().frame_number)
+            # A slow consumer, so the worker has to wait
+            await asyncio.sleep(.03)
+        task.cancel()
+        return numbers
+
+    numbers = asyncio.run(run())
+    assert np.all(np.diff(numbers) == 1)
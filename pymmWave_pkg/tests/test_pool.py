@@ -0,0 +1,55 @@
+import numpy as np
+
+from pymmWave.IWR6843AOP import IWR6843AOP
+from pymmWave.pool import ArrayPool
+from pymmWave.simulator import FrameGenerator, build_frame
+
+
+def test_acquire_and_release():
+    pool = ArrayPool(max_points=16, buffers=2)
+    first, second = pool.acquire(4), pool.acquire(16)
+    assert first.shape == (4, 4) and second.shape == (16, 4)
+    assert len(pool) == 0 and pool.allocated == 0
+
+    # Runs dry, and allocates
+    third = pool.acquire(1)
+    assert pool.allocated == 1
+    assert pool.acquire(17) is None
+
+    assert pool.release(first) and pool.release(second)
+    # Already holds as many buffers as it preallocated
+    assert not pool.release(third)
+    assert not pool.release(np.empty((16, 4), dtype=np.float64))
+    assert np.shares_memory(pool.acquire(2), second)
+
+
+def test_decoded_clouds_are_recycled():
+    sensor = IWR6843AOP('pool')
+    assert sensor.configure_buffer_pool(max_points=32, buffers=4)
+    points = FrameGenerator(seed=10).points_for(20)
+
+    cloud = sensor._process_frame(memoryview(build_frame(0, points)), 0)
+    assert np.array_equal(cloud.get(), points)
+    buffer = cloud.get()
+    with cloud:
+        pass
+    assert cloud.get().shape == (0, 4)
+
+    again = sensor._process_frame(memoryview(build_frame(1, points)), 0)
+    assert np.shares_memory(again.get(), buffer)
+    assert sensor._pool.allocated == 0
+
+
+def test_large_clouds_bypass_the_pool():
+    sensor = IWR6843AOP('pool')
+    assert sensor.configure_buffer_pool(max_points=8, buffers=2)
+    points = FrameGenerator(seed=10).points_for(20)
+    cloud = sensor._process_frame(memoryview(build_frame(0, points)), 0)
+
+    assert np.array_equal(cloud.get(), points)
+    cloud.release()
+    assert len(sensor._pool) == 2
+
+
+def test_invalid_sizes_are_rejected():
+    assert not IWR6843AOP('pool').configure_buffer_pool(max_points=0)
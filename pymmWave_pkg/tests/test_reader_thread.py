@@ -0,0 +1,65 @@
+import asyncio
+import threading
+
+import pytest
+
+from conftest import posix_only
+
+pytestmark = posix_only
+
+
+def _readers():
+    return [t for t in threading.enumerate() if t.name.endswith('-reader') and t.is_alive()]
+
+
+@pytest.fixture
+def thread_errors(monkeypatch):
+    errors = []
+    monkeypatch.setattr(threading, 'excepthook', lambda args: errors.append(args.exc_value))
+    return errors
+
+
+def test_streams_on_reader_thread(sensor):
+    assert sensor.configure_reader_thread()
+
+    async def run():
+        task = asyncio.create_task(sensor.start_sensor())
+        cloud = await asyncio.wait_for(sensor.get_data(), 2)
+        assert _readers()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return cloud
+
+    assert asyncio.run(run()).get().shape == (16, 4)
+
+
+def test_reader_thread_is_joined_on_stop(sensor, thread_errors):
+    sensor.configure_reader_thread()
+
+    async def run():
+        for _ in range(2):
+            # Restarting must not leave the old thread reading alongside the new one
+            task = asyncio.create_task(sensor.start_sensor())
+            await asyncio.wait_for(sensor.get_data(), 2)
+            assert len(_readers()) == 1
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            assert not _readers()
+
+    asyncio.run(run())
+    assert not thread_errors
+
+
+def test_loop_closing_with_reader_running(sensor, thread_errors):
+    sensor.configure_reader_thread()
+
+    async def run():
+        asyncio.create_task(sensor.start_sensor())
+        await asyncio.wait_for(sensor.get_data(), 2)
+
+    # asyncio.run cancels the sensor task, which waits for the thread before the loop closes
+    asyncio.run(run())
+    assert not _readers()
+    assert not thread_errors
@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+
+from pymmWave.capture import CaptureWriter, index_path
+from pymmWave.delivery import DeliveryPolicy
+from pymmWave.replay import ReplaySensor
+from pymmWave.simulator import FrameGenerator
+
+FRAMES = 50
+
+
+@pytest.fixture(params=[True, False], ids=['indexed', 'rebuilt'])
+def capture(tmp_path, request):
+    path = str(tmp_path / 'capture.bin')
+    with CaptureWriter(path) as writer:
+        writer.write(FrameGenerator(points=10).frames(FRAMES), 1)
+    if not request.param:
+        (tmp_path / 'capture.bin.idx').unlink()
+    return path
+
+
+def _replay(sensor):
+    """Frame numbers of everything replayed from the current position.
+    """
+    async def run():
+        sub = sensor.subscribe()
+        task = asyncio.create_task(sensor.start_sensor())
+        numbers = []
+        while not task.done() or sub.pending():
+            cloud = sub.get_nowait()
+            if cloud is None:
+                await asyncio.sleep(0)
+            else:
+                numbers.append(cloud.get_metadata().frame_number)
+        sub.close()
+        await task
+        return numbers
+
+    return asyncio.run(run())
+
+
+def _sensor(path):
+    sensor = ReplaySensor(path, speed=None)
+    assert sensor.configure_delivery(DeliveryPolicy.BLOCKING, 8)
+    return sensor
+
+
+def test_replay_all(capture):
+    sensor = _sensor(capture)
+    assert len(sensor) == FRAMES
+    assert _replay(sensor) == list(range(FRAMES))
+    assert sensor.tell() == FRAMES
+
+
+def test_seek(capture):
+    sensor = _sensor(capture)
+    assert sensor.seek(40)
+    assert _replay(sensor) == list(range(40, FRAMES))
+
+    assert sensor.seek_frame(45)
+    assert sensor.tell() == 45
+    assert _replay(sensor) == list(range(45, FRAMES))
+
+
+def test_seek_out_of_range(capture):
+    sensor = _sensor(capture)
+    assert not sensor.seek(-1)
+    assert not sensor.seek(FRAMES + 1)
+    assert not sensor.seek_frame(FRAMES)
+    assert sensor.tell() == 0
+    # The end is a valid position, with nothing left to replay
+    assert sensor.seek(FRAMES)
+    assert _replay(sensor) == []
+
+
+def test_seek_time_needs_timestamps(capture, tmp_path):
+    sensor = _sensor(capture)
+    timed = (tmp_path / 'capture.bin.idx').exists()
+    assert sensor.seek_time(0) == timed
+    assert not sensor.seek_time(1e6)
+
+
+def test_capture_without_frames(tmp_path):
+    path = str(tmp_path / 'capture.bin')
+    with CaptureWriter(path) as writer:
+        writer.write(b'\x00' * 100, 1)
+    sensor = _sensor(path)
+
+    assert len(sensor) == 0
+    assert sensor.seek(0)
+    assert sensor.tell() == 0
+    assert _replay(sensor) == []
+
+
+def test_replay_keeps_recorded_timestamps(tmp_path):
+    path = str(tmp_path / 'capture.bin')
+    gen = FrameGenerator(points=10)
+    with CaptureWriter(path) as writer:
+        writer.write(gen.frames(2), 1000)
+        for t in (2000, 3000, 4000):
+            writer.write(gen.frames(1), t)
+    sensor = _sensor(path)
+
+    async def run():
+        sub = sensor.subscribe()
+        await sensor.start_sensor()
+        return [cloud.get_metadata().host_timestamp_ns for cloud in sub.get_many(8)]
+
+    assert asyncio.run(run()) == [1000, 1000, 2000, 3000, 4000]
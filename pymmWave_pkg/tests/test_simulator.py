@@ -0,0 +1,62 @@
+import numpy as np
+from serial import Serial
+
+from pymmWave.constants import CLI_ALREADY_STOPPED, CLI_DONE, CLI_PROMPT, EXAMPLE_CONFIG
+from pymmWave.framing import detected_points, iter_tlvs, parse_header
+from pymmWave.simulator import FrameGenerator, build_frame
+
+from conftest import posix_only
+
+
+def test_build_frame_round_trip():
+    points = FrameGenerator(seed=6).points_for(12)
+    frame = build_frame(9, points, [(6, b'\x01' * 24)], time_cpu_cycles=77)
+    header = parse_header(frame)
+
+    assert len(frame) % 32 == 0
+    assert header.total_packet_len == len(frame)
+    assert (header.frame_number, header.time_cpu_cycles, header.num_detected_obj, header.num_tlvs) == (9, 77, 12, 2)
+    assert [(tlv_type, length) for tlv_type, _, length in iter_tlvs(frame, header)] == [(1, 12 * 16), (6, 24)]
+    assert np.array_equal(detected_points(frame, header), points)
+
+
+def test_generator_counts_corrupted_frames():
+    gen = FrameGenerator(points=8, corruption=.5, seed=1)
+    gen.frames(200)
+
+    assert gen.frame_number == 200
+    assert 50 < gen.corrupted < 150
+
+
+@posix_only
+def test_cli_replies(sim):
+    with Serial(sim.config_port, 115200, timeout=1) as cli:
+        cli.write(b'sensorStop\n')
+        assert CLI_ALREADY_STOPPED in cli.read_until(CLI_PROMPT.encode()).decode()
+        cli.write(b'sensorStart 0\n')
+        assert CLI_DONE in cli.read_until(CLI_PROMPT.encode()).decode()
+
+    assert sim.streaming
+    assert sim.commands == ['sensorStop', 'sensorStart 0']
+
+
+@posix_only
+def test_stall_until_resumed(sim, sensor):
+    assert sim.streaming
+    sim.stall()
+    assert not sim.streaming
+    # Reconfiguring is acknowledged, but does not bring the stream back
+    assert sensor.send_config(EXAMPLE_CONFIG)
+    assert not sim.streaming
+
+    sim.resume()
+    assert sensor.send_config(EXAMPLE_CONFIG)
+    assert sim.streaming
+
+
+@posix_only
+def test_stall_once(sim, sensor):
+    sim.stall(until_resumed=False)
+    assert not sim.streaming
+    assert sensor.send_config(EXAMPLE_CONFIG)
+    assert sim.streaming
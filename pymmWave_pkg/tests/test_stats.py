@@ -0,0 +1,76 @@
+from pymmWave.IWR6843AOP import IWR6843AOP
+from pymmWave.simulator import FrameGenerator, build_frame
+from pymmWave.stats import FrameNumberTracker, PipelineStatistics, RateWindow, transfer_time_ns
+
+
+def _observe(numbers):
+    tracker = FrameNumberTracker()
+    return sum(tracker.observe(n) for n in numbers), tracker.resyncs
+
+
+def test_frame_number_gaps():
+    assert _observe([1, 2, 3, 6, 7]) == (2, 0)
+    # uint32 wrap around
+    assert _observe([(1 << 32) - 2, (1 << 32) - 1, 0, 2]) == (1, 0)
+
+
+def test_frame_number_damage_is_not_a_gap():
+    # A flipped high bit is one corrupt frame, not hundreds of millions lost
+    assert _observe([1, 2, 3 | (1 << 29), 4, 5]) == (0, 1)
+    assert _observe([1, 2, 3 | (1 << 29), 5, 6]) == (1, 1)
+    assert _observe([5, 5, 6]) == (0, 1)
+
+
+def test_frame_number_restart():
+    # Continuing from the new value makes it the baseline
+    assert _observe([100, 101, 1, 2, 4]) == (1, 1)
+
+
+def test_skipped_frames_are_not_gaps():
+    tracker = FrameNumberTracker()
+    tracker.observe(1)
+    tracker.skip(1)
+    assert tracker.observe(3) == 0
+    assert tracker.observe(5) == 1
+
+
+def test_rate_window():
+    window = RateWindow(window_s=1.0, buckets=10, now_ns=0)
+    for t in range(100):
+        window.add(1, t * 10_000_000)
+
+    assert abs(window.rate(1_000_000_000) - 100) < 11
+    # Everything has left the window
+    assert window.rate(3_000_000_000) == 0
+    assert window.total == 100
+
+
+def test_transfer_time():
+    assert transfer_time_ns(1152, 115200) == 100_000_000
+    assert transfer_time_ns(1152, None) == 0
+
+
+def test_snapshot_accounts_for_every_frame():
+    stats = PipelineStatistics()
+    stats.add_frames(10, 2, 3, 0)
+    stats.add_evicted(4)
+    snap = stats.snapshot(evicted=1)
+
+    assert (snap.frames_received, snap.dropped_corrupt, snap.dropped_gap, snap.dropped_evicted) == (10, 2, 3, 5)
+    assert snap.drop_rate == 10 / 15
+
+
+def test_sensor_counts_gaps_and_evictions():
+    sensor = IWR6843AOP('stats')
+    points = FrameGenerator(points=4).points_for(4)
+    # Frames 3 and 4 never arrive
+    sensor._on_data(b''.join(build_frame(n, points) for n in (0, 1, 2, 5)), 0)
+    assert sensor.get_data_nowait().get_metadata().frame_number == 5
+
+    stats = sensor.get_statistics()
+    assert stats.frames_received == 4
+    assert stats.frames_delivered == 1
+    assert stats.dropped_gap == 2
+    # The default delivery policy keeps only the newest cloud
+    assert stats.dropped_evicted == 3
+    assert stats.dropped_corrupt == 0
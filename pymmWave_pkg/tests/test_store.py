@@ -0,0 +1,78 @@
+import os
+
+import numpy as np
+import pytest
+
+from pymmWave.data_model import DopplerPointCloud, FrameMetadata
+from pymmWave.simulator import FrameGenerator
+from pymmWave.store import PointCloudStore, PointCloudStoreWriter
+
+
+def _clouds(sizes):
+    gen = FrameGenerator(seed=7)
+    return [DopplerPointCloud(gen.points_for(n), FrameMetadata(i, i * 10, 1000 * i, (1,), n)) for i, n in enumerate(sizes)]
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / 'session.store')
+    clouds = _clouds([3, 0, 5, 2])
+    with PointCloudStoreWriter(path) as writer:
+        for cloud in clouds:
+            writer.append(cloud)
+
+    store = PointCloudStore(path)
+    assert len(store) == 4
+    batch = store.frame_range(1, 4)
+    assert list(batch.sizes()) == [0, 5, 2]
+    for i, cloud in enumerate(clouds[1:]):
+        assert np.array_equal(batch.frame(i).get(), cloud.get())
+        assert batch.frame(i).get_metadata() == cloud.get_metadata()._replace(tlv_types=())
+    assert np.array_equal(store.column('doppler'), np.concatenate([c.get()[:, 3] for c in clouds]))
+
+
+def test_time_range(tmp_path):
+    path = str(tmp_path / 'session.store')
+    with PointCloudStoreWriter(path) as writer:
+        for cloud in _clouds([1, 2, 3, 4]):
+            writer.append(cloud)
+
+    batch = PointCloudStore(path).time_range(1000, 3000)
+    assert [m.frame_number for m in batch.get_metadata()] == [1, 2]
+    assert len(PointCloudStore(path).time_range(10_000, 20_000)) == 0
+
+
+def test_frames_become_visible_on_flush(tmp_path):
+    path = str(tmp_path / 'session.store')
+    writer = PointCloudStoreWriter(path)
+    store = PointCloudStore(path)
+    writer.append(_clouds([4])[0])
+    store.refresh()
+    assert len(store) == 0
+
+    writer.flush()
+    store.refresh()
+    assert len(store) == 1
+    writer.close()
+
+
+def test_reopening_appends_and_drops_partial_rows(tmp_path):
+    path = str(tmp_path / 'session.store')
+    clouds = _clouds([2, 3, 4])
+    with PointCloudStoreWriter(path) as writer:
+        writer.append(clouds[0])
+    # Rows of an interrupted append, which never got a frame table record
+    with open(os.path.join(path, 'x.f32'), 'ab') as f:
+        f.write(b'\x00' * 8)
+
+    with PointCloudStoreWriter(path) as writer:
+        assert writer.frames == 1
+        writer.append(clouds[1])
+        writer.append(clouds[2])
+
+    batch = PointCloudStore(path).frame_range(0, 3)
+    assert np.array_equal(batch.get(), np.concatenate([c.get() for c in clouds]))
+
+
+def test_missing_store(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        PointCloudStore(str(tmp_path / 'missing'))
@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+
+from pymmWave.IWR6843AOP import IWR6843AOP
+from pymmWave.constants import EXAMPLE_CONFIG
+from pymmWave.supervisor import SensorSupervisor, frame_period_s
+
+from conftest import posix_only
+
+
+def test_frame_period():
+    assert frame_period_s(['sensorStop', 'frameCfg 0 2 16 0 100 1 0']) == .1
+    assert frame_period_s(['frameCfg 0 2']) is None
+
+
+class _SlowToStop(IWR6843AOP):
+    """Never sends frames, and takes a while to clean up when its stream is cancelled.
+    """
+    async def start_sensor(self):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            await asyncio.sleep(.5)
+            raise
+
+    def reconnect(self):
+        raise AssertionError("A cancelled supervisor must not reconnect.")
+
+
+def test_cancelling_run_while_stopping_the_sensor():
+    sensor = _SlowToStop('slow')
+    supervisor = SensorSupervisor(sensor, stall_periods=5, frame_period=.02, retry_interval_s=0)
+
+    async def run():
+        task = asyncio.create_task(supervisor.run())
+        while not supervisor.stalls:
+            await asyncio.sleep(.01)
+        # The stalled stream is still being cancelled
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(task, 2)
+
+    asyncio.run(run())
+
+
+@posix_only
+def test_last_config(sensor):
+    assert sensor.last_config == tuple(EXAMPLE_CONFIG)
+    assert IWR6843AOP('unconfigured').last_config is None
+
+
+@posix_only
+def test_reconnects_after_stall(sim, sensor):
+    supervisor = SensorSupervisor(sensor, stall_periods=5, frame_period=.02, retry_interval_s=.05)
+
+    async def run():
+        task = asyncio.create_task(supervisor.run())
+        await asyncio.wait_for(sensor.get_data(), 2)
+        # The reconnect re-sends the configuration, which restarts the stream
+        sim.stall(until_resumed=False)
+        while not sensor.get_statistics().reconnects:
+            await asyncio.sleep(.01)
+        await asyncio.wait_for(sensor.get_data(), 2)
+        task.cancel()
+
+    asyncio.run(asyncio.wait_for(run(), 10))
+    stats = sensor.get_statistics()
+    assert supervisor.stalls >= 1
+    assert stats.reconnects >= 1
+    assert stats.last_recovery_s is not None and stats.last_recovery_s > 0
+
+
+@posix_only
+def test_silent_after_reconnect_gives_up(sim, sensor):
+    supervisor = SensorSupervisor(sensor, stall_periods=5, frame_period=.02, retry_interval_s=.05, max_attempts=2)
+
+    async def run():
+        task = asyncio.create_task(supervisor.run())
+        await asyncio.wait_for(sensor.get_data(), 2)
+        sim.stall()
+        await task
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(asyncio.wait_for(run(), 10))
+    # The first stall, then each reconnect which brought no frames back
+    assert supervisor.stalls == 3
+
+
+@posix_only
+def test_recovers_once_frames_return(sim, sensor):
+    supervisor = SensorSupervisor(sensor, stall_periods=5, frame_period=.02, retry_interval_s=.05)
+
+    async def run():
+        task = asyncio.create_task(supervisor.run())
+        await asyncio.wait_for(sensor.get_data(), 2)
+        sim.stall()
+        while supervisor.stalls < 3:
+            await asyncio.sleep(.01)
+        sim.resume()
+        await asyncio.wait_for(sensor.get_data(), 2)
+        await asyncio.sleep(.2)
+        task.cancel()
+
+    asyncio.run(asyncio.wait_for(run(), 10))
+    stats = sensor.get_statistics()
+    # Recovery counts from the original stall, through the reconnects which brought no frames
+    assert stats.last_recovery_s is not None and stats.last_recovery_s > 2 * .1
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from scipy.spatial.transform import Rotation
+
+from pymmWave.IWR6843AOP import IWR6843AOP
+from pymmWave.data_model import DopplerPointCloud
+from pymmWave.sensor import SpatialSensor
+from pymmWave.transform import RigidTransform
+
+
+def _points(n=20, dtype=np.float64):
+    return np.random.default_rng(12).normal(size=(n, 4)).astype(dtype)
+
+
+def _transform():
+    return RigidTransform(Rotation.from_rotvec([.1, -.4, .9]), (1.0, -2.0, .5))
+
+
+def test_apply_rotates_then_translates():
+    transform = _transform()
+    points = _points()
+    expected = points.copy()
+    expected[:, :3] = Rotation.from_rotvec([.1, -.4, .9]).apply(points[:, :3]) + (1.0, -2.0, .5)
+
+    out = np.empty_like(points)
+    assert transform.apply(points, out) is out
+    assert np.allclose(out, expected)
+    # In place by default, doppler passes through
+    transform.apply(points)
+    assert np.allclose(points, expected)
+    assert np.array_equal(points[:, 3], expected[:, 3])
+
+
+def test_float32_stays_float32():
+    points = _points(dtype=np.float32)
+    expected = _transform().apply(points.astype(np.float64))
+    _transform().apply(points)
+
+    assert points.dtype == np.float32
+    assert np.allclose(points, expected, atol=1e-5)
+
+
+def test_composition_and_inverse():
+    a = _transform()
+    b = RigidTransform(Rotation.from_rotvec([0, 0, np.pi / 3]), (0.0, 4.0, 0.0))
+    points = _points()
+
+    assert np.allclose((a @ b).apply(points.copy()), a.apply(b.apply(points.copy())))
+    assert np.allclose((a @ a.inverse()).matrix, np.eye(4))
+    assert RigidTransform.from_matrix(a.matrix) == a
+
+
+def test_from_translate_rotate_matches_translate_rotate():
+    rotation = Rotation.from_euler('zyx', [.3, .2, .1])
+    cloud = DopplerPointCloud(_points())
+    expected = DopplerPointCloud(cloud.get().copy())
+    expected.translate_rotate((1.0, 2.0, 3.0), rotation)
+
+    cloud.transform(RigidTransform.from_translate_rotate((1.0, 2.0, 3.0), rotation))
+    assert np.allclose(cloud.get(), expected.get())
+
+
+def test_invalid_rotations():
+    with pytest.raises(ValueError):
+        RigidTransform(Rotation.from_rotvec([[0, 0, 1], [0, 1, 0]]))
+    with pytest.raises(ValueError):
+        RigidTransform.from_matrix(np.eye(3))
+
+
+def test_spatial_sensor_extrinsic_follows_its_pose():
+    spatial = SpatialSensor(IWR6843AOP('transform'), (0.0, 0.0, 1.0), (0.0, 0.0, np.pi / 2))
+    cloud = DopplerPointCloud(np.array([[1.0, 0.0, 0.0, .5]]))
+    assert np.allclose(spatial.to_world(cloud).get(), [[0.0, 1.0, 1.0, .5]])
+
+    spatial.location = (2.0, 0.0, 0.0)
+    assert np.allclose(spatial.extrinsic.translation, (2.0, 0.0, 0.0))
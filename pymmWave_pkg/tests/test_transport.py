@@ -0,0 +1,82 @@
+import asyncio
+import os
+import tty
+
+import pytest
+from serial import Serial
+
+from pymmWave.transport import SerialReadTransport
+
+from conftest import posix_only
+
+pytestmark = posix_only
+
+
+class _Collect(asyncio.Protocol):
+    def __init__(self):
+        self.data = b''
+        self.lost = None
+        self.closed = asyncio.Event()
+
+    def data_received(self, data):
+        self.data += data
+
+    def connection_lost(self, exc):
+        self.lost = exc
+        self.closed.set()
+
+
+@pytest.fixture
+def pty():
+    master, slave = os.openpty()
+    tty.setraw(slave)
+    ser = Serial(os.ttyname(slave), 921600, timeout=1)
+    yield master, ser
+    ser.close()
+    for fd in (master, slave):
+        os.close(fd)
+
+
+async def _until(condition, timeout=2):
+    for _ in range(int(timeout / .01)):
+        if condition():
+            return
+        await asyncio.sleep(.01)
+    raise TimeoutError
+
+
+def test_reads_when_ready(pty):
+    master, ser = pty
+
+    async def run():
+        protocol = _Collect()
+        transport = SerialReadTransport(asyncio.get_running_loop(), ser, protocol)
+        os.write(master, b'abc')
+        await _until(lambda: protocol.data == b'abc')
+
+        transport.pause_reading()
+        assert not transport.is_reading()
+        os.write(master, b'def')
+        await asyncio.sleep(.1)
+        assert protocol.data == b'abc'
+        transport.resume_reading()
+        await _until(lambda: protocol.data == b'abcdef')
+
+        transport.close()
+        await asyncio.wait_for(protocol.closed.wait(), 1)
+        assert protocol.lost is None and transport.is_closing()
+
+    asyncio.run(run())
+    # The port belongs to the caller, and stays open
+    assert ser.is_open
+
+
+def test_sensor_streams_without_polling(sensor):
+    async def run():
+        task = asyncio.create_task(sensor.start_sensor())
+        numbers = [(await asyncio.wait_for(sensor.get_data(), 2)).get_metadata().frame_number for _ in range(5)]
+        task.cancel()
+        return numbers
+
+    numbers = asyncio.run(run())
+    assert numbers == sorted(numbers) and len(set(numbers)) == 5